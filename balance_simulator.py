@@ -0,0 +1,192 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations_with_replacement
+from typing import Any, Dict, List, Optional, Tuple
+
+from comps.damage_data import DamageData
+from entities.character import Character
+from headless_match import HeadlessMatch
+from input_sources import ChaseInputSource
+from player import Player
+from resources.character_loader import CharacterDataFactory, CharacterLoader
+from resources.resources_manager import ResourcesManager
+from resources.resources_registry import ResourcesRegistry
+from utils.utils import get_project_root
+
+Overrides = Dict[str, Dict[str, Any]]
+
+
+class BalanceStats:
+    """Aggregated results of many matches, plain dicts only so that it can be sent back by worker processes."""
+
+    def __init__(self):
+        self.matches = {}  # type: Dict[Tuple[str, str], int]
+        self.wins = {}  # type: Dict[Tuple[str, str], int]
+        self.draws = 0
+        self.kill_times = {}  # type: Dict[Tuple[str, str], List[float]]
+        self.attack_damage = {}  # type: Dict[Tuple[str, str], float]
+        self.character_time = {}  # type: Dict[str, float]
+        self.ticks = 0
+        self.simulated_time = 0.0
+
+    def merge(self, other: 'BalanceStats') -> 'BalanceStats':
+        for key, value in other.matches.items():
+            self.matches[key] = self.matches.get(key, 0) + value
+        for key, value in other.wins.items():
+            self.wins[key] = self.wins.get(key, 0) + value
+        for key, values in other.kill_times.items():
+            self.kill_times.setdefault(key, []).extend(values)
+        for key, value in other.attack_damage.items():
+            self.attack_damage[key] = self.attack_damage.get(key, 0.0) + value
+        for key, value in other.character_time.items():
+            self.character_time[key] = self.character_time.get(key, 0.0) + value
+        self.draws += other.draws
+        self.ticks += other.ticks
+        self.simulated_time += other.simulated_time
+        return self
+
+    @property
+    def total_matches(self) -> int:
+        # Every match is counted from the point of view of both characters
+        return sum(self.matches.values()) // 2
+
+    def win_rate(self, character: str, opponent: str) -> Optional[float]:
+        matches = self.matches.get((character, opponent), 0)
+        if matches == 0:
+            return None
+        return self.wins.get((character, opponent), 0) / matches
+
+    def average_time_to_kill(self, killer: str, victim: str) -> Optional[float]:
+        kill_times = self.kill_times.get((killer, victim))
+        if not kill_times:
+            return None
+        return sum(kill_times) / len(kill_times)
+
+    def damage_per_second(self, character: str, attack: str) -> float:
+        time = self.character_time.get(character, 0.0)
+        return self.attack_damage.get((character, attack), 0.0) / time if time > 0 else 0.0
+
+
+class MatchRecorder:
+    """Follows the characters of a HeadlessMatch to attribute damage to attacks and measure times to kill."""
+
+    def __init__(self, match: HeadlessMatch, stats: BalanceStats):
+        self._match = match
+        self._stats = stats
+        self._spawn_times = {}  # type: Dict[Character, float]
+        match.on_character_spawn += self.on_character_spawn
+        for player in (match.player1, match.player2):
+            self.on_character_spawn(player)
+
+    def on_character_spawn(self, player: Player):
+        character = player.character
+        self._spawn_times[character] = self._match.elapsed_time
+        character.on_damage_taken += self.on_damage_taken
+
+    def on_damage_taken(self, character: Character, damage_data: DamageData, health_lost: float):
+        source = damage_data.source
+        attacker = getattr(source, "owner", None)
+        if not isinstance(attacker, Character):
+            return
+        key = (attacker.data.name, getattr(source, "name", "") or type(source).__name__)
+        self._stats.attack_damage[key] = self._stats.attack_damage.get(key, 0.0) + health_lost
+        if character.is_dead:
+            kill_time = self._match.elapsed_time - self._spawn_times.pop(character, 0.0)
+            self._stats.kill_times.setdefault((attacker.data.name, character.data.name), []).append(kill_time)
+
+
+_worker_characters = None  # type: Optional[ResourcesRegistry[str, CharacterDataFactory]]
+
+
+def load_characters(overrides: Overrides = None) -> ResourcesRegistry[str, CharacterDataFactory]:
+    if not overrides:
+        return ResourcesManager.characters
+    return CharacterLoader.load_characters_from_json(
+        get_project_root() + "/assets/characters/characters.json",
+        ResourcesManager.settings,
+        ResourcesRegistry.ResourceRegistryBuilder(),
+        overrides=overrides
+    ).build()
+
+
+def check_arguments(character_names: List[str], overrides: Overrides = None) -> None:
+    """
+    Raises ValueError for an unknown character or override, a typo would otherwise give results that look valid but
+    test nothing.
+    """
+    characters = list(ResourcesManager.characters.keys())
+    for name in character_names:
+        if name not in characters:
+            raise ValueError("Unknown character '{}', available characters: {}".format(name, ", ".join(characters)))
+    if overrides:
+        CharacterLoader.check_overrides(get_project_root() + "/assets/characters/characters.json", overrides)
+
+
+def init_worker(overrides: Overrides = None):
+    """Process pool initializer, assets are loaded once per worker and reused by every match it plays."""
+    global _worker_characters
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    _worker_characters = load_characters(overrides)
+
+
+def play_matches(character1: str, character2: str, count: int, seed: str, tick_rate: float, max_duration: float
+                 ) -> BalanceStats:
+    characters = _worker_characters if _worker_characters is not None else load_characters()
+    rng = random.Random(seed)
+    stats = BalanceStats()
+
+    for i in range(count):
+        # Sides are swapped every other match, the left spawn point must not bias the results
+        left, right = (character1, character2) if i % 2 == 0 else (character2, character1)
+        match = HeadlessMatch(left, right,
+                              ChaseInputSource(random.Random(rng.random())),
+                              ChaseInputSource(random.Random(rng.random())),
+                              tick_rate=tick_rate, max_duration=max_duration,
+                              rng=random.Random(rng.random()), characters=characters)
+        MatchRecorder(match, stats)
+        result = match.run()
+
+        stats.ticks += result.ticks
+        stats.simulated_time += result.duration
+        stats.matches[(left, right)] = stats.matches.get((left, right), 0) + 1
+        stats.matches[(right, left)] = stats.matches.get((right, left), 0) + 1
+        for name in (left, right):
+            stats.character_time[name] = stats.character_time.get(name, 0.0) + result.duration
+        if result.is_draw:
+            stats.draws += 1
+        elif result.winner == match.player1.name:
+            stats.wins[(left, right)] = stats.wins.get((left, right), 0) + 1
+        else:
+            stats.wins[(right, left)] = stats.wins.get((right, left), 0) + 1
+
+    return stats
+
+
+def run_balance(character_names: List[str], matches_per_pair: int, workers: int = None, batch_size: int = 10,
+                tick_rate: float = 120, max_duration: float = 180, seed: int = 0, overrides: Overrides = None,
+                progress=None) -> BalanceStats:
+    """
+    Plays matches_per_pair matches for every pair of characters (mirror matches included) over a process pool.
+    Pairs are split in batches of batch_size matches so that every core stays busy until the end.
+    """
+    # checked before starting the workers, each of them would fail on its own otherwise
+    check_arguments(character_names, overrides)
+    jobs = []
+    for character1, character2 in combinations_with_replacement(character_names, 2):
+        for batch, start in enumerate(range(0, matches_per_pair, batch_size)):
+            count = min(batch_size, matches_per_pair - start)
+            jobs.append((character1, character2, count, "{}-{}-{}-{}".format(seed, character1, character2, batch)))
+
+    stats = BalanceStats()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(overrides,)) as executor:
+        futures = [
+            executor.submit(play_matches, character1, character2, count, job_seed, tick_rate, max_duration)
+            for character1, character2, count, job_seed in jobs
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            stats.merge(future.result())
+            if progress is not None:
+                progress(done, len(futures))
+    return stats
@@ -45,6 +45,12 @@ class BaseGame(ABC):
     def level(self):
         pass
 
+    @property
+    @abstractmethod
+    def interpolation(self) -> float:
+        """Progress between the last two simulation ticks, used to interpolate the rendered positions."""
+        pass
+
     @property
     @abstractmethod
     def on_resize(self) -> Event[Surface]:
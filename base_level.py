@@ -1,7 +1,7 @@
 from abc import abstractmethod, ABC
 from typing import Iterable, List
 
-from pygame import Vector2
+from pygame import Rect, Vector2
 
 from render.parallax_background import ParallaxBackground
 
@@ -53,10 +53,18 @@ class BaseLevel(ABC):
     def request_entity_removal(self, entity: 'Entity'):
         pass
 
+    @abstractmethod
+    def clear(self):
+        pass
+
     @abstractmethod
     def get_entities(self) -> Iterable['Entity']:
         pass
 
+    @abstractmethod
+    def get_entities_in(self, rect: Rect) -> List['Entity']:
+        pass
+
     @abstractmethod
     def update(self, dt):
         pass
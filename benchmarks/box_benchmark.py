@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of the slotted Box against the property based Box it replaced.
+
+Usage: python -m benchmarks.box_benchmark [--iterations 200000]
+"""
+import argparse
+import timeit
+
+from pygame import Rect
+
+from entities.box import Box
+
+
+class LegacyBox:
+    """The accessors of the previous Box used by the benchmark, every value behind a property."""
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = value
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def midbottom(self):
+        return self.x + self.width / 2, self.bottom
+
+    @midbottom.setter
+    def midbottom(self, value):
+        self.x, self.y = value[0] - self.width / 2, value[1] - self.height
+
+    @property
+    def rect(self) -> Rect:
+        return Rect(self.x, self.y, self.width, self.height)
+
+
+CASES = [
+    ("integrate", "box.x += 1.5 * dt; box.y += 2.5 * dt", None),
+    ("midbottom get/set", "box.midbottom = box.midbottom", None),
+    ("rect export", "box.rect", "box.write_rect(rect)"),
+    ("rect export + center", "box.rect.center", "box.write_rect(rect).center"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark of Box.")
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    print("{:<22} {:>12} {:>12} {:>10}".format("operation", "legacy (ns)", "slotted (ns)", "speedup"))
+    for name, legacy_statement, slotted_statement in CASES:
+        legacy = timeit.timeit(legacy_statement, number=args.iterations, globals={
+            "box": LegacyBox(10.5, 20.5, 30, 40), "dt": 1 / 120
+        })
+        slotted = timeit.timeit(slotted_statement or legacy_statement, number=args.iterations, globals={
+            "box": Box(10.5, 20.5, 30, 40), "rect": Rect(0, 0, 0, 0), "dt": 1 / 120
+        })
+        print("{:<22} {:>12.1f} {:>12.1f} {:>9.2f}x".format(
+            name, legacy / args.iterations * 1e9, slotted / args.iterations * 1e9, legacy / slotted
+        ))
+
+
+if __name__ == "__main__":
+    main()
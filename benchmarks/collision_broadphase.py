@@ -0,0 +1,102 @@
+"""
+Compares the spatial hash broadphase of Level with the previous brute force spritecollide pass.
+
+Usage: python -m benchmarks.collision_broadphase [--counts 10 100 1000 5000] [--ticks 20]
+"""
+import argparse
+import random
+import time
+
+import pygame
+from pygame import Vector2
+
+from collisions.spatial_hash import SpatialHash
+from entities.entity import Entity
+from level import Level
+from render.parallax_background import ParallaxBackground
+from utils.multi_dispatcher import MultiDispatcher
+
+
+class BenchEntity(Entity):
+
+    _IMAGE = None
+
+    @property
+    def image(self) -> pygame.Surface:
+        if BenchEntity._IMAGE is None:
+            BenchEntity._IMAGE = pygame.Surface((1, 1))
+        return BenchEntity._IMAGE
+
+
+def bench_collide(a: BenchEntity, b: BenchEntity) -> None:
+    pass
+
+
+def create_level(count: int, width: float, seed: int) -> Level:
+    builder = MultiDispatcher[None].MultiDispatcherBuilder()
+    builder.register(bench_collide)
+    level = Level(builder.build(), ParallaxBackground([]), [Vector2(0, 0)], width, 1000, 0, 800,
+                  broadphase=SpatialHash(128))
+    rng = random.Random(seed)
+    for _ in range(count):
+        entity = BenchEntity(level)
+        entity.box.size = (rng.randint(20, 60), rng.randint(20, 120))
+        entity.box.midbottom = (rng.uniform(0, width), -rng.uniform(0, 300))
+        entity.velocity.x = rng.uniform(-200, 200)
+        level.add_entity(entity)
+    return level
+
+
+def brute_force_collisions(level: Level) -> None:
+    """The collision pass of Level before the broadphase was introduced."""
+    entities = level.get_entities()
+    for entity in entities:
+        collided_sprites = pygame.sprite.spritecollide(entity, entities, False)
+
+        def distance_to_nearest_edge(sprite):
+            center_distance = Vector2(sprite.rect.center).distance_squared_to(Vector2(entity.rect.center))
+            half_diagonal = sprite.rect.width ** 2 + sprite.rect.height ** 2
+            return max(0, center_distance - half_diagonal)
+
+        collided_sprites.sort(key=distance_to_nearest_edge)
+
+        for collided_sprite in collided_sprites:
+            if collided_sprite != entity and not collided_sprite.destroyed:
+                level._collision_dispatcher.dispatch_no_collect(entity, collided_sprite)
+
+
+def spatial_hash_collisions(level: Level) -> None:
+    level._update_broadphase()
+    level._handle_collisions()
+
+
+def measure(fn, level: Level, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        fn(level)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the Level collision broadphase.")
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 50, 100, 500, 1000, 2000, 5000])
+    parser.add_argument('--ticks', type=int, default=10, help="Collision passes measured per entity count.")
+    parser.add_argument('--brute-force-limit', type=int, default=2000,
+                        help="Entity count above which the brute force pass is skipped.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:>8} {:>16} {:>18} {:>10}".format("entities", "brute force (ms)", "spatial hash (ms)", "speedup"))
+    for count in args.counts:
+        # Density is kept constant so that the number of real collisions grows linearly
+        level = create_level(count, width=count * 40, seed=args.seed)
+        hashed = measure(spatial_hash_collisions, level, args.ticks)
+        if count <= args.brute_force_limit:
+            brute = measure(brute_force_collisions, level, max(1, args.ticks // 5))
+            print("{:>8} {:>16.3f} {:>18.3f} {:>9.1f}x".format(count, brute * 1000, hashed * 1000, brute / hashed))
+        else:
+            print("{:>8} {:>16} {:>18.3f} {:>10}".format(count, "-", hashed * 1000, "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares the per entity physics of Level with the VectorizedPhysics backend.
+
+Usage: python -m benchmarks.physics_kernel [--counts 10 100 1000 5000] [--ticks 50]
+"""
+import argparse
+import random
+import time
+
+from pygame import Vector2
+
+from benchmarks.collision_broadphase import BenchEntity
+from level import Level
+from physics.vectorized_physics import VectorizedPhysics
+from render.parallax_background import ParallaxBackground
+from utils.multi_dispatcher import MultiDispatcher
+
+
+def create_level(count: int, physics: VectorizedPhysics, seed: int) -> Level:
+    width = count * 40
+    level = Level(MultiDispatcher[None].MultiDispatcherBuilder().build(), ParallaxBackground([]), [Vector2(0, 0)],
+                  width, 1000, 1500, 800, physics=physics)
+    rng = random.Random(seed)
+    for _ in range(count):
+        entity = BenchEntity(level)
+        entity.box.size = (rng.randint(20, 60), rng.randint(20, 120))
+        entity.box.midbottom = (rng.uniform(0, width), -rng.uniform(0, 300))
+        entity.velocity.x = rng.uniform(-1000, 1000)
+        level.add_entity(entity)
+    return level
+
+
+def physics_pass(level: Level, dt: float) -> None:
+    """Level.update without the collision pass."""
+    level._all_sprites.update(dt)
+    if level._physics is None:
+        for entity in level._entities:
+            level._update_entity_position(dt, entity)
+    else:
+        level._physics.step(dt, level._gravity, level.origin.x, level.origin.y - level.height,
+                            level.origin.x + level.width, level.origin.y, level._max_velocity_x)
+
+
+def measure(level: Level, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        physics_pass(level, 1 / 120)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the Level physics backends.")
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:>8} {:>16} {:>16} {:>10}".format("entities", "per entity (ms)", "vectorized (ms)", "speedup"))
+    for count in args.counts:
+        python_time = measure(create_level(count, None, args.seed), args.ticks)
+        vectorized_time = measure(create_level(count, VectorizedPhysics(), args.seed), args.ticks)
+        print("{:>8} {:>16.3f} {:>16.3f} {:>9.1f}x".format(
+            count, python_time * 1000, vectorized_time * 1000, python_time / vectorized_time
+        ))
+
+
+if __name__ == "__main__":
+    main()
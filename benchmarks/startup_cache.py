@@ -0,0 +1,53 @@
+"""
+Compares the loading time of every character with a cold and a warm sprite frame cache.
+Each launch is a new process using a temporary cache directory.
+
+Usage: python -m benchmarks.startup_cache [--runs 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from utils.utils import get_project_root
+
+LOAD_CHARACTERS = """
+import os, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+from resources.resources_manager import ResourcesManager
+ResourcesManager.settings["frame_cache"] = {use_cache}
+start = time.perf_counter()
+ResourcesManager.characters
+print(time.perf_counter() - start)
+"""
+
+
+def load_time(cache_home: str, use_cache: bool) -> float:
+    env = dict(os.environ, XDG_CACHE_HOME=cache_home, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run(
+        [sys.executable, "-c", LOAD_CHARACTERS.format(use_cache=use_cache)],
+        cwd=get_project_root(), env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    return float(output.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the startup with and without the frame cache.")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print("{:>4} {:>12} {:>10} {:>10}".format("run", "no cache (s)", "cold (s)", "warm (s)"))
+    for run in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_home:
+            no_cache = load_time(cache_home, False)
+            cold = load_time(cache_home, True)
+            warm = load_time(cache_home, True)
+        print("{:>4} {:>12.3f} {:>10.3f} {:>10.3f}".format(run, no_cache, cold, warm))
+
+
+if __name__ == "__main__":
+    main()
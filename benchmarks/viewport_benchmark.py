@@ -0,0 +1,83 @@
+"""
+Compares the frame time of the split screen with the two viewports rasterized one after the other and with the
+second one on a worker thread, at several resolutions. Only Scene.draw is timed, the simulation runs between the
+frames. Both runs are seeded alike, the last column tells whether they drew the same pixels.
+
+Usage: python -m benchmarks.viewport_benchmark [--frames 300] [--resolutions 960x540 1920x1080] [--characters Huntress Wizard]
+"""
+import argparse
+import hashlib
+import os
+import random
+import time
+from typing import List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import key_bindings
+from resources.resources_manager import ResourcesManager
+
+DEFAULT_RESOLUTIONS = ["960x540", "1176x664", "1920x1080", "2560x1440"]
+
+
+def parse_resolution(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def measure(resolution: Tuple[int, int], characters: List[str], frames: int, parallel: bool, seed: int
+            ) -> Tuple[float, str]:
+    """Mean time of Scene.draw in milliseconds and a digest of the frames drawn."""
+    from game import Game
+    from render.scene import Scene
+
+    ResourcesManager.settings["parallel_viewports"] = parallel
+    screen = pygame.display.set_mode(resolution)
+    # the respawn points are random as well
+    random.seed(seed)
+    game = Game(screen, characters[0], characters[1], fps=0)
+    scene = game._scene_stack[0]  # type: Scene
+    rng = random.Random(seed)
+    digest = hashlib.md5()
+    elapsed = 0.0
+    try:
+        for _ in range(frames):
+            for player in (game.player1, game.player2):
+                player.input(1 / 60, {command: rng.random() < 0.3 for command in key_bindings.Command})
+            game.level.update(1 / 60)
+            scene.update(1 / 60)
+            start = time.perf_counter()
+            scene.draw()
+            elapsed += time.perf_counter() - start
+            digest.update(pygame.image.tobytes(screen, "RGB"))
+    finally:
+        scene.shutdown()
+    return elapsed / frames * 1000, digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the rasterization of the second viewport on a worker thread.")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--resolutions', nargs='+', default=DEFAULT_RESOLUTIONS)
+    parser.add_argument('--characters', nargs=2, default=["Huntress", "Wizard"])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    # characters and textures are loaded once the display exists
+    pygame.display.set_mode((1, 1))
+
+    print("cpus: {}".format(os.cpu_count()))
+    print("{:<11} {:>11} {:>13} {:>9} {:>10}".format("resolution", "serial (ms)", "parallel (ms)", "speedup", "identical"))
+    for text in args.resolutions:
+        resolution = parse_resolution(text)
+        serial, serial_digest = measure(resolution, args.characters, args.frames, False, args.seed)
+        parallel, parallel_digest = measure(resolution, args.characters, args.frames, True, args.seed)
+        print("{:<11} {:>11.2f} {:>13.2f} {:>8.2f}x {:>10}".format(text, serial, parallel, serial / parallel,
+                                                                   str(serial_digest == parallel_digest)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from enum import IntFlag
+
+
+class CollisionLayer(IntFlag):
+    NONE = 0
+    DEFAULT = 1
+    CHARACTER = 2
+    ATTACK = 4
+    ALL = 0xFFFF
+
+
+def can_collide(a, b) -> bool:
+    """Both entities must accept the category of the other, as with Box2D filters."""
+    return (a.collision_mask & b.collision_category) != 0 and (b.collision_mask & a.collision_category) != 0
+
+
+def is_same_team(a, b) -> bool:
+    friendly_obj = getattr(a, "friendly_obj", None)
+    return friendly_obj is not None and friendly_obj == getattr(b, "friendly_obj", None)
@@ -0,0 +1,122 @@
+from typing import Dict, Hashable, Iterator, Tuple
+
+from pygame import Rect
+
+CellRange = Tuple[int, int, int, int]
+
+
+class SpatialHash:
+    """
+    Uniform grid broadphase. Every object is bucketed in all the cells covered by its rect, so only objects
+    sharing at least one cell are ever tested against each other by the narrowphase.
+    """
+
+    def __init__(self, cell_size: float = 128):
+        if cell_size <= 0:
+            raise ValueError("Invalid cell size: {}".format(cell_size))
+        self._cell_size = cell_size
+        # dicts are used as ordered sets so that the iteration order (and thus the collision order) is deterministic
+        self._cells = {}  # type: Dict[Tuple[int, int], Dict[Hashable, None]]
+        self._ranges = {}  # type: Dict[Hashable, CellRange]
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self._ranges
+
+    def cell_range(self, rect: Rect) -> CellRange:
+        cell_size = self._cell_size
+        left, top = rect.left, rect.top
+        # Rect.right and Rect.bottom are exclusive
+        right = max(left, rect.right - 1)
+        bottom = max(top, rect.bottom - 1)
+        return int(left // cell_size), int(top // cell_size), int(right // cell_size), int(bottom // cell_size)
+
+    def insert(self, obj: Hashable, rect: Rect) -> None:
+        if obj in self._ranges:
+            self.update(obj, rect)
+            return
+        cell_range = self.cell_range(rect)
+        self._ranges[obj] = cell_range
+        self._add_to_cells(obj, cell_range)
+
+    def remove(self, obj: Hashable) -> None:
+        cell_range = self._ranges.pop(obj, None)
+        if cell_range is not None:
+            self._remove_from_cells(obj, cell_range)
+
+    def update(self, obj: Hashable, rect: Rect) -> None:
+        """Moves an object to the cells covered by rect. Nothing is done while it stays within the same cells."""
+        old_range = self._ranges.get(obj)
+        if old_range is None:
+            self.insert(obj, rect)
+            return
+        new_range = self.cell_range(rect)
+        if new_range == old_range:
+            return
+        self._remove_from_cells(obj, old_range)
+        self._ranges[obj] = new_range
+        self._add_to_cells(obj, new_range)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._ranges.clear()
+
+    def query(self, rect: Rect) -> Iterator[Hashable]:
+        """Yields once every object sharing at least one cell with rect."""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self._cells
+        if x0 == x1 and y0 == y1:
+            yield from cells.get((x0, y0), ())
+            return
+        seen = set()
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for obj in cells.get((x, y), ()):
+                    if obj not in seen:
+                        seen.add(obj)
+                        yield obj
+
+    def candidate_pairs(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """
+        Yields each unordered pair of objects sharing a cell exactly once.
+        A pair is only reported by the first cell (in x then y order) of the intersection of both cell ranges,
+        so no set of already reported pairs is needed.
+        """
+        ranges = self._ranges
+        for (cx, cy), bucket in self._cells.items():
+            if len(bucket) < 2:
+                continue
+            objs = list(bucket)
+            for i, a in enumerate(objs):
+                ax0, ay0, _, _ = ranges[a]
+                for b in objs[i + 1:]:
+                    bx0, by0, _, _ = ranges[b]
+                    if (ax0 if ax0 > bx0 else bx0) == cx and (ay0 if ay0 > by0 else by0) == cy:
+                        yield a, b
+
+    def _add_to_cells(self, obj: Hashable, cell_range: CellRange) -> None:
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bucket = cells.get((x, y))
+                if bucket is None:
+                    bucket = cells[(x, y)] = {}
+                bucket[obj] = None
+
+    def _remove_from_cells(self, obj: Hashable, cell_range: CellRange) -> None:
+        x0, y0, x1, y1 = cell_range
+        cells = self._cells
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bucket = cells.get((x, y))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del cells[(x, y)]
@@ -3,9 +3,10 @@ from pygame import Vector2
 
 class DamageData:
 
-    def __init__(self, damage: float, velocity: Vector2):
+    def __init__(self, damage: float, velocity: Vector2, source: object = None):
         self._damage = damage
         self._velocity = velocity
+        self._source = source
 
     @property
     def damage(self) -> float:
@@ -15,5 +16,10 @@ class DamageData:
     def velocity(self) -> Vector2:
         return self._velocity
 
+    @property
+    def source(self) -> object:
+        """Entity that dealt the damage, if known."""
+        return self._source
+
     def __repr__(self):
         return "DamageData(damage={}, velocity={})".format(self._damage, self._velocity)
\ No newline at end of file
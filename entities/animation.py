@@ -1,20 +1,68 @@
-from typing import List
+from typing import List, Sequence, Tuple, Union
 
 import pygame
 from pygame import Surface
 
 
+class AnimationFrames:
+    """
+    Right and left facing frames of an animation, flipped once and shared by all the Animation playing them.
+    offsets are the positions of the trimmed frames in their cell of the sprite sheet. anchor_offset moves the
+    sprite back to where the offset_center of the character expects it when the frames were not trimmed one by one.
+    """
+
+    __slots__ = ("_right_images", "_left_images", "_offsets", "_anchor_offset")
+
+    def __init__(self, images: Sequence[Surface], offsets: Sequence[Tuple[int, int]] = None,
+                 anchor_offset: Tuple[int, int] = (0, 0)):
+        # flip keeps the pixel format, frames already converted to the display format stay converted
+        self._right_images = tuple(images)
+        self._left_images = tuple(pygame.transform.flip(image, True, False) for image in images)
+        self._offsets = tuple(offsets) if offsets is not None else ((0, 0),) * len(self._right_images)
+        self._anchor_offset = anchor_offset
+
+    def __len__(self):
+        return len(self._right_images)
+
+    @property
+    def right_images(self):
+        return self._right_images
+
+    @property
+    def left_images(self):
+        return self._left_images
+
+    @property
+    def offsets(self) -> Tuple[Tuple[int, int], ...]:
+        return self._offsets
+
+    @property
+    def anchor_offset(self) -> Tuple[int, int]:
+        return self._anchor_offset
+
+
 class Animation:
 
-    def __init__(self, images: List[Surface], total_time_seconds: float, loop: int = 1):
-        self._right_images = images
-        self._left_images = [pygame.transform.flip(image, True, False) for image in images]
-        self.speed = total_time_seconds / len(images)
+    def __init__(self, frames: Union[AnimationFrames, List[Surface]], total_time_seconds: float, loop: int = 1):
+        if not isinstance(frames, AnimationFrames):
+            frames = AnimationFrames(frames)
+        self._frames = frames
+        self._right_images = frames.right_images
+        self._left_images = frames.left_images
+        self.speed = total_time_seconds / len(frames)
         self.current_frame = 0
         self.time_since_last_frame = 0
         self.loop = loop
         self._is_finished = False
 
+    @property
+    def frames(self) -> AnimationFrames:
+        return self._frames
+
+    @property
+    def anchor_offset(self) -> Tuple[int, int]:
+        return self._frames.anchor_offset
+
     @property
     def default_image(self) -> Surface:
         return self._right_images[0]
@@ -1,40 +1,100 @@
-from typing import List
+from bisect import bisect_right
+from typing import List, Tuple
 
-import pygame
 from pygame import Rect
 
 from resources.stats_loader import AttackFrame
 
 
-class AttackTrajectory:
+class AttackTimeline:
+    """
+    Immutable hitbox timeline of an attack definition, shared by all its instances.
+    Each segment ends at a cumulative time in ms, the segment active at a given time is found by bisection.
+    The hitbox rects hold the offset of the hitbox center from the owner center, one per facing direction.
+    """
+
+    __slots__ = ("_end_times", "_rects", "_reversed_rects", "_duration")
+
     def __init__(self, frames: List[AttackFrame]):
-        self.frames = frames
-        self.rects = [Rect(frame.offset_top_left, frame.size) for frame in frames]
-        self.total_duration = sum([frame.time_ms for frame in frames])
-        self.elapsed_time = 0
-        self.current_segment = 0
-        self._current_rect = self.rects[0]  # Copie du premier Rect pour commencer
-        self._is_finished = False
-
-    def update(self, dt):
-        self.elapsed_time += dt * 1000
-        if self.elapsed_time >= self.frames[self.current_segment].time_ms:
-            self.elapsed_time = 0
-            self.current_segment += 1
-            if self.current_segment < len(self.rects):
-                self._current_rect = self.rects[self.current_segment]
-            else:
-                self._is_finished = True
-
-    def reset(self):
-        self.elapsed_time = 0
-        self.current_segment = 0
-        self._current_rect = self.rects[0]
-        self._is_finished = False
+        if not frames:
+            raise ValueError("An attack timeline needs at least one frame")
+        end_times = []
+        end_time = 0.0
+        for frame in frames:
+            end_time += frame.time_ms
+            end_times.append(end_time)
+        self._end_times = tuple(end_times)  # type: Tuple[float, ...]
+        self._duration = end_time
+        self._rects = tuple(Rect(frame.offset_top_left, frame.size) for frame in frames)  # type: Tuple[Rect, ...]
+        self._reversed_rects = tuple(
+            Rect((-frame.offset_top_left[0], frame.offset_top_left[1]), frame.size) for frame in frames
+        )  # type: Tuple[Rect, ...]
+
+    def __len__(self):
+        return len(self._end_times)
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def end_times(self) -> Tuple[float, ...]:
+        return self._end_times
+
+    def segment_at(self, time_ms: float) -> int:
+        """Index of the segment active at time_ms, len(self) once the timeline is over."""
+        return bisect_right(self._end_times, time_ms)
+
+    def rect(self, segment: int, reversed: bool = False) -> Rect:
+        """Hitbox of a segment, the last one past the end. Shared between instances, must not be modified."""
+        rects = self._reversed_rects if reversed else self._rects
+        return rects[min(segment, len(rects) - 1)]
+
+    def rect_at(self, time_ms: float, reversed: bool = False) -> Rect:
+        return self.rect(self.segment_at(time_ms), reversed)
+
+
+class AttackTrajectory:
+    """Playback of a shared AttackTimeline, only the time elapsed since the start of the attack is kept."""
+
+    __slots__ = ("_timeline", "_elapsed_time", "_current_segment")
+
+    def __init__(self, timeline: AttackTimeline):
+        self._timeline = timeline
+        self._elapsed_time = 0.0
+        self._current_segment = 0
+
+    @property
+    def timeline(self) -> AttackTimeline:
+        return self._timeline
+
+    @property
+    def elapsed_time(self) -> float:
+        """Time since the start of the attack in ms."""
+        return self._elapsed_time
+
+    @property
+    def current_segment(self) -> int:
+        return self._current_segment
+
+    def update(self, dt: float) -> None:
+        self.seek(self._elapsed_time + dt * 1000)
+
+    def seek(self, time_ms: float) -> None:
+        """Moves to any time of the attack, e.g. for replays or rollback."""
+        self._elapsed_time = max(0.0, time_ms)
+        self._current_segment = self._timeline.segment_at(self._elapsed_time)
+
+    def reset(self) -> None:
+        self.seek(0.0)
+
+    def hitbox(self, reversed: bool = False) -> Rect:
+        """Offset and size of the current hitbox for the given facing. Shared, must not be modified."""
+        return self._timeline.rect(self._current_segment, reversed)
 
     @property
-    def current_rect(self):
-        return Rect(self._current_rect)
+    def current_rect(self) -> Rect:
+        return Rect(self.hitbox())
 
-    def is_complete(self):
-        return self._is_finished
+    def is_complete(self) -> bool:
+        return self._current_segment >= len(self._timeline)
@@ -2,44 +2,17 @@ from pygame import Rect
 
 
 class Box:
+    """
+    Floating point rect. The four values are plain slots, every other accessor is derived from them.
+    """
 
-    def __init__(self, x: float, y: float, width: float, height: float):
-        self._x = x
-        self._y = y
-        self._width = width
-        self._height = height
-
-    @property
-    def x(self):
-        return self._x
-
-    @x.setter
-    def x(self, value):
-        self._x = value
-
-    @property
-    def y(self):
-        return self._y
-
-    @y.setter
-    def y(self, value):
-        self._y = value
-
-    @property
-    def width(self):
-        return self._width
-
-    @width.setter
-    def width(self, value):
-        self._width = value
+    __slots__ = ("x", "y", "width", "height")
 
-    @property
-    def height(self):
-        return self._height
-
-    @height.setter
-    def height(self, value):
-        self._height = value
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
 
     @property
     def left(self):
@@ -174,11 +147,31 @@ class Box:
 
     @property
     def rect(self) -> Rect:
+        """New Rect on every access, prefer write_rect in code running every frame."""
         return Rect(self.x, self.y, self.width, self.height)
 
     @rect.setter
     def rect(self, value: Rect):
         self.x, self.y, self.width, self.height = value
 
+    def write_rect(self, rect: Rect) -> Rect:
+        """Exports the box into a Rect owned by the caller, without allocating."""
+        rect.update(self.x, self.y, self.width, self.height)
+        return rect
+
+    @property
+    def values(self):
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def bounds(self):
+        """left, top, right, bottom"""
+        x, y = self.x, self.y
+        return x, y, x + self.width, y + self.height
+
+    def integrate(self, velocity, dt: float) -> None:
+        self.x += velocity.x * dt
+        self.y += velocity.y * dt
+
     def __repr__(self):
         return "Box({}, {}, {}, {})".format(self.x, self.y, self.width, self.height)
@@ -3,6 +3,7 @@ from typing import Any, Iterable, Dict
 from pygame import Vector2, Rect, Surface
 
 from base_level import BaseLevel
+from collisions.collision_layers import CollisionLayer
 from comps.damage_data import DamageData
 from comps.damageable import Damageable
 from comps.friendly_obj import FriendObject
@@ -14,6 +15,9 @@ from utils.event import Event
 
 class Character(Entity, Damageable):
 
+    collision_category = int(CollisionLayer.CHARACTER)
+    collision_mask = int(CollisionLayer.ATTACK)
+
     def __init__(self,
                  level: BaseLevel,
                  character_data: CharacterData,
@@ -37,14 +41,23 @@ class Character(Entity, Damageable):
         self._before_next_attack_time = 0.5
         self._before_next_attack_counter = 0.0
         self._invulnerable_image = None
+        self._image_rect = Rect(0, 0, 0, 0)
         self.on_death = Event[Character]()
+        self.on_damage_taken = Event[Character]()  # (character, damage_data, health lost)
 
     @property
     def image_rect(self) -> Rect:
-        direction = 1 if not self._reversed else -1
-        return self.image.get_rect(
-            midbottom=direction * Vector2(self.animations.offset_center) + Vector2(self.box.rect.midbottom)
-        )
+        offset_x, offset_y = self.animations.offset_center
+        if self._reversed:
+            offset_x, offset_y = -offset_x, -offset_y
+        anchor_x, anchor_y = self.animations.anchor_offset
+        offset_x += -anchor_x if self._reversed else anchor_x
+        offset_y += anchor_y
+        midbottom_x, bottom = self.rect.midbottom
+        image_rect = self._image_rect
+        image_rect.size = self.image.get_size()
+        image_rect.midbottom = (midbottom_x + offset_x, bottom + offset_y)
+        return image_rect
 
     @property
     def image(self) -> Surface:
@@ -61,6 +74,7 @@ class Character(Entity, Damageable):
 
     def take_damage(self, damage_data: DamageData) -> None:
         if not self.invulnerable and not self.is_dead:
+            health_before = self.health
             Damageable.take_damage(self, damage_data)
             if self.is_dead:
                 self.animations.request_animation("DEATH")
@@ -71,6 +85,8 @@ class Character(Entity, Damageable):
 
             self._cancel_attacks()
 
+            self.on_damage_taken(self, damage_data, health_before - self.health)
+
     def _cancel_attacks(self):
         self.primary_attack.cancel()
         self.secondary_attack.cancel()
@@ -29,6 +29,11 @@ class CharacterAnimation:
     def offset_center(self) -> Tuple[int, int]:
         return self._offset_center
 
+    @property
+    def anchor_offset(self) -> Tuple[int, int]:
+        """Offset of the current animation, added to offset_center to place its frames."""
+        return self._animations[self._current_animation][1].anchor_offset
+
     def request_animation(self, animation_type: AnimationType) -> None:
         anim = self._animations[animation_type]
         self._animations_pending[anim[0]] = (animation_type, anim[1])
@@ -1,16 +1,21 @@
 from abc import abstractmethod, ABC
 from math import ceil, floor
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Tuple
 
 import pygame.sprite
 from pygame import Vector2, Rect
 
 from base_level import BaseLevel
+from collisions.collision_layers import CollisionLayer
 from entities.box import Box
 
 
 class Entity(pygame.sprite.Sprite, ABC):
 
+    # Plain ints are used in the collision loop, IntFlag operators are comparatively slow
+    collision_category = int(CollisionLayer.DEFAULT)
+    collision_mask = int(CollisionLayer.ALL)
+
     def __init__(self,
                  level: BaseLevel,
                  ):
@@ -22,10 +27,17 @@ class Entity(pygame.sprite.Sprite, ABC):
 
         self._box = Box(0, 0, 0, 0)
 
+        # Rewritten by every access to rect, callers must not keep it across frames
+        self._rect = Rect(0, 0, 0, 0)
+
         self._reversed = False
 
         self._destroyed = False
 
+        # Box position at the end of the last two ticks, used for render interpolation
+        self._previous_position = None  # type: Optional[Tuple[float, float]]
+        self._current_position = None  # type: Optional[Tuple[float, float]]
+
     @property
     def box(self) -> Box:
         return self._box
@@ -57,7 +69,7 @@ class Entity(pygame.sprite.Sprite, ABC):
 
     @property
     def rect(self) -> Rect:
-        return self.box.rect
+        return self._box.write_rect(self._rect)
 
     @property
     def reversed(self) -> bool:
@@ -67,11 +79,44 @@ class Entity(pygame.sprite.Sprite, ABC):
     def destroyed(self) -> bool:
         return self._destroyed
 
+    def reset_state(self, level: BaseLevel) -> None:
+        """Puts back the state of a new entity, for entities reused by a pool."""
+        self._level = level
+        self._velocity.x = 0.0
+        self._velocity.y = 0.0
+        self._box.x = self._box.y = self._box.width = self._box.height = 0
+        self._reversed = False
+        self._destroyed = False
+        self._previous_position = None
+        self._current_position = None
+
+    def removed_from_level(self) -> None:
+        """Called by the level once the entity has been removed from it."""
+        pass
+
+    def record_position(self) -> None:
+        position = self.box.topleft
+        self._previous_position = self._current_position if self._current_position is not None else position
+        self._current_position = position
+
+    def interpolation_offset(self, alpha: float) -> Tuple[float, float]:
+        """Offset to apply to the current position to be at alpha between the last two ticks."""
+        if self._previous_position is None or alpha >= 1.0:
+            return 0.0, 0.0
+        return (
+            (self._previous_position[0] - self._current_position[0]) * (1.0 - alpha),
+            (self._previous_position[1] - self._current_position[1]) * (1.0 - alpha)
+        )
+
     def destroy(self) -> None:
         self.level.request_entity_removal(self)
         self._destroyed = True
 
+    def attach_physics_state(self, box: Box, velocity) -> None:
+        """Replaces the box and the velocity, used by physics backends keeping them in their own storage."""
+        self._box = box
+        self._velocity = velocity
+
     def update(self, dt: float) -> None:
-        self.box.x += self._velocity.x * dt
-        self.box.y += self._velocity.y * dt
+        self._box.integrate(self._velocity, dt)
 
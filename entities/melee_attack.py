@@ -1,8 +1,9 @@
-from typing import Callable
+from typing import Callable, Optional
 
-from pygame import Vector2
+from pygame import Rect, Vector2
 
 from base_level import BaseLevel
+from collisions.collision_layers import CollisionLayer
 from comps.damage_data import DamageData
 from comps.damage_dealer import DamageDealer
 from comps.damageable import Damageable
@@ -10,10 +11,14 @@ from entities.animation import Animation
 from entities.attack_trajectory import AttackTrajectory
 from entities.base_attack import BaseAttackExecutor
 from entities.entity import Entity
+from utils.object_pool import ObjectPool
 
 
 class MeleeAttack(Entity, DamageDealer, Damageable):
 
+    collision_category = int(CollisionLayer.ATTACK)
+    collision_mask = int(CollisionLayer.CHARACTER | CollisionLayer.ATTACK)
+
     def KNOCKBACK_FORCE(self, x: float = 1.0, y: float = 1.0) -> Vector2:
         return Vector2(x*self._owner.box.width*5, -y*self._owner.box.height*3)
 
@@ -27,16 +32,45 @@ class MeleeAttack(Entity, DamageDealer, Damageable):
                  animation: Animation,
                  health: float,
                  damage: float,
-                 friend_obj
+                 friend_obj,
+                 name: str = "",
+                 pool: 'Optional[ObjectPool[MeleeAttack]]' = None
                  ):
         Entity.__init__(self, level)
         DamageDealer.__init__(self, damage, friend_obj)
         Damageable.__init__(self, health, friend_obj)
         self._owner = owner
+        self._name = name
         self._trajectory = trajectory
         self._animation = animation
         self._elapsed_time = 0
-        self._rect = trajectory.current_rect  # hitbox
+        self._image_rect = Rect(0, 0, 0, 0)
+        self._pool = pool
+        # Incremented each time the attack is reused, references to a previous use can be told apart
+        self._generation = 0
+
+    def reset(self, level: BaseLevel, owner: Entity, friend_obj) -> None:
+        Entity.reset_state(self, level)
+        DamageDealer.__init__(self, self.damage, friend_obj)
+        Damageable.__init__(self, self.max_health, friend_obj)
+        self._owner = owner
+        self._trajectory.reset()
+        self._elapsed_time = 0
+        self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def removed_from_level(self) -> None:
+        # A released attack must not keep its owner, its players nor its level alive until it is reused, it also counts
+        # as destroyed when its level was cleared before it ended
+        self._owner = None
+        self._friendly_obj = None
+        self._level = None
+        self._destroyed = True
+        if self._pool is not None:
+            self._pool.release(self)
 
     def update(self, dt: float) -> None:
         if not self.can_continue():
@@ -46,17 +80,27 @@ class MeleeAttack(Entity, DamageDealer, Damageable):
         self._animation.update(dt)
 
         self._trajectory.update(dt)
-        self.box.rect = self._trajectory.current_rect
+        # La timeline contient déjà le décalage dans la direction de l'owner
+        hitbox = self._trajectory.hitbox(self._owner.reversed)
+        self.box.size = hitbox.size
 
-        # Ajuste la position en fonction de la direction de l'owner
-        if self._owner.reversed:  # Si l'owner est tourné vers la gauche
-            self.box.center = (self._owner.rect.centerx - self.rect.x, self._owner.rect.centery + self.rect.y)
-        else:  # Si l'owner est tourné vers la gauche
-            self.box.center = (self._owner.rect.centerx + self.rect.x, self._owner.rect.centery + self.rect.y)
+        owner_rect = self._owner.rect
+        self.box.center = (owner_rect.centerx + hitbox.x, owner_rect.centery + hitbox.y)
+
+    @property
+    def owner(self) -> Entity:
+        return self._owner
+
+    @property
+    def name(self) -> str:
+        return self._name
 
     @property
     def image_rect(self):
-        return self.image.get_rect(center=self.rect.center)
+        image_rect = self._image_rect
+        image_rect.size = self.image.get_size()
+        image_rect.center = self.rect.center
+        return image_rect
 
     @property
     def image(self):
@@ -64,7 +108,7 @@ class MeleeAttack(Entity, DamageDealer, Damageable):
 
     def deal_damage(self, damageable: Damageable) -> None:
         if not self.is_friendly(damageable):
-            damageable.take_damage(DamageData(self.damage, self.calculate_knockback()))
+            damageable.take_damage(DamageData(self.damage, self.calculate_knockback(), source=self))
 
     def take_damage(self, damage_data: DamageData) -> None:
         super().take_damage(damage_data)
@@ -77,8 +121,7 @@ class MeleeAttack(Entity, DamageDealer, Damageable):
     class MeleeAttackExecutor(BaseAttackExecutor):
 
         def cancel(self):
-            if self._current_attack is not None:
-                self._current_attack.destroy()
+            self._destroy_current_attack()
 
         def __init__(self, attack: Callable[[BaseLevel, Entity, object], 'MeleeAttack'], cooldown: float):
             self._attack_factory = attack
@@ -86,18 +129,26 @@ class MeleeAttack(Entity, DamageDealer, Damageable):
             self._elapsed_time = 0.0
             # noinspection PyTypeChecker
             self._current_attack = None  # type: MeleeAttack
+            self._current_attack_generation = 0
 
         def update(self, dt: float):
             self._elapsed_time -= dt
 
         def execute(self, level: BaseLevel, owner: Entity, friend_obj):
             if self.can_execute():
-                if self._current_attack is not None:
-                    self._current_attack.destroy()
+                self._destroy_current_attack()
                 self._elapsed_time = self._cooldown
                 self._current_attack = self._attack_factory(level, owner, friend_obj)
+                self._current_attack_generation = self._current_attack.generation
                 level.add_entity(self._current_attack)
 
+        def _destroy_current_attack(self):
+            # A finished attack may be back in its pool or already reused, it must not be destroyed again
+            attack = self._current_attack
+            if attack is not None and attack.generation == self._current_attack_generation and not attack.destroyed:
+                attack.destroy()
+            self._current_attack = None
+
         def can_execute(self):
             return self._elapsed_time <= 0.0
 
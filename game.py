@@ -1,6 +1,9 @@
+import queue
 import random
 import sys
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import pygame
 import pygame.threads
@@ -11,12 +14,16 @@ from base_game import BaseGame
 from entities.character import Character
 from level import Level
 from player import Player
+from render.render_snapshot import RenderSnapshot, SnapshotBuffer
 from render.result_scene import ResultScene
 from render.scene import Scene
 from resources.character_loader import CharacterDataFactory
 from resources.level_registry import LevelRegistry
 from resources.resources_manager import ResourcesManager
 from utils.event import Event
+from utils.pipeline_stats import PipelineStats
+
+Inputs = Dict[key_bindings.Command, Any]
 
 
 class Game(BaseGame):
@@ -37,7 +44,13 @@ class Game(BaseGame):
     def player2(self) -> Player:
         return self._player2
 
-    def __init__(self, screen: Surface, player1_character: str, player2_character: str, fps=1000, title="Game"):
+    # Longest frame time fed to the fixed tick accumulator, avoids the spiral of death after a hitch
+    MAX_FRAME_TIME = 0.25
+    # The pipelined mode needs a fixed timestep, used when none is given
+    PIPELINED_TICK_RATE = 120
+
+    def __init__(self, screen: Surface, player1_character: str, player2_character: str, fps=1000, title="Game",
+                 tick_rate: float = None, pipelined: bool = False):
 
         self._screen = screen
 
@@ -47,6 +60,11 @@ class Game(BaseGame):
 
         self._fps = fps
         self._clock = pygame.time.Clock()
+
+        # None keeps the variable timestep, the simulation then advances once per rendered frame
+        self._tick_duration = 1 / tick_rate if tick_rate else None
+        self._accumulator = 0.0
+        self._interpolation = 1.0
         self._running = True
         self._on_resize = Event[Surface]()
 
@@ -62,27 +80,133 @@ class Game(BaseGame):
 
         self._scene_stack = []
         self._scene_stack.append(Scene(self))
+        # players who lost their last life, the result scenes are pushed by the main thread (see _show_results): in
+        # pipelined mode the deaths happen on the simulation thread while the main thread draws the scenes
+        self._losers = queue.SimpleQueue()  # type: queue.SimpleQueue[Player]
 
         self._title_refresh_rate = 0.1
 
+        # Pipelined mode: the simulation runs on its own thread and publishes a snapshot of the level after each
+        # batch of ticks, the main thread reads the inputs and draws the latest snapshot meanwhile
+        self._pipelined = pipelined
+        self._snapshots = SnapshotBuffer()
+        # inputs of both players and when they were read, replaced as a whole by the main thread
+        self._shared_inputs = ({}, {}, time.perf_counter())  # type: Tuple[Inputs, Inputs, float]
+        self.pipeline_stats = PipelineStats()
+        self._simulation_error = None  # type: Optional[BaseException]
+        if pipelined and self._tick_duration is None:
+            self._tick_duration = 1 / self.PIPELINED_TICK_RATE
+
 
     @property
     def level(self):
         return self._level
 
+    @property
+    def interpolation(self) -> float:
+        return self._interpolation
+
     @property
     def window(self) -> pygame.Surface:
         return self._screen
 
     def run(self):
-        while self._running:
-            self.update()
-            self.draw()
+        try:
+            if self._pipelined:
+                self._run_pipelined()
+                return
+            while self._running:
+                self.update()
+                self.draw()
+        finally:
+            self._scene_stack[0].shutdown()
+            self._level.clear()
+
+    def _run_pipelined(self):
+        self._snapshots.publish(self._capture_snapshot(time.perf_counter(), 0))
+        simulation = threading.Thread(target=self._simulate, name="simulation", daemon=True)
+        simulation.start()
+        try:
+            while self._running:
+                p1_inputs, p2_inputs = self._read_inputs()
+                self._shared_inputs = (p1_inputs, p2_inputs, time.perf_counter())
+
+                self._clock.tick(self._fps)
+                frame_time = self._clock.get_time() / 1000
+
+                start = time.perf_counter()
+                snapshot = self._snapshots.latest()
+                # the snapshot is drawn one tick late, between the previous and the current positions
+                self._interpolation = min(1.0, (start - snapshot.time) / self._tick_duration)
+                self._scene_stack[0].snapshot = snapshot
+                self._show_results()
+                for scene in list(self._scene_stack):
+                    scene.update(frame_time)
+                self.draw()
+                self.pipeline_stats.record_frame(start, time.perf_counter(), snapshot.input_time)
+
+                self._refresh_title(frame_time)
+        finally:
+            self._running = False
+            simulation.join()
+
+        if self._simulation_error is not None:
+            raise self._simulation_error
+
+    def _simulate(self):
+        """Simulation thread of the pipelined mode, the level is only touched here while it runs."""
+        previous = time.perf_counter()
+        accumulator = 0.0
+        try:
+            while self._running:
+                start = time.perf_counter()
+                accumulator += min(start - previous, self.MAX_FRAME_TIME)
+                previous = start
+
+                p1_inputs, p2_inputs, input_time = self._shared_inputs
+                ticks = 0
+                while accumulator >= self._tick_duration:
+                    self._tick(self._tick_duration, p1_inputs, p2_inputs)
+                    accumulator -= self._tick_duration
+                    ticks += 1
+                if ticks:
+                    self._snapshots.publish(self._capture_snapshot(input_time, ticks))
+                    self.pipeline_stats.record_simulation(start, time.perf_counter(), ticks)
+
+                time.sleep(max(0.0, self._tick_duration - accumulator))
+        except BaseException as error:
+            # raised again by the main thread, which would otherwise keep drawing the last snapshot
+            self._simulation_error = error
+            self._running = False
+
+    def _capture_snapshot(self, input_time: float, ticks: int) -> RenderSnapshot:
+        return RenderSnapshot.capture(self._level.get_entities(), (self._player1, self._player2), input_time, ticks)
 
     def update(self):
+        p1_inputs, p2_inputs = self._read_inputs()
+
+        self._clock.tick(self._fps)
+
+        frame_time = self._clock.get_time()/1000
+
+        if self._tick_duration is None:
+            self._tick(frame_time, p1_inputs, p2_inputs)
+        else:
+            self._accumulator += min(frame_time, self.MAX_FRAME_TIME)
+            while self._accumulator >= self._tick_duration:
+                self._tick(self._tick_duration, p1_inputs, p2_inputs)
+                self._accumulator -= self._tick_duration
+            self._interpolation = self._accumulator / self._tick_duration
+
+        self._show_results()
+        for scene in self._scene_stack:
+            scene.update(frame_time)
+
+        self._refresh_title(frame_time)
 
-        p1_inputs = {} # type: Dict[key_bindings.Command, Any]
-        p2_inputs = {} # type: Dict[key_bindings.Command, Any]
+    def _read_inputs(self) -> Tuple[Inputs, Inputs]:
+        p1_inputs = {} # type: Inputs
+        p2_inputs = {} # type: Inputs
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -105,37 +229,47 @@ class Game(BaseGame):
         for key, command in key_bindings.player2_key_mapping.items():
             p2_inputs[command] = keys[key]
 
-        self._clock.tick(self._fps)
-
-        self.player1.input(self._clock.get_time()/1000, p1_inputs)
-        self.player2.input(self._clock.get_time()/1000, p2_inputs)
-
-        self._level.update(self._clock.get_time()/1000)
-
-        for scene in self._scene_stack:
-            scene.update(self._clock.get_time()/1000)
+        return p1_inputs, p2_inputs
 
+    def _refresh_title(self, frame_time: float):
         if self._title_refresh_rate <= 0:
             self._title_refresh_rate = 0.1
             pygame.display.set_caption(self.title + " " + str(self._clock.get_fps()))
 
-        self._title_refresh_rate -= (self._clock.get_time()/1000)
+        self._title_refresh_rate -= frame_time
+
+    def _tick(self, dt: float, p1_inputs: Inputs, p2_inputs: Inputs):
+        self.player1.input(dt, p1_inputs)
+        self.player2.input(dt, p2_inputs)
+
+        self._level.update(dt)
 
 
     def draw(self):
-        for scene in self._scene_stack:
+        for scene in list(self._scene_stack):
             scene.draw()
-        pygame.display.flip()
+        # Only the game scene knows what it changed, an overlay on top of it presents the whole window
+        dirty_rects = self._scene_stack[0].dirty_rects() if len(self._scene_stack) == 1 else None
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
 
     def close(self):
         self._running = False
 
-    def on_character_death(self, player: Player):
-        if player.has_lost:
+    def _show_results(self):
+        """Pushes the result scene of each player who lost since the last frame, on the main thread only."""
+        while not self._losers.empty():
+            player = self._losers.get()
             if player == self._player1:
                 self._scene_stack.append(ResultScene(self.player2, self))
             else:
                 self._scene_stack.append(ResultScene(self.player1, self))
+
+    def on_character_death(self, player: Player):
+        if player.has_lost:
+            self._losers.put(player)
         else:
             player.character.on_death -= self.on_character_death
             player.respawn_point = random.choice(self._level.spawn_points)
@@ -0,0 +1,131 @@
+import random
+from typing import Optional
+
+from pygame import Vector2
+
+from entities.character import Character
+from input_sources import InputSource
+from level import Level
+from player import Player
+from resources.character_loader import CharacterDataFactory
+from resources.level_registry import LevelRegistry
+from resources.resources_manager import ResourcesManager
+from resources.resources_registry import ResourcesRegistry
+from utils.event import Event
+
+
+class MatchResult:
+
+    def __init__(self, player1: Player, player2: Player, ticks: int, duration: float):
+        self.player1_character = player1.character.data.name
+        self.player2_character = player2.character.data.name
+        self.player1_lives_left = player1.lives_left
+        self.player2_lives_left = player2.lives_left
+        self.ticks = ticks
+        self.duration = duration
+        if player1.has_lost == player2.has_lost:
+            self.winner = None  # type: Optional[str]
+        else:
+            self.winner = player2.name if player1.has_lost else player1.name
+
+    @property
+    def is_draw(self) -> bool:
+        return self.winner is None
+
+    def __repr__(self):
+        return "MatchResult({} vs {}, winner={}, ticks={}, duration={:.2f})".format(
+            self.player1_character, self.player2_character, self.winner, self.ticks, self.duration
+        )
+
+
+class HeadlessMatch:
+    """
+    A Level and its two Players driven at a fixed tick by input sources, without any Scene, Camera or HUD.
+    The match ends when a player has lost all their lives or when max_duration (simulated seconds) is reached.
+    """
+
+    def __init__(self,
+                 player1_character: str,
+                 player2_character: str,
+                 player1_inputs: InputSource,
+                 player2_inputs: InputSource,
+                 tick_rate: float = 120,
+                 max_duration: float = 300,
+                 level_name: str = "level_1",
+                 rng: random.Random = None,
+                 characters: ResourcesRegistry[str, CharacterDataFactory] = None
+                 ):
+        self._tick_duration = 1 / tick_rate
+        self._max_ticks = int(max_duration * tick_rate)
+        self._rng = rng or random.Random()
+        self._ticks = 0
+        self._characters = characters if characters is not None else ResourcesManager.characters
+
+        # Fired with the Player each time one of its characters is spawned, including the first one
+        self.on_character_spawn = Event[Player]()
+
+        self._level = LevelRegistry.LevelsFactory[level_name]()  # type: Level
+
+        self._player1 = Player("player1", self.create_character(player1_character), self._level.spawn_points[0])
+        self._player1.on_character_death += self.on_character_death
+        self._player1_inputs = player1_inputs
+
+        self._player2 = Player("player2", self.create_character(player2_character), self._level.spawn_points[-1])
+        self._player2.on_character_death += self.on_character_death
+        self._player2_inputs = player2_inputs
+
+        self._level.add_character(self._player1.character, self._player2.character)
+
+        player1_inputs.attach(self._player1, self._player2)
+        player2_inputs.attach(self._player2, self._player1)
+
+    @property
+    def level(self) -> Level:
+        return self._level
+
+    @property
+    def player1(self) -> Player:
+        return self._player1
+
+    @property
+    def player2(self) -> Player:
+        return self._player2
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def elapsed_time(self) -> float:
+        return self._ticks * self._tick_duration
+
+    @property
+    def is_finished(self) -> bool:
+        return self._player1.has_lost or self._player2.has_lost or self._ticks >= self._max_ticks
+
+    def tick(self):
+        dt = self._tick_duration
+        self._player1.input(dt, self._player1_inputs.get_inputs(dt))
+        self._player2.input(dt, self._player2_inputs.get_inputs(dt))
+        self._level.update(dt)
+        self._ticks += 1
+
+    def run(self) -> MatchResult:
+        while not self.is_finished:
+            self.tick()
+        result = MatchResult(self._player1, self._player2, self._ticks, self.elapsed_time)
+        # the attacks still running go back to their pools, which outlive the match
+        self._level.clear()
+        return result
+
+    def on_character_death(self, player: Player):
+        if not player.has_lost:
+            player.respawn_point = self._rng.choice(self._level.spawn_points)
+            player.character = self.create_character(player.character.data.name, player.respawn_point)
+            self.on_character_spawn(player)
+
+    def create_character(self, character_name: str, position: Vector2 = Vector2(0, 0)) -> Character:
+        character_factory = self._characters[character_name]
+        character = Character(self._level, character_factory(), position)
+        self._level.add_character(character)
+        return character
@@ -0,0 +1,142 @@
+import json
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Sequence, Tuple
+
+from key_bindings import Command
+
+
+class InputSource(ABC):
+
+    @abstractmethod
+    def get_inputs(self, dt: float) -> Dict[Command, Any]:
+        pass
+
+    def attach(self, player: 'Player', opponent: 'Player'):
+        """Called once the players of the match exist, for sources that react to the game state."""
+        pass
+
+    def reset(self):
+        pass
+
+
+class RandomInputSource(InputSource):
+    """Holds a random set of commands for a random duration, like a player mashing buttons."""
+
+    def __init__(self, rng: random.Random = None, press_probability: float = 0.3,
+                 hold_time_range: Tuple[float, float] = (0.05, 0.5)):
+        self._rng = rng or random.Random()
+        self._press_probability = press_probability
+        self._hold_time_range = hold_time_range
+        self._current = {}  # type: Dict[Command, Any]
+        self._remaining = 0.0
+
+    def get_inputs(self, dt: float) -> Dict[Command, Any]:
+        self._remaining -= dt
+        if self._remaining <= 0.0:
+            self._current = {command: self._rng.random() < self._press_probability for command in Command}
+            self._remaining = self._rng.uniform(*self._hold_time_range)
+        return self._current
+
+    def reset(self):
+        self._current = {}
+        self._remaining = 0.0
+
+
+class ScriptedInputSource(InputSource):
+    """Replays a list of (duration in seconds, held commands) steps, looping at the end of the script."""
+
+    def __init__(self, steps: Sequence[Tuple[float, Sequence[Command]]], loop: bool = True):
+        if sum(duration for duration, _ in steps) <= 0:
+            raise ValueError("Input script must last more than 0 seconds")
+        self._steps = [(float(duration), {command: True for command in commands}) for duration, commands in steps]
+        self._loop = loop
+        self._index = 0
+        self._elapsed = 0.0
+
+    def get_inputs(self, dt: float) -> Dict[Command, Any]:
+        self._elapsed += dt
+        while self._index < len(self._steps) and self._elapsed >= self._steps[self._index][0]:
+            self._elapsed -= self._steps[self._index][0]
+            self._index += 1
+            if self._index == len(self._steps) and self._loop:
+                self._index = 0
+        if self._index >= len(self._steps):
+            return {}
+        return self._steps[self._index][1]
+
+    def reset(self):
+        self._index = 0
+        self._elapsed = 0.0
+
+    @staticmethod
+    def load_from_json(filepath: str) -> Dict[str, 'ScriptedInputSource']:
+        """
+        Expects {"player1": [{"duration": 0.5, "commands": ["MOVE_RIGHT"]}, ...], "player2": [...]}
+        """
+        try:
+            with open(filepath, 'r') as file:
+                data = json.load(file)
+                scripts = {}
+                for player_name, steps_data in data.items():
+                    steps = [
+                        (float(step["duration"]), [Command[command] for command in step.get("commands", [])])
+                        for step in steps_data
+                    ]  # type: List[Tuple[float, List[Command]]]
+                    scripts[player_name] = ScriptedInputSource(steps)
+                return scripts
+        except (KeyError, TypeError) as e:
+            raise ValueError("Invalid input script: {}".format(str(e)))
+
+
+class ChaseInputSource(InputSource):
+    """
+    Simple bot used by the balance tools: runs to the opponent, turns to face it and attacks once in range.
+    A fraction of its decisions are replaced by random inputs so that matches do not all play out the same.
+    """
+
+    def __init__(self, rng: random.Random = None, random_ratio: float = 0.2, jump_probability: float = 0.01,
+                 secondary_ratio: float = 0.4):
+        self._rng = rng or random.Random()
+        self._random_inputs = RandomInputSource(self._rng)
+        self._random_ratio = random_ratio
+        self._jump_probability = jump_probability
+        self._secondary_ratio = secondary_ratio
+        self._player = None  # type: Player
+        self._opponent = None  # type: Player
+        self._random_time = 0.0
+
+    def attach(self, player: 'Player', opponent: 'Player'):
+        self._player = player
+        self._opponent = opponent
+
+    def get_inputs(self, dt: float) -> Dict[Command, Any]:
+        if self._random_time > 0.0 or self._rng.random() < self._random_ratio * dt:
+            if self._random_time <= 0.0:
+                self._random_time = self._rng.uniform(0.1, 1.0)
+            self._random_time -= dt
+            return self._random_inputs.get_inputs(dt)
+
+        character = self._player.character
+        target = self._opponent.character
+        distance_x = target.box.center_x - character.box.center_x
+        attack_range = character.box.height
+
+        inputs = {}  # type: Dict[Command, Any]
+        toward = Command.MOVE_RIGHT if distance_x > 0 else Command.MOVE_LEFT
+        facing_target = character.reversed == (distance_x < 0)
+
+        if abs(distance_x) > attack_range or not facing_target:
+            inputs[toward] = True
+        elif self._rng.random() < self._secondary_ratio:
+            inputs[Command.SECONDARY_ACTION] = True
+        else:
+            inputs[Command.PRIMARY_ACTION] = True
+
+        if self._rng.random() < self._jump_probability:
+            inputs[Command.JUMP] = True
+        return inputs
+
+    def reset(self):
+        self._random_inputs.reset()
+        self._random_time = 0.0
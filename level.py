@@ -1,15 +1,18 @@
 from _ast import Set
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
 import pygame
-from pygame import Vector2
+from pygame import Rect, Vector2
 from pygame.sprite import Group
 
 from base_level import BaseLevel
+from collisions.collision_layers import can_collide, is_same_team
+from collisions.spatial_hash import SpatialHash
 from entities.character import Character
 from entities.entity import Entity
+from physics.vectorized_physics import VectorizedPhysics
 from render.parallax_background import ParallaxBackground
-from utils.multi_dispatcher import MultiDispatcher
+from utils.multi_dispatcher import DispatchStats, MultiDispatcher
 
 
 class Level(BaseLevel):
@@ -34,9 +37,20 @@ class Level(BaseLevel):
     def background(self) -> ParallaxBackground:
         return self._background
 
+    @property
+    def dispatch_stats(self) -> DispatchStats:
+        return self._collision_dispatcher.stats
+
     def get_entities(self) -> Iterable[Entity]:
         return self._entities
 
+    def get_entities_in(self, rect: Rect) -> List[Entity]:
+        """
+        Entities whose box shares a broadphase cell with rect, in the order of get_entities.
+        Only the cells covered by rect are visited, boxes are those of the last update.
+        """
+        return sorted(self._broadphase.query(rect), key=self._entities_order.__getitem__)
+
     def __init__(self,
                  collision_dispatcher: MultiDispatcher[None],
                  background: ParallaxBackground,
@@ -46,10 +60,18 @@ class Level(BaseLevel):
                  gravity,
                  max_velocity_x,
                  origin: Vector2 = Vector2(0, 0),
+                 broadphase: SpatialHash = None,
+                 physics: VectorizedPhysics = None,
                  ):
 
         self._collision_dispatcher = collision_dispatcher
 
+        self._broadphase = broadphase if broadphase is not None else SpatialHash()
+        self._rects = {}  # type: Dict[Entity, Rect]
+
+        # None keeps the per entity physics implemented by Level
+        self._physics = physics
+
         self._spawn_points = spawn_points
         
         self._background = background
@@ -58,6 +80,9 @@ class Level(BaseLevel):
 
         self._entities_set = set()  # type: Set[Entity]
         self._entities = pygame.sprite.Group()  # type: Group[Entity]
+        # entity -> rank of its insertion, Group keeps the entities in that order
+        self._entities_order = {}  # type: Dict[Entity, int]
+        self._next_entity_order = 0
 
         self._characters_set = set()  # type: Set[Character]
         self._characters = Group()  # type: Group[Character]
@@ -96,24 +121,55 @@ class Level(BaseLevel):
             if entity not in self._entities_set:
                 self._entities_set.add(entity)
                 self._entities.add(entity)
+                self._entities_order[entity] = self._next_entity_order
+                self._next_entity_order += 1
                 self._all_sprites.add(entity)
+                if self._physics is not None:
+                    self._physics.attach(entity, is_character=entity in self._characters_set)
+                self._rects[entity] = entity.box.write_rect(Rect(0, 0, 0, 0))
+                self._broadphase.insert(entity, self._rects[entity])
 
     def remove_entity(self, *entities):
         for entity in entities:
             if entity in self._entities_set:
                 self._entities_set.remove(entity)
                 self._entities.remove(entity)
+                self._entities_order.pop(entity, None)
                 self._all_sprites.remove(entity)
+                self._broadphase.remove(entity)
+                self._rects.pop(entity, None)
+                if self._physics is not None:
+                    self._physics.detach(entity)
+                entity.removed_from_level()
+
+    def clear(self):
+        """Removes every entity before the level is discarded, the attacks still running go back to their pools."""
+        self.remove_character(*list(self._characters))
+        self.remove_entity(*list(self._entities))
+        self._entities_to_remove.clear()
 
     def update(self, dt):
         self._all_sprites.update(dt)
-        for entity in self._entities:
-            self._update_entity_position(dt, entity)
-        for character in self._characters:
-            self._update_character_grounded_status(character)
-        for entity in self._entities:
-            self._handle_sprite_collision(entity)
+        if self._physics is None:
+            for entity in self._entities:
+                self._update_entity_position(dt, entity)
+            for character in self._characters:
+                self._update_character_grounded_status(character)
+        else:
+            self._physics.step(
+                dt,
+                self._gravity,
+                self.origin.x,
+                self.origin.y - self.height,
+                self.origin.x + self.width,
+                self.origin.y,
+                self._max_velocity_x
+            )
+        self._update_broadphase()
+        self._handle_collisions()
         self._process_entities_to_remove()
+        for entity in self._entities:
+            entity.record_position()
 
     def _update_entity_position(self, dt, entity):
         entity.velocity.y += self._gravity * dt
@@ -135,20 +191,47 @@ class Level(BaseLevel):
     def _update_character_grounded_status(self, character):
         character.on_ground = character.box.bottom == self.origin.y
 
-    def _handle_sprite_collision(self, entity):
-        collided_sprites = pygame.sprite.spritecollide(entity, self._entities, False) # type: List[Entity]
-
-        def distance_to_nearest_edge(sprite):
-            center_distance = Vector2(sprite.rect.center).distance_squared_to(Vector2(entity.rect.center))
-            half_diagonal = sprite.rect.width ** 2 + sprite.rect.height ** 2
-            edge_distance = center_distance - half_diagonal
-            return max(0, edge_distance)
-
-        collided_sprites.sort(key=distance_to_nearest_edge)
-
-        for collided_sprite in collided_sprites:
-            if collided_sprite != entity and not collided_sprite.destroyed:
-                self._collision_dispatcher.dispatch_no_collect(entity, collided_sprite)
+    def _update_broadphase(self):
+        # Each entity has its own Rect, updated in place once per tick and shared by the broadphase and the narrowphase
+        rects = self._rects
+        for entity in self._entities:
+            self._broadphase.update(entity, entity.box.write_rect(rects[entity]))
+
+    def _handle_collisions(self):
+        """
+        Each overlapping pair is produced once, masked-out and same-team pairs are dropped before any dispatch.
+        Then, as before the broadphase, each entity in the order of get_entities dispatches its collisions nearest edge
+        first, targets destroyed by an earlier dispatch are skipped.
+        """
+        rects = self._rects
+        colliding = {}  # type: Dict[Entity, List[Entity]]
+
+        for a, b in self._broadphase.candidate_pairs():
+            if not can_collide(a, b) or is_same_team(a, b):
+                continue
+            if not rects[a].colliderect(rects[b]):
+                continue
+            colliding.setdefault(a, []).append(b)
+            colliding.setdefault(b, []).append(a)
+
+        order = self._entities_order
+        resolve = self._collision_dispatcher.resolve
+        for source in sorted(colliding, key=order.__getitem__):
+            x, y = rects[source].center
+            # ties keep the order of get_entities, like the sprite collisions did
+            targets = sorted(colliding[source],
+                             key=lambda target: (Level._distance_to_nearest_edge(x, y, rects[target]), order[target]))
+            for target in targets:
+                if target.destroyed:
+                    continue
+                for action in resolve(type(source), type(target)):
+                    action(source, target)
+
+    @staticmethod
+    def _distance_to_nearest_edge(x: float, y: float, rect: Rect) -> float:
+        center_x, center_y = rect.center
+        half_diagonal = rect.width ** 2 + rect.height ** 2
+        return max(0, (center_x - x) ** 2 + (center_y - y) ** 2 - half_diagonal)
 
     def _process_entities_to_remove(self):
         for entity in self._entities_to_remove:
@@ -0,0 +1,159 @@
+from typing import List
+
+import numpy as np
+from pygame import Vector2
+
+from entities.box import Box
+
+
+class EntityStorage:
+    """
+    Structure of arrays holding the position, size and velocity of every entity of a Level.
+    Slots of removed entities are recycled, arrays grow by doubling their capacity.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._capacity = max(1, capacity)
+        self.x = np.zeros(self._capacity)
+        self.y = np.zeros(self._capacity)
+        self.width = np.zeros(self._capacity)
+        self.height = np.zeros(self._capacity)
+        self.velocity_x = np.zeros(self._capacity)
+        self.velocity_y = np.zeros(self._capacity)
+        # Set by Entity.update through StorageBox.integrate, cleared once the kernel has integrated the slot
+        self.pending_integration = np.zeros(self._capacity, dtype=bool)
+        self.alive = np.zeros(self._capacity, dtype=bool)
+        self._size = 0
+        self._free = []  # type: List[int]
+
+    @property
+    def size(self) -> int:
+        """High water mark of the used slots, every alive slot is below it."""
+        return self._size
+
+    def allocate(self) -> int:
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == self._capacity:
+                self._grow()
+            index = self._size
+            self._size += 1
+        self.x[index] = self.y[index] = self.width[index] = self.height[index] = 0.0
+        self.velocity_x[index] = self.velocity_y[index] = 0.0
+        self.pending_integration[index] = False
+        self.alive[index] = True
+        return index
+
+    def release(self, index: int) -> None:
+        self.alive[index] = False
+        self.pending_integration[index] = False
+        self._free.append(index)
+
+    def _grow(self):
+        self._capacity *= 2
+        for name in ("x", "y", "width", "height", "velocity_x", "velocity_y", "pending_integration", "alive"):
+            array = getattr(self, name)
+            grown = np.zeros(self._capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+
+class StorageBox(Box):
+    """Box reading and writing its values in an EntityStorage slot."""
+
+    __slots__ = ("_storage", "_index")
+
+    def __init__(self, storage: EntityStorage, index: int):
+        self._storage = storage
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def x(self):
+        return float(self._storage.x[self._index])
+
+    @x.setter
+    def x(self, value):
+        self._storage.x[self._index] = value
+
+    @property
+    def y(self):
+        return float(self._storage.y[self._index])
+
+    @y.setter
+    def y(self, value):
+        self._storage.y[self._index] = value
+
+    @property
+    def width(self):
+        return float(self._storage.width[self._index])
+
+    @width.setter
+    def width(self, value):
+        self._storage.width[self._index] = value
+
+    @property
+    def height(self):
+        return float(self._storage.height[self._index])
+
+    @height.setter
+    def height(self, value):
+        self._storage.height[self._index] = value
+
+    def integrate(self, velocity, dt: float) -> None:
+        # Deferred, the whole storage is integrated at once by the physics kernel
+        self._storage.pending_integration[self._index] = True
+
+
+class StorageVector:
+    """Velocity of an entity stored in an EntityStorage slot, supports the Vector2 operations used on velocities."""
+
+    def __init__(self, storage: EntityStorage, index: int):
+        self._storage = storage
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._storage.velocity_x[self._index])
+
+    @x.setter
+    def x(self, value: float):
+        self._storage.velocity_x[self._index] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._storage.velocity_y[self._index])
+
+    @y.setter
+    def y(self, value: float):
+        self._storage.velocity_y[self._index] = value
+
+    def to_vector(self) -> Vector2:
+        return Vector2(self.x, self.y)
+
+    def __mul__(self, other):
+        return self.to_vector() * other
+
+    __rmul__ = __mul__
+
+    def __add__(self, other):
+        return self.to_vector() + other
+
+    __radd__ = __add__
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, item):
+        return (self.x, self.y)[item]
+
+    def __repr__(self):
+        return "StorageVector({}, {})".format(self.x, self.y)
@@ -0,0 +1,102 @@
+from typing import Dict
+
+import numpy as np
+from pygame import Vector2
+
+from entities.box import Box
+from entities.entity import Entity
+from physics.entity_storage import EntityStorage, StorageBox, StorageVector
+
+
+class VectorizedPhysics:
+    """
+    Optional physics backend of Level. Boxes and velocities of the attached entities become views onto an
+    EntityStorage, so that integration, gravity, velocity clamp, level bounds and the on ground test are each
+    a single NumPy pass over every entity instead of per entity Python code.
+
+    Integration is deferred until step: an entity following another one during its update (MeleeAttack)
+    sees the position of the previous tick.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._storage = EntityStorage(capacity)
+        self._indices = {}  # type: Dict[Entity, int]
+        self._characters = {}  # type: Dict[int, Entity]
+
+    @property
+    def storage(self) -> EntityStorage:
+        return self._storage
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self._indices
+
+    def attach(self, entity: Entity, is_character: bool = False) -> None:
+        if entity in self._indices:
+            return
+        storage = self._storage
+        index = storage.allocate()
+        box = entity.box
+        storage.x[index], storage.y[index], storage.width[index], storage.height[index] = \
+            box.x, box.y, box.width, box.height
+        storage.velocity_x[index], storage.velocity_y[index] = entity.velocity.x, entity.velocity.y
+        entity.attach_physics_state(StorageBox(storage, index), StorageVector(storage, index))
+        self._indices[entity] = index
+        if is_character:
+            self._characters[index] = entity
+
+    def detach(self, entity: Entity) -> None:
+        index = self._indices.pop(entity, None)
+        if index is None:
+            return
+        box = entity.box
+        velocity = entity.velocity
+        entity.attach_physics_state(Box(box.x, box.y, box.width, box.height), Vector2(velocity.x, velocity.y))
+        self._characters.pop(index, None)
+        self._storage.release(index)
+
+    def step(self, dt: float, gravity: float, left: float, top: float, right: float, bottom: float,
+             max_velocity_x: float) -> None:
+        storage = self._storage
+        n = storage.size
+        if n == 0:
+            return
+
+        x = storage.x[:n]
+        y = storage.y[:n]
+        width = storage.width[:n]
+        height = storage.height[:n]
+        velocity_x = storage.velocity_x[:n]
+        velocity_y = storage.velocity_y[:n]
+        pending = storage.pending_integration[:n]
+
+        # Integration of the entities that called Entity.update this tick
+        np.add(x, velocity_x * dt, out=x, where=pending)
+        np.add(y, velocity_y * dt, out=y, where=pending)
+        pending[:] = False
+
+        velocity_y += gravity * dt
+
+        # Same order as the per entity implementation of Level
+        mask = y + height > bottom
+        np.subtract(bottom, height, out=y, where=mask)
+        velocity_y[mask] = 0.0
+
+        mask = y < top
+        y[mask] = top
+        velocity_y[mask] = 0.0
+
+        mask = x < left
+        x[mask] = left
+        velocity_x[mask] = 0.0
+
+        mask = x + width > right
+        np.subtract(right, width, out=x, where=mask)
+        velocity_x[mask] = 0.0
+
+        mask = np.abs(velocity_x) > max_velocity_x
+        velocity_x[mask] = max_velocity_x * np.sign(velocity_x[mask])
+
+        if self._characters:
+            grounded = y + height == bottom
+            for index, character in self._characters.items():
+                character.on_ground = bool(grounded[index])
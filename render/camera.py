@@ -1,85 +1,169 @@
-from typing import Tuple
+import math
+from typing import List, Sequence, Tuple
 
 import pygame.sprite
 from pygame import Vector2, Surface, Rect
 
 
+class CullStats:
+    """Entities drawn and culled by a camera, for the last frame and since the last reset."""
+
+    def __init__(self):
+        self.drawn = 0
+        self.culled = 0
+        self.frames = 0
+        self.total_drawn = 0
+        self.total_culled = 0
+
+    def record(self, drawn: int, culled: int):
+        self.drawn = drawn
+        self.culled = culled
+        self.frames += 1
+        self.total_drawn += drawn
+        self.total_culled += culled
+
+    def reset(self):
+        self.__init__()
+
+    def __repr__(self):
+        return "CullStats(drawn={}, culled={}, frames={}, total_drawn={}, total_culled={})".format(
+            self.drawn, self.culled, self.frames, self.total_drawn, self.total_culled
+        )
+
+
 class Camera:
+    """
+    The viewport subsurface and its size are kept between frames, they are only rebuilt when the viewport or the
+    display surface changes (see set_viewport, called by Scene.resize).
+    """
 
     def __init__(self, display_surface, camera_pos, width, height, level):
         self.rect = Rect(camera_pos, (width, height))
         self.level = level
         self.offset = Vector2(0, 0)
-        self.display_surface = display_surface
+        self.cull_stats = CullStats()
+        self._display_surface = display_surface
+        self._surface = None  # type: Surface
+        self._width = 0
+        self._height = 0
+        self._rebuild_surface()
+
+    def set_viewport(self, display_surface: Surface, rect: Rect) -> None:
+        self.rect = Rect(rect)
+        self._display_surface = display_surface
+        self._rebuild_surface()
+
+    def _rebuild_surface(self) -> None:
+        self._surface = self._display_surface.subsurface(self.rect)
+        self._update_view_size()
+
+    def _update_view_size(self) -> None:
+        """Size of the part of the level shown, the size of the viewport without zoom."""
+        self._width, self._height = self._surface.get_size()
 
-    def transform(self, rect: pygame.Rect, speed: float = 1.0):
-        new_x = rect.x - self.offset.x * speed - self.level.origin.x * (1-speed)
-        new_y = rect.y - self.offset.y * speed - (self.level.origin.y - self.height) * (1-speed)
+    @property
+    def zoom(self) -> float:
+        """Size on screen of a pixel of the level."""
+        return 1.0
 
-        return Rect(new_x, new_y, rect.width, rect.height)
+    @property
+    def view_rect(self) -> Rect:
+        """Part of the level seen by the camera, for the layers moving at speed 1 (the entities)."""
+        left, top = math.floor(self.offset.x), math.floor(self.offset.y)
+        return Rect(left, top, math.ceil(self.offset.x + self._width) - left, math.ceil(self.offset.y + self._height) - top)
 
+    def transform(self, rect: 'pygame.Rect | Tuple[float, float]', speed: float = 1.0) -> Tuple[float, float]:
+        """Screen position of the top left corner of rect, a plain tuple is enough as blit destination."""
+        new_x = rect[0] - self.offset.x * speed - self.level.origin.x * (1-speed)
+        new_y = rect[1] - self.offset.y * speed - (self.level.origin.y - self._height) * (1-speed)
 
-    def draw(self, *surfaces: Tuple[Surface, pygame.Rect], speed: float = 1.0):
-        """Applies the camera offset to a sprite and blits it onto the camera surface."""
+        return new_x, new_y
 
-        subsurface = self.display_surface.subsurface(
-            Rect(self.rect.x, self.rect.y, self.width, self.height)
-        )
+    def transform_all(self, rects: 'Sequence[pygame.Rect | Tuple[float, float]]', speed: float = 1.0
+                      ) -> List[Tuple[float, float]]:
+        """transform for a whole draw call, the camera terms are computed once."""
+        offset_x, origin_x = self.offset.x * speed, self.level.origin.x * (1-speed)
+        offset_y, origin_y = self.offset.y * speed, (self.level.origin.y - self._height) * (1-speed)
+        return [(rect[0] - offset_x - origin_x, rect[1] - offset_y - origin_y) for rect in rects]
 
-        subsurface.blits(
-            [(surface, self.transform(rect, speed)) for surface, rect in surfaces]
-        )
+    def draw(self, *surfaces: Tuple[Surface, pygame.Rect], speed: float = 1.0):
+        """Applies the camera offset to a sprite and blits it onto the camera surface."""
+        self._surface.blits(self.blit_list(*surfaces, speed=speed), doreturn=False)
 
     def draw_with_speed(self, *surfaces: Tuple[Surface, pygame.Rect, float]):
         """Applies the camera offset to a sprite and blits it onto the camera surface."""
 
-        subsurface = self.display_surface.subsurface(
-            Rect(self.rect.x, self.rect.y, self.width, self.height)
-        )
+        self._surface.blits(self.blit_list_with_speed(*surfaces), doreturn=False)
 
-        subsurface.blits(
-                [(surface, self.transform(rect, speed)) for surface, rect, speed in surfaces]
-            )
+    def blit_list(self, *surfaces: Tuple[Surface, pygame.Rect], speed: float = 1.0
+                  ) -> List[Tuple[Surface, Tuple[float, float]]]:
+        """Arguments of Surface.blits for draw, to blit them later with blit."""
+        positions = self.transform_all([rect for _, rect in surfaces], speed)
+        return [(surface, position) for (surface, _), position in zip(surfaces, positions)]
+
+    def blit_list_with_speed(self, *surfaces: Tuple[Surface, pygame.Rect, float]
+                             ) -> List[Tuple[Surface, Tuple[float, float]]]:
+        return [(surface, self.transform(rect, speed)) for surface, rect, speed in surfaces]
+
+    def blit(self, blits: List[Tuple[Surface, Tuple[float, float]]]):
+        """Blits a list made by blit_list or blit_list_with_speed onto the camera surface."""
+        self._surface.blits(blits, doreturn=False)
+
+    def screen_rect(self, position: 'pygame.Rect | Tuple[float, float]', size: Tuple[int, int]) -> Rect:
+        """Area of the display covered by a surface of size drawn at position, clipped to the viewport."""
+        x, y = self.transform(position)
+        return Rect(self.rect.x + int(x), self.rect.y + int(y), size[0], size[1]).clip(self.rect)
+
+    def clear(self, color: Tuple[int, ...] = (0, 0, 0)):
+        self._surface.fill(color)
 
     def finish_draw(self):
         pass
 
     def update(self, xy: Tuple[int, int]):
         """Updates the camera's offset to center on the target."""
+        width, height = self._width, self._height
         xy_int = (int(xy[0]), int(xy[1]))
-        self.offset.x = xy_int[0] - int(self.width / 2)
-        self.offset.y = xy_int[1] - int(self.height / 2)
+        self.offset.x = xy_int[0] - int(width / 2)
+        self.offset.y = xy_int[1] - int(height / 2)
 
         if self.offset.x < self.level.origin.x:
             self.offset.x = self.level.origin.x
-        elif self.offset.x + self.width > self.level.origin.x + self.level.width:
-            self.offset.x = self.level.origin.x + self.level.width - self.width
+        elif self.offset.x + width > self.level.origin.x + self.level.width:
+            self.offset.x = self.level.origin.x + self.level.width - width
 
-        if self.offset.y > self.level.origin.y - self.height:
-            self.offset.y = self.level.origin.y - self.height
+        if self.offset.y > self.level.origin.y - height:
+            self.offset.y = self.level.origin.y - height
         elif self.offset.y < self.level.origin.y - self.level.height:
             self.offset.y = self.level.origin.y - self.level.height
 
-        surface = self.display_surface.subsurface(self.rect)
-        surface.fill((0, 0, 0))
+    @property
+    def display_surface(self) -> Surface:
+        return self._display_surface
 
+    @display_surface.setter
+    def display_surface(self, display_surface: Surface):
+        self._display_surface = display_surface
+        self._rebuild_surface()
 
     @property
     def camera_surface(self):
-        return self.display_surface.subsurface(self.rect)
+        return self._surface
 
     @property
     def width(self):
-        return self.camera_surface.get_width()
+        return self._width
 
     @width.setter
     def width(self, width):
-        self.rect = Rect(self.rect.topleft, (width, self.height))
+        self.rect = Rect(self.rect.topleft, (width, self.rect.height))
+        self._rebuild_surface()
 
     @property
     def height(self):
-        return self.camera_surface.get_height()
+        return self._height
 
     @height.setter
     def height(self, height):
-        self.rect = Rect(self.rect.topleft, (self.width, height))
\ No newline at end of file
+        self.rect = Rect(self.rect.topleft, (self.rect.width, height))
+        self._rebuild_surface()
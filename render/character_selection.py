@@ -1,8 +1,10 @@
 from math import sqrt, ceil
+from typing import Dict, List, Optional
 
 import pygame
 from game import Game
 from key_bindings import Command, player1_key_mapping, player2_key_mapping
+from resources.loading_pool import LoadingPool
 from resources.resources_manager import ResourcesManager
 
 
@@ -30,6 +32,37 @@ class CharacterSelectionScene:
             self.selected_character1 = 0
             self.selected_character2 = 0
 
+        # Decodes the sheets of the highlighted characters in the background while the players browse the grid, only
+        # exists while main_loop runs
+        self._loading_pool = None  # type: Optional[LoadingPool]
+        self._prefetched_selection = None
+        # highlighted character -> names of its sheets submitted to the loading pool
+        self._prefetched = {}  # type: Dict[str, List[str]]
+
+    def prefetch_selection(self):
+        selection = (self.selected_character1, self.selected_character2)
+        if selection != self._prefetched_selection:
+            self._prefetched_selection = selection
+            highlighted = {self.characters[idx] for idx in selection}
+            # the sheets of the characters left behind are cancelled or dropped once decoded, not kept until the end
+            # of the selection
+            for name in [name for name in self._prefetched if name not in highlighted]:
+                self._loading_pool.discard(self._prefetched.pop(name))
+            for name in highlighted:
+                if name not in self._prefetched:
+                    self._prefetched[name] = ResourcesManager.characters[name].prefetch(self._loading_pool)
+
+    def load_selection(self, picked):
+        """Loads the picked characters and evicts the others."""
+        for name in picked:
+            ResourcesManager.characters[name].load(self._loading_pool)
+        self._loading_pool.discard_pending()
+        self._prefetched_selection = None
+        self._prefetched = {}
+        for name in self.characters:
+            if name not in picked:
+                ResourcesManager.characters[name].evict()
+
     def draw_scene(self):
         self.screen.fill((0, 0, 0))
         for idx, icon in enumerate(self.character_icons):
@@ -86,15 +119,27 @@ class CharacterSelectionScene:
             elif event.key == pygame.K_RETURN:
                 if (self.selected_character1 is not None) and (self.selected_character2 is not None):
                     try:
-                        return (self.characters[self.selected_character1], self.characters[self.selected_character2])
+                        picked = (self.characters[self.selected_character1], self.characters[self.selected_character2])
                     except IndexError:
-                        pass
+                        return None
+                    self.load_selection(picked)
+                    return picked
     def main_loop(self):
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    return False
-                result = self.handle_event(event)
-                if result:
-                    return result
-            self.draw_scene()
\ No newline at end of file
+        self._loading_pool = LoadingPool(max(1, int(ResourcesManager.settings["loading_workers"])))
+        self._prefetched_selection = None
+        self._prefetched = {}
+        try:
+            while True:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        return False
+                    result = self.handle_event(event)
+                    if result:
+                        return result
+                self.prefetch_selection()
+                self.draw_scene()
+        finally:
+            # the workers are stopped when the scene is left, the sheets still decoding are not needed anymore
+            self._loading_pool.discard_pending()
+            self._loading_pool.shutdown()
+            self._loading_pool = None
\ No newline at end of file
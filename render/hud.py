@@ -1,6 +1,7 @@
 import pygame
 from pygame import freetype, Surface
 from player import Player
+from render.render_snapshot import HudValues
 from resources.resources_manager import ResourcesManager
 
 
@@ -42,21 +43,29 @@ class PlayerHUD:
         self.last_icon_surface_ajusted = None
 
         self.scene_rect = None
+        # whether the last draw differs from the previous one
+        self.changed = True
 
-    def draw(self, scene: pygame.Surface):
+    def draw(self, scene: pygame.Surface, values: HudValues = None):
+        """values are read from the player when not given, e.g. when drawing a snapshot of the level."""
+        if values is None:
+            values = HudValues.of(self.player)
         actual_padding_x = int(scene.get_width() * self.padding_x_percentage)
         actual_padding_y = int(scene.get_height() * self.padding_y_percentage)
         actual_font_size = int(scene.get_height() * self.health_bar_height_percentage)
         actual_health_height = int(scene.get_height() * self.health_bar_height_percentage)
 
+        self.changed = False
         if self.scene_rect is None or self.scene_rect != scene.get_rect():
+            self.changed = True
             self.scene_rect = scene.get_rect()
             self.score_surface = None
             self.health_bar_surface = None
             self.last_icon_surface_ajusted = None
 
-        if self.last_icon_surface_ajusted is None or self.last_icon != self.player.character.data.icon:
-            self.last_icon = self.player.character.data.icon
+        if self.last_icon_surface_ajusted is None or self.last_icon != values.icon:
+            self.last_icon = values.icon
+            self.changed = True
 
             new_icon_height = scene.get_height() - 2 * actual_padding_y
             scaling_factor = new_icon_height / self.last_icon.get_height()
@@ -64,16 +73,19 @@ class PlayerHUD:
 
             self.last_icon_surface_ajusted = pygame.transform.scale(self.last_icon,(int(new_icon_width), int(new_icon_height)))
 
-        if self.score_surface is None or self.last_lives_left != self.player.lives_left:
-            self.score_surface = get_text_surface(str(self.player.lives_left), actual_font_size, font_color=(255, 255, 255),
+        if self.score_surface is None or self.last_lives_left != values.lives_left:
+            self.score_surface = get_text_surface(str(values.lives_left), actual_font_size, font_color=(255, 255, 255),
                                                   padding=actual_padding_y)
             self.score_surface.convert_alpha()
-            self.last_lives_left = self.player.lives_left
+            self.last_lives_left = values.lives_left
+            self.changed = True
 
-        health_percentage = self.player.character.health_percentage
+        health_percentage = values.health_percentage
         padding_between_health_bar_and_score = int(scene.get_width() * self.padding_x_percentage)
 
-        if health_percentage != self.last_health_percentage:
+        if self.health_bar_surface is None or health_percentage != self.last_health_percentage:
+            self.changed = True
+            self.last_health_percentage = health_percentage
             health_width = scene.get_width() - self.last_icon_surface_ajusted.get_width() - self.score_surface.get_width() - 4 * actual_padding_x - padding_between_health_bar_and_score
             self.health_bar_surface = get_health_bar_surface(health_percentage, health_width, actual_health_height)
             self.health_bar_surface.convert_alpha()
@@ -99,7 +111,7 @@ class HUD:
         self.padding_x_percentage = padding_x_percentage
         self.padding_y_percentage = padding_y_percentage
 
-    def draw(self,window : pygame.Surface):
+    def draw(self,window : pygame.Surface, values: HudValues = None):
         x_padding = int( window.get_width() * self.padding_x_percentage)
         x_padding = x_padding if x_padding > 0 else 1
         y_padding = int( window.get_height() * self.padding_y_percentage)
@@ -107,4 +119,4 @@ class HUD:
 
         hud_subsurface = window.subsurface( pygame.Rect( x_padding,y_padding, window.get_width() - 2 * x_padding, window.get_height() - 2 * y_padding) )
 
-        self.player_hud.draw(hud_subsurface)
\ No newline at end of file
+        self.player_hud.draw(hud_subsurface, values)
\ No newline at end of file
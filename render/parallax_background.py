@@ -1,5 +1,6 @@
 import itertools
-from typing import Tuple, List
+import math
+from typing import Dict, Tuple, List
 
 import pygame
 from pygame import Rect, Vector2
@@ -7,16 +8,37 @@ from pygame import Rect, Vector2
 from render.camera import Camera
 
 
+def plain_copy(surface: pygame.Surface) -> pygame.Surface:
+    """
+    surface without colorkey nor RLE, itself when it has neither. RLE blits ignore the alpha of the destination: onto a
+    transparent surface the translucent pixels would become opaque.
+    """
+    if surface.get_flags() & pygame.SRCALPHA and surface.get_flags() & pygame.RLEACCELOK:
+        plain = pygame.Surface(surface.get_size(), pygame.SRCALPHA, surface)
+        plain.fill((0, 0, 0, 0))
+        plain.blit(surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        return plain
+    return surface
+
+
 class Layer:
     def __init__(self, pos: 'Tuple[int, int] | Vector2', image: pygame.Surface, speed: float, name: str,
                  repeat_horizontal: bool = True, repeat_vertical: bool = False):
         self.image = image
+        self._plain_image = None  # type: pygame.Surface
         self.rect = self.image.get_rect(bottomleft=pos)
         self.speed = speed
         self.name = name
         self.repeat_horizontal = repeat_horizontal
         self.repeat_vertical = repeat_vertical
 
+    @property
+    def plain_image(self) -> pygame.Surface:
+        """The image without colorkey nor RLE, made on first use, see plain_copy."""
+        if self._plain_image is None:
+            self._plain_image = plain_copy(self.image)
+        return self._plain_image
+
     def __repr__(self):
         return "Layer({}, {}, {}, {}, {}, {})".format(self.rect.bottomleft,
                                                       self.image,
@@ -26,11 +48,121 @@ class Layer:
                                                       self.repeat_vertical
                                                       )
 
+class ParallaxStrip:
+    """
+    Layers of the same speed pre-rendered side by side into one surface that tiles horizontally: its width is a
+    multiple of the width of every layer and at least the camera width, so that two blits always cover a camera.
+    """
+
+    def __init__(self, layers: List[Layer], min_width: int):
+        self.speed = layers[0].speed
+        self.layers = layers
+        self._plain_surface = None  # type: pygame.Surface
+        self.x = min(layer.rect.x for layer in layers)
+        self.y = min(layer.rect.top for layer in layers)
+        period = ParallaxStrip.period(layers)
+        self.width = period * max(1, math.ceil(min_width / period))
+        height = max(layer.rect.bottom for layer in layers) - self.y
+
+        if len(layers) == 1 and self.width == layers[0].image.get_width():
+            # the image tiles on its own already
+            self.surface = layers[0].image
+            return
+
+        first = layers[0].image
+        self.surface = pygame.Surface((self.width, height), first.get_flags() & pygame.SRCALPHA, first)
+        self.surface.fill((0, 0, 0, 0))
+        for i, layer in enumerate(layers):
+            layer_width = layer.image.get_width()
+            y = layer.rect.top - self.y
+            # RGBA_MAX onto the transparent strip copies the first layer as it is, the next ones are blended over it
+            special_flags = pygame.BLEND_RGBA_MAX if i == 0 and first.get_flags() & pygame.SRCALPHA else 0
+            for x in range((layer.rect.x - self.x) % layer_width - layer_width, self.width, layer_width):
+                self.surface.blit(layer.image, (x, y), special_flags=special_flags)
+        colorkey = first.get_colorkey()
+        if colorkey is not None:
+            self.surface.set_colorkey(colorkey, pygame.RLEACCEL)
+
+    @property
+    def plain_surface(self) -> pygame.Surface:
+        """The strip without colorkey nor RLE, made on first use, see plain_copy."""
+        if self._plain_surface is None:
+            self._plain_surface = plain_copy(self.surface)
+        return self._plain_surface
+
+    @staticmethod
+    def period(layers: List[Layer]) -> int:
+        period = 1
+        for layer in layers:
+            layer_width = layer.image.get_width()
+            period = period * layer_width // math.gcd(period, layer_width)
+        return period
+
+    @staticmethod
+    def can_merge(layers: List[Layer], layer: Layer, min_width: int) -> bool:
+        """
+        Same speed and a common period small enough, otherwise the strip would be mostly wasted memory.
+        Blending is not associative: a layer with translucent pixels blended over the strip, then the strip over the
+        screen, would not give the pixels of the layers blended one by one. Only layers whose pixels are either
+        opaque or fully transparent are merged, over a first layer with per pixel alpha.
+        """
+        if layer.speed != layers[0].speed:
+            return False
+        if not layers[0].image.get_flags() & pygame.SRCALPHA or ParallaxStrip.has_translucency(layer.image):
+            return False
+        period = ParallaxStrip.period(layers + [layer])
+        return period <= max(ParallaxBackground.MAX_STRIP_WIDTH, min_width)
+
+    @staticmethod
+    def has_translucency(image: pygame.Surface) -> bool:
+        if not image.get_flags() & pygame.SRCALPHA:
+            return image.get_alpha() is not None and image.get_alpha() < 255
+        alpha = pygame.surfarray.array_alpha(image)
+        return bool(((alpha != 0) & (alpha != 255)).any())
+
+    def _left(self, camera: Camera) -> float:
+        """World x shown at the left border of the camera, see Camera.transform."""
+        return camera.offset.x * self.speed + camera.level.origin.x * (1 - self.speed)
+
+    def _first_x(self, left: float) -> int:
+        return self.x + self.width * math.floor((left - self.x) / self.width)
+
+    def matches_tiles(self, camera: Camera) -> bool:
+        """
+        Whether the strip lands on the same pixels as its layers drawn tile by tile. Blit positions are truncated
+        toward zero: a strip starting at a negative fractional x is moved right by its fraction as a whole, while the
+        tiles of its layers starting at positive x are moved left, e.g. for the camera clamped at x = 262.5.
+        Zoomed cameras are left out, their tiles are scaled on their own and never matched the strips exactly.
+        """
+        if (len(self.layers) == 1 and self.surface is self.layers[0].image) or camera.zoom != 1.0:
+            return True
+        x, y = camera.transform((self._first_x(self._left(camera)), self.y), self.speed)
+        return (x >= 0 or x == int(x)) and (y >= 0 or y == int(y))
+
+    def surfaces(self, camera: Camera, plain: bool = False) -> List[Tuple[pygame.Surface, Rect, float]]:
+        left = self._left(camera)
+        x = self._first_x(left)
+        surface = self.plain_surface if plain else self.surface
+        height = surface.get_height()
+        # two blits for the cameras the strip was built for, more for a wider camera
+        surfaces = [(surface, Rect(x, self.y, self.width, height), self.speed)]
+        x += self.width
+        while x < left + camera.width:
+            surfaces.append((surface, Rect(x, self.y, self.width, height), self.speed))
+            x += self.width
+        return surfaces
+
+
 class ParallaxBackground:
-    def __init__(self, layers: List[Layer] = None):
+    # Widest strip built for layers sharing a speed, layers whose widths have no common multiple below get their own
+    MAX_STRIP_WIDTH = 4096
+
+    def __init__(self, layers: List[Layer] = None, use_strips: bool = True):
         self._layers = layers or []  # type: List[Layer]
         self._sort_layers()
-        self._cached_surfaces = None
+        self._use_strips = use_strips
+        # camera width -> strips and layers drawn tile by tile, in drawing order
+        self._cached_surfaces = {}  # type: Dict[int, List[ParallaxStrip | Layer]]
 
     @property
     def layers(self):
@@ -47,6 +179,28 @@ class ParallaxBackground:
 
     def _sort_layers(self):
         self._layers.sort(key=lambda layer: layer.speed)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the pre-rendered strips, they are built again for the next camera size, e.g. after a resize."""
+        self._cached_surfaces = {}
+
+    def _build_strips(self, camera_width: int) -> 'List[ParallaxStrip | Layer]':
+        groups = []  # type: List[List[Layer] | Layer]
+        for layer in self._layers:
+            if not layer.repeat_horizontal or layer.repeat_vertical:
+                groups.append(layer)
+            elif groups and isinstance(groups[-1], list) and ParallaxStrip.can_merge(groups[-1], layer, camera_width):
+                groups[-1].append(layer)
+            else:
+                groups.append([layer])
+        return [ParallaxStrip(group, camera_width) if isinstance(group, list) else group for group in groups]
+
+    def _get_strips(self, width: int) -> 'List[ParallaxStrip | Layer]':
+        strips = self._cached_surfaces.get(width)
+        if strips is None:
+            strips = self._cached_surfaces[width] = self._build_strips(width)
+        return strips
 
     def _get_surfaces(self, camera: Camera):
         surfaces = []
@@ -74,10 +228,11 @@ class ParallaxBackground:
 
         return surfaces
 
-    def _get_surfaces_optimize(self, camera: Camera):
+    def _get_surfaces_optimize(self, camera: Camera, layers: List[Layer] = None, plain: bool = False):
         surfaces = []
-        for layer in self._layers:
-            layer_width, layer_height = layer.image.get_size()
+        for layer in self._layers if layers is None else layers:
+            image = layer.plain_image if plain else layer.image
+            layer_width, layer_height = image.get_size()
 
             repeat_count_x = 1
             repeat_count_y = 1
@@ -99,11 +254,47 @@ class ParallaxBackground:
                     x_position = start_x + (i * layer_width)
                     y_position = start_y - (j * layer_height)
                     surfaces.append(
-                        (layer.image, Rect(x_position, y_position, layer_width, layer_height), layer.speed)
+                        (image, Rect(x_position, y_position, layer_width, layer_height), layer.speed)
                     )
 
         return surfaces
 
+    def covers(self, camera: Camera) -> bool:
+        """Whether an opaque layer fills the whole viewport of the camera, nothing drawn before it stays visible."""
+        for layer in self._layers:
+            image = layer.image
+            if not layer.repeat_horizontal or image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None \
+                    or image.get_alpha() is not None:
+                continue
+            if layer.repeat_vertical:
+                return True
+            # compared on screen, a zoomed out camera draws the layer smaller
+            top = int(camera.transform(layer.rect, layer.speed)[1])
+            if top <= 0 and top + layer.rect.height * camera.zoom >= camera.camera_surface.get_height():
+                return True
+        return False
+
+    def _get_surfaces_from_strips(self, camera: Camera, strips_width: int, plain: bool):
+        surfaces = []
+        for strip in self._get_strips(strips_width):
+            if isinstance(strip, ParallaxStrip) and strip.matches_tiles(camera):
+                surfaces.extend(strip.surfaces(camera, plain))
+            elif isinstance(strip, ParallaxStrip):
+                surfaces.extend(self._get_surfaces_optimize(camera, strip.layers, plain))
+            else:
+                surfaces.extend(self._get_surfaces_optimize(camera, [strip], plain))
+        return surfaces
+
+    def get_surfaces(self, camera: Camera, strips_width: int = None, plain: bool = False
+                     ) -> List[Tuple[pygame.Surface, Rect, float]]:
+        """
+        Surfaces to draw for the camera with Camera.draw_with_speed.
+        strips_width selects the strips built for another camera width, e.g. for a temporary camera that should not
+        build strips of its own. plain gives the strips and the layers without RLE, see plain_copy.
+        """
+        if self._use_strips:
+            return self._get_surfaces_from_strips(camera, strips_width or camera.width, plain)
+        return self._get_surfaces_optimize(camera, plain=plain)
+
     def draw(self, camera: Camera):
-        surfaces = self._get_surfaces_optimize(camera)
-        camera.draw_with_speed(*surfaces)
+        camera.draw_with_speed(*self.get_surfaces(camera))
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from pygame import Rect, Surface
+
+from entities.entity import Entity
+from player import Player
+
+
+class EntitySnapshot:
+    """What the cameras need of an entity, with the same attributes as the entity so the scene draws both alike."""
+    __slots__ = ("layers", "image_rect", "motion")
+
+    def __init__(self, layers: Tuple[Surface, ...], image_rect: Rect, motion: Tuple[float, float]):
+        self.layers = layers
+        self.image_rect = image_rect
+        # previous position - current position, see Entity.interpolation_offset
+        self.motion = motion
+
+    def interpolation_offset(self, alpha: float) -> Tuple[float, float]:
+        if alpha >= 1.0:
+            return 0.0, 0.0
+        return self.motion[0] * (1.0 - alpha), self.motion[1] * (1.0 - alpha)
+
+
+class HudValues:
+    __slots__ = ("icon", "lives_left", "health_percentage")
+
+    def __init__(self, icon: Surface, lives_left: int, health_percentage: float):
+        self.icon = icon
+        self.lives_left = lives_left
+        self.health_percentage = health_percentage
+
+    @staticmethod
+    def of(player: Player) -> 'HudValues':
+        return HudValues(player.character.data.icon, player.lives_left, player.character.health_percentage)
+
+
+class RenderSnapshot:
+    """
+    State of the level after a simulation tick, copied so that it can be drawn while the next ticks run.
+    Only the frames are shared with the level, they are never modified once loaded.
+    """
+    __slots__ = ("time", "input_time", "ticks", "entities", "camera_targets", "huds")
+
+    def __init__(self, time: float, input_time: float, ticks: int, entities: List[EntitySnapshot],
+                 camera_targets: Tuple[Optional[Tuple[Tuple[float, float], Tuple[float, float]]], ...],
+                 huds: Tuple[HudValues, ...]):
+        self.time = time
+        # when the inputs used by the last tick were read
+        self.input_time = input_time
+        self.ticks = ticks
+        self.entities = entities
+        # midbottom of the box and motion of each player character, None without character
+        self.camera_targets = camera_targets
+        self.huds = huds
+
+    @staticmethod
+    def capture(entities: Iterable[Entity], players: Iterable[Player], input_time: float, ticks: int
+                ) -> 'RenderSnapshot':
+        entity_snapshots = [
+            EntitySnapshot(tuple(entity.layers), Rect(entity.image_rect), entity.interpolation_offset(0.0))
+            for entity in entities
+        ]
+        camera_targets = []
+        huds = []
+        for player in players:
+            character = player.character
+            if character is None:
+                camera_targets.append(None)
+            else:
+                camera_targets.append((tuple(character.box.midbottom), character.interpolation_offset(0.0)))
+            huds.append(HudValues.of(player))
+        return RenderSnapshot(time.perf_counter(), input_time, ticks, entity_snapshots, tuple(camera_targets),
+                              tuple(huds))
+
+
+class SnapshotBuffer:
+    """
+    The last snapshots published by the simulation thread. Snapshots are never modified once published, the buffer
+    only swaps references: the render thread keeps drawing the previous one while the next is being captured.
+    """
+
+    def __init__(self, size: int = 3):
+        self._snapshots = deque(maxlen=size)  # type: Deque[RenderSnapshot]
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: RenderSnapshot) -> None:
+        with self._lock:
+            self._snapshots.append(snapshot)
+
+    def latest(self) -> Optional[RenderSnapshot]:
+        with self._lock:
+            return self._snapshots[-1] if self._snapshots else None
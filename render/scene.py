@@ -1,6 +1,9 @@
 
 import itertools
-from typing import Iterable, Tuple
+import math
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import pygame
 from pygame import Vector2, Surface, Rect, SurfaceType
@@ -8,12 +11,45 @@ from pygame.rect import RectType
 
 from base_game import BaseGame
 from base_level import BaseLevel
+from entities.entity import Entity
 from render.camera import Camera
 from render.hud import HUD, PlayerHUD
 from render.parallax_background import ParallaxBackground
+from render.render_snapshot import EntitySnapshot, RenderSnapshot
+from render.zoom_camera import ZoomCache, ZoomCamera
+from resources.resources_manager import ResourcesManager
+
+
+class SharedRenderStats:
+    """Frames whose entities and level layers were rendered once for both cameras and the blits it saved."""
+
+    def __init__(self):
+        self.shared = False
+        self.saved_blits = 0
+        self.frames = 0
+        self.shared_frames = 0
+        self.total_saved_blits = 0
+
+    def record(self, shared: bool, saved_blits: int):
+        self.shared = shared
+        self.saved_blits = saved_blits
+        self.frames += 1
+        self.shared_frames += shared
+        self.total_saved_blits += saved_blits
+
+    def reset(self):
+        self.__init__()
+
+    def __repr__(self):
+        return "SharedRenderStats(shared={}, saved_blits={}, frames={}, shared_frames={}, total_saved_blits={})".format(
+            self.shared, self.saved_blits, self.frames, self.shared_frames, self.total_saved_blits
+        )
 
 
 class Scene:
+    # The fit zoom must exceed the most zoomed out level by this much to leave the split screen, so that characters
+    # at the limit distance do not switch the mode every frame
+    ZOOM_HYSTERESIS = 0.05
 
     def __init__(self, game: BaseGame):
         self.game = game
@@ -24,67 +60,403 @@ class Scene:
 
         self.line_pos = ((0, 0), (0, 0))
 
+        # Drawn instead of the level when set, the level then belongs to the simulation thread (see Game.pipelined)
+        self.snapshot = None  # type: Optional[RenderSnapshot]
+
+        # Entities are looked up in the broadphase around each camera, the margin covers the sprites larger than
+        # their box and the interpolation since the last update
+        self._view_culling = ResourcesManager.settings["view_culling"]
+        self._cull_margin = ResourcesManager.settings["view_cull_margin"] * ResourcesManager.settings["base_scaling"]
+
         self.HUD_cam1 = HUD(PlayerHUD(self.game.player1))
         self.HUD_cam2 = HUD(PlayerHUD(self.game.player2))
 
+        # Dirty rectangles: screen areas changed by the last draw, the whole window is presented when they cover
+        # more than dirty_rect_threshold of it
+        self._dirty_rects_enabled = ResourcesManager.settings["dirty_rects"]
+        self._dirty_rect_threshold = ResourcesManager.settings["dirty_rect_threshold"]
+        self._dirty_rects = []  # type: List[Rect]
+        self._present_all = True
+        # camera -> offset and screen rects of the entities of the previous draw
+        self._last_offsets = {}  # type: Dict[Camera, Tuple[float, float]]
+        self._last_entity_rects = {}  # type: Dict[Camera, List[Rect]]
+
+        # parallel_viewports: the second viewport is rasterized on a worker thread while the main thread draws the
+        # first one. SDL updates the blit map of a source surface on each blit and clips a subsurface through its owner,
+        # so the worker has its own copies of the sources and its own buffer, composited by the main thread afterwards
+        self._viewport_pool = None  # type: Optional[ThreadPoolExecutor]
+        if ResourcesManager.settings["parallel_viewports"]:
+            self._viewport_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viewport")
+        self._worker_sources = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[Surface, Surface]
+        self._worker_buffer = None  # type: Optional[Surface]
+
+        # When the views of both cameras mostly intersect, the entities and the layers moving with them are rendered
+        # once for the union of the views into an offscreen buffer, each camera then blits its part of it
+        self._shared_render = ResourcesManager.settings["shared_camera_render"]
+        self._shared_render_overlap = ResourcesManager.settings["shared_render_overlap"]
+        self._shared_camera = None  # type: Optional[Camera]
+        self.shared_render_stats = SharedRenderStats()
+
+        # camera_mode "dynamic": a single camera over the whole window zooms out to keep every living character in
+        # view, the screen is only split when they are farther apart than the most zoomed out level shows
+        self._camera_mode = ResourcesManager.settings["camera_mode"]
+        self._zoom_cache = ZoomCache(ResourcesManager.settings["zoom_levels"])
+        self._zoom_margin = ResourcesManager.settings["zoom_margin"] * ResourcesManager.settings["base_scaling"]
+        self._zoom_speed = ResourcesManager.settings["zoom_speed"]
+        # zoom eased towards the fit of the characters, the camera draws the closest cached level
+        self._zoom = 1.0
+        self._dynamic = False
+        self.dynamic_camera = ZoomCamera(game.window, (0, 0), 0, 0, self.game.level, self._zoom_cache)
+        self._split_hud_rects = []  # type: List[Rect]
+        self._dynamic_hud_rects = []  # type: List[Rect]
+
         self.resize(self.game.window)
 
     def update(self, dt):
-        if self.game.player1.character is not None:
-            self.camera1.update(self.game.player1.character.box.rect.midbottom)
+        if self.snapshot is not None:
+            targets = [self._snapshot_target(target) for target in self.snapshot.camera_targets]
         else:
-            self.camera1.update(self.game.level.origin)
+            targets = [None if player.character is None else self._interpolated_midbottom(player.character)
+                       for player in (self.game.player1, self.game.player2)]
 
-        if self.game.player2.character is not None:
-            self.camera2.update(self.game.player2.character.box.rect.midbottom)
+        if self._camera_mode == "dynamic":
+            dynamic = self._update_dynamic_camera(targets, dt)
+            if dynamic != self._dynamic:
+                # the whole window changes layout
+                self._dynamic = dynamic
+                self._present_all = True
+                self._last_offsets.clear()
+                self._last_entity_rects.clear()
+            if dynamic:
+                return
+
+        self.camera1.update(targets[0] if targets[0] is not None else self.game.level.origin)
+        self.camera2.update(targets[1] if targets[1] is not None else self.game.level.origin)
+
+    def _snapshot_target(self, target: Optional[Tuple[Tuple[float, float], Tuple[float, float]]]
+                         ) -> Optional[Tuple[float, float]]:
+        if target is None:
+            return None
+        (x, y), (motion_x, motion_y) = target
+        alpha = self.game.interpolation
+        if alpha < 1.0:
+            x, y = x + motion_x * (1.0 - alpha), y + motion_y * (1.0 - alpha)
+        return x, y
+
+    def _update_dynamic_camera(self, targets: List[Optional[Tuple[float, float]]], dt: float) -> bool:
+        """
+        Zooms the dynamic camera out just enough to show the targets and centers it between them. False when they are
+        farther apart than the most zoomed out level shows, the split cameras are then used.
+        """
+        camera = self.dynamic_camera
+        level = self.game.level
+        width, height = camera.camera_surface.get_size()
+        # a view larger than the level could not be clamped to it
+        levels = [zoom for zoom in self._zoom_cache.levels
+                  if width / zoom <= level.width and height / zoom <= level.height]
+        if not levels:
+            return False
+
+        points = [target for target in targets if target is not None]
+        if points:
+            left, right = min(x for x, _ in points), max(x for x, _ in points)
+            top, bottom = min(y for _, y in points), max(y for _, y in points)
+            fit = min(1.0, width / (right - left + 2 * self._zoom_margin),
+                      height / (bottom - top + 2 * self._zoom_margin))
+            center = ((left + right) / 2, (top + bottom) / 2)
+        else:
+            fit, center = 1.0, level.origin
+
+        min_zoom = levels[-1]
+        if fit < (min_zoom if self._dynamic else min(1.0, min_zoom * (1 + Scene.ZOOM_HYSTERESIS))):
+            return False
+        if self._dynamic:
+            # eased when zooming in, zooming out follows the fit at once so that nobody leaves the view
+            self._zoom = fit + (self._zoom - fit) * math.exp(-self._zoom_speed * dt)
         else:
-            self.camera2.update(self.game.level.origin)
+            self._zoom = fit
+        camera.set_zoom(max(min(self._zoom, fit), min_zoom))
+        camera.update(center)
+        return True
+
+    def _interpolated_midbottom(self, entity: Entity) -> Tuple[float, float]:
+        offset_x, offset_y = entity.interpolation_offset(self.game.interpolation)
+        x, y = entity.box.midbottom
+        return x + offset_x, y + offset_y
+
+    def _interpolated_image_position(self, entity: Entity) -> 'Rect | Tuple[float, float]':
+        rect = entity.image_rect
+        offset_x, offset_y = entity.interpolation_offset(self.game.interpolation)
+        if offset_x or offset_y:
+            return rect.x + offset_x, rect.y + offset_y
+        return rect
 
     def draw(self):
-        self._draw_camera(self.camera1)
-        self._draw_camera(self.camera2)
+        self._dirty_rects = []
+
+        if self._dynamic:
+            self._rasterize(*self._prepare_camera(self.dynamic_camera))
+            self._draw_hud(self.HUD_cam1, self._dynamic_hud_rects[0], 0)
+            self._draw_hud(self.HUD_cam2, self._dynamic_hud_rects[1], 1)
+            return
 
+        shared = None
+        if self._shared_render and self._cameras_overlap():
+            shared, viewports = self._prepare_shared_cameras()
+            if shared is not None:
+                # the buffer is needed by both viewports
+                self._rasterize(*shared)
+        else:
+            viewports = [self._prepare_camera(self.camera1), self._prepare_camera(self.camera2)]
+            self.shared_render_stats.record(False, 0)
+
+        if self._viewport_pool is not None and shared is None:
+            self._rasterize_parallel(*viewports)
+        else:
+            for viewport in viewports:
+                self._rasterize(*viewport)
 
-        self._draw_hud(self.HUD_cam1, self.camera1)
-        self._draw_hud(self.HUD_cam2, self.camera2)
+        self._draw_hud(self.HUD_cam1, self._split_hud_rects[0], 0)
+        self._draw_hud(self.HUD_cam2, self._split_hud_rects[1], 1)
 
         self._draw_line(self.game.window)
 
-    def _draw_hud(self, hud: HUD, camera: Camera):
-        hud_surface = camera.camera_surface.subsurface(Rect(0, 0, camera.width/3, camera.height/5))
-        hud.draw(hud_surface)
+    def dirty_rects(self) -> Optional[List[Rect]]:
+        """Screen areas changed by the last draw, None when the whole window has to be presented."""
+        present_all, self._present_all = self._present_all, False
+        if present_all or not self._dirty_rects_enabled:
+            return None
+        window_width, window_height = self.game.window.get_size()
+        # overlapping rects are counted twice, the threshold is reached a bit earlier
+        if sum(rect.w * rect.h for rect in self._dirty_rects) > self._dirty_rect_threshold * window_width * window_height:
+            return None
+        return self._dirty_rects
+
+    def _draw_hud(self, hud: HUD, hud_rect: Rect, player_index: int):
+        hud.draw(self.camera1.display_surface.subsurface(hud_rect),
+                 self.snapshot.huds[player_index] if self.snapshot is not None else None)
+        if self._dirty_rects_enabled and hud.player_hud.changed:
+            self._dirty_rects.append(Rect(hud_rect))
 
     def _draw_line(self, window: Surface):
         line_width = window.get_width() // 100
         pygame.draw.line(window, (0, 0, 0), self.line_pos[0], self.line_pos[1], line_width)
 
-    def _draw_camera(self, camera: Camera):
-        self.game.level.background.draw(camera)
-
-        camera.draw(
-            *self._flatten_layers([(entity.layers, entity.image_rect) for entity in self.game.level.get_entities()])
+    def _prepare_camera(self, camera: Camera) -> Tuple[Camera, Optional[Tuple[int, ...]], List[tuple]]:
+        """Camera, the color to clear its viewport with if needed and what to blit onto it, in order."""
+        background = self.game.level.background
+        # the clear is only needed when the background leaves a part of the viewport uncovered
+        clear = None if background.covers(camera) else (0, 0, 0)
+        # the strips are built for the viewport width, a zoomed out camera repeats them
+        blits = camera.blit_list_with_speed(
+            *background.get_surfaces(camera, strips_width=camera.camera_surface.get_width())
         )
+
+        visible = self._visible_entities(camera)
+        blits.extend(camera.blit_list(*self._flatten_layers((entity.layers, position) for entity, position in visible)))
+        if self._dirty_rects_enabled:
+            self._track_dirty_rects(camera, visible)
        # camera.draw(
             #[[self._create_mask(entity.rect), entity.rect] for entity in self.game.level.get_entities()]
         #)
+        return camera, clear, blits
+
+    def _cameras_overlap(self) -> bool:
+        view1, view2 = self.camera1.view_rect, self.camera2.view_rect
+        if view1.size != view2.size or view1.w * view1.h == 0:
+            return False
+        # blit positions are truncated: the crops only match the cameras when their offsets differ by whole pixels
+        difference = self.camera1.offset - self.camera2.offset
+        if not (difference.x.is_integer() and difference.y.is_integer()):
+            return False
+        overlap = view1.clip(view2)
+        return overlap.w * overlap.h >= self._shared_render_overlap * view1.w * view1.h
+
+    def _prepare_shared_cameras(self):
+        """
+        Blit lists of the shared buffer then of both cameras, or of the independent cameras when a layer moves faster
+        than the entities: it would have to be drawn over the buffer.
+        The layers slower than the entities are drawn by each camera before the crop of the buffer.
+        """
+        background = self.game.level.background
+        surfaces = [background.get_surfaces(camera) for camera in (self.camera1, self.camera2)]
+        if any(speed > 1 for camera_surfaces in surfaces for _, _, speed in camera_surfaces):
+            self.shared_render_stats.record(False, 0)
+            return None, [self._prepare_camera(self.camera1), self._prepare_camera(self.camera2)]
+
+        union = self.camera1.view_rect.union(self.camera2.view_rect)
+        shared_camera = self._get_shared_camera(union)
+        shared_surfaces = [item for item in
+                           background.get_surfaces(shared_camera, strips_width=self.camera1.width, plain=True)
+                           if item[2] == 1]
+        shared_blits = shared_camera.blit_list_with_speed(*shared_surfaces)
+
+        visible = [(entity, tuple(entity.layers), position) for entity, position in
+                   self._visible_entities(shared_camera)]
+        shared_blits.extend(shared_camera.blit_list(
+            *((surface, position) for _, layers, position in visible for surface in layers)
+        ))
 
+        viewports = []
+        independent_blits = 0
+        for camera, camera_surfaces in zip((self.camera1, self.camera2), surfaces):
+            clear = None if background.covers(camera) else (0, 0, 0)
+            blits = camera.blit_list_with_speed(*[item for item in camera_surfaces if item[2] != 1])
+            blits.append((shared_camera.camera_surface, camera.transform(shared_camera.offset)))
+            viewports.append((camera, clear, blits))
+
+            view = camera.view_rect
+            independent_blits += len(camera_surfaces) + sum(
+                len(layers) for entity, layers, position in visible
+                if view.colliderect(position[0], position[1], entity.image_rect.w, entity.image_rect.h)
+            )
+            if self._dirty_rects_enabled:
+                self._track_dirty_rects(camera, [(entity, position) for entity, _, position in visible])
+
+        actual_blits = len(shared_blits) + sum(len(blits) for _, _, blits in viewports)
+        self.shared_render_stats.record(True, independent_blits - actual_blits)
+        return (shared_camera, (0, 0, 0, 0), shared_blits), viewports
+
+    def _get_shared_camera(self, union: Rect) -> Camera:
+        """Camera showing union on the offscreen buffer, the buffer is kept while the camera size does not change."""
+        width, height = self.camera1.width, self.camera1.height
+        camera = self._shared_camera
+        if camera is None or camera.display_surface.get_size() != (2 * width, 2 * height):
+            # the union of two views of the same size is at most twice as large in each direction
+            buffer = pygame.Surface((2 * width, 2 * height), pygame.SRCALPHA, 32).convert_alpha()
+            camera = self._shared_camera = Camera(buffer, (0, 0), 0, 0, self.game.level)
+        camera.set_viewport(camera.display_surface, Rect((0, 0), union.size))
+        # same fractional part as the camera offsets, the crops are then blitted at whole positions
+        offset = self.camera1.offset
+        camera.offset.update(union.x + offset.x - math.floor(offset.x), union.y + offset.y - math.floor(offset.y))
+        return camera
+
+    @staticmethod
+    def _rasterize(camera: Camera, clear: Optional[Tuple[int, ...]], blits: List[tuple]):
+        if clear is not None:
+            camera.clear(clear)
+        camera.blit(blits)
         camera.finish_draw()
 
+    def _rasterize_parallel(self, first: Tuple[Camera, Optional[Tuple[int, ...]], List[tuple]],
+                            second: Tuple[Camera, Optional[Tuple[int, ...]], List[tuple]]):
+        """
+        Rasterizes second into the buffer of the worker from the copies of its sources, first onto the display
+        meanwhile, then blits the buffer onto the viewport of second.
+        """
+        camera, clear, blits = second
+        size = camera.camera_surface.get_size()
+        buffer = self._worker_buffer
+        if buffer is None or buffer.get_size() != size:
+            # same pixel format as the display, the copy onto the viewport is exact
+            buffer = self._worker_buffer = Surface(size, 0, camera.camera_surface)
+        worker_blits = [(self._worker_source(blit[0]),) + tuple(blit[1:]) for blit in blits]
+        future = self._viewport_pool.submit(Scene._rasterize_offscreen, buffer, clear, worker_blits)
+        try:
+            self._rasterize(*first)
+        finally:
+            future.result()
+        camera.blit([(buffer, (0, 0))])
+        camera.finish_draw()
+
+    def _worker_source(self, surface: Surface) -> Surface:
+        """Copy of surface only blitted by the worker, made on first use. The sources are never drawn into."""
+        copy = self._worker_sources.get(surface)
+        if copy is None:
+            # Surface.copy turns the pixels matching the colorkey but for their alpha transparent, the raw pixels are
+            # copied instead
+            flags = surface.get_flags()
+            copy = self._worker_sources[surface] = Surface(surface.get_size(), flags & pygame.SRCALPHA, surface)
+            pygame.surfarray.blit_array(copy, pygame.surfarray.array2d(surface))
+            colorkey = surface.get_colorkey()
+            if colorkey is not None:
+                copy.set_colorkey(colorkey, pygame.RLEACCEL if flags & pygame.RLEACCELOK else 0)
+            if not flags & pygame.SRCALPHA and surface.get_alpha() is not None:
+                copy.set_alpha(surface.get_alpha())
+        return copy
+
+    @staticmethod
+    def _rasterize_offscreen(buffer: Surface, clear: Optional[Tuple[int, ...]], blits: List[tuple]):
+        if clear is not None:
+            buffer.fill(clear)
+        buffer.blits(blits, doreturn=False)
+
+    def shutdown(self):
+        """Stops the worker of parallel_viewports, the scene is not drawn anymore."""
+        if self._viewport_pool is not None:
+            self._viewport_pool.shutdown()
+            self._viewport_pool = None
+        self._worker_sources = weakref.WeakKeyDictionary()
+        self._worker_buffer = None
+
+    def _track_dirty_rects(self, camera: Camera, visible: List[Tuple[Entity, 'Rect | Tuple[float, float]']]):
+        offset = (camera.offset.x, camera.offset.y, camera.zoom)
+        entity_rects = [camera.screen_rect(position, entity.image_rect.size) for entity, position in visible]
+        if offset != self._last_offsets.get(camera):
+            # the parallax layers scrolled, the whole viewport changed
+            self._dirty_rects.append(camera.rect.copy())
+        else:
+            # the entities of this frame and the background where they were in the previous one
+            self._dirty_rects.extend(entity_rects)
+            self._dirty_rects.extend(self._last_entity_rects.get(camera, ()))
+        self._last_offsets[camera] = offset
+        self._last_entity_rects[camera] = entity_rects
+
+    def _visible_entities(self, camera: Camera) -> List[Tuple[Entity, 'Rect | Tuple[float, float]']]:
+        """Entities to draw and their position in the level."""
+        if self.snapshot is not None:
+            return self._visible_snapshot_entities(camera)
+
+        level = self.game.level
+        if not self._view_culling:
+            return [(entity, self._interpolated_image_position(entity)) for entity in level.get_entities()]
+
+        view = camera.view_rect
+        margin = self._cull_margin
+        visible = []
+        for entity in level.get_entities_in(view.inflate(2 * margin, 2 * margin)):
+            position = self._interpolated_image_position(entity)
+            width, height = entity.image_rect.size
+            if view.colliderect(position[0], position[1], width, height):
+                visible.append((entity, position))
+        camera.cull_stats.record(len(visible), len(level.get_entities()) - len(visible))
+        return visible
+
+    def _visible_snapshot_entities(self, camera: Camera
+                                   ) -> List[Tuple[EntitySnapshot, 'Rect | Tuple[float, float]']]:
+        # the broadphase is updated by the simulation thread meanwhile, the entities of the snapshot are tested one
+        # by one: it only costs a rect test each
+        entities = [(entity, self._interpolated_image_position(entity)) for entity in self.snapshot.entities]
+        if not self._view_culling:
+            return entities
+        view = camera.view_rect
+        visible = [(entity, position) for entity, position in entities
+                   if view.colliderect(position[0], position[1], entity.image_rect.w, entity.image_rect.h)]
+        camera.cull_stats.record(len(visible), len(entities) - len(visible))
+        return visible
 
     def resize(self, display: Surface):
         width, height = display.get_size()
-        self.camera1.rect.topleft = (0, 0)
-        self.camera1.width = width
-        self.camera1.height = height / 2
-        self.camera1.display_surface = display
-
-        self.camera2.rect.topleft = (0, height / 2)
-        self.camera2.width = width
-        self.camera2.height = height / 2
-        self.camera2.display_surface = display
+        self.camera1.set_viewport(display, Rect((0, 0), (width, height / 2)))
+        self.camera2.set_viewport(display, Rect((0, height / 2), (width, height / 2)))
+        self.dynamic_camera.set_viewport(display, Rect((0, 0), (width, height)))
+        self.game.level.background.invalidate()
+        self._present_all = True
+        self._last_offsets.clear()
 
         self.line_pos = ((0, height / 2), (width, height / 2))
 
+        # the HUDs keep their split screen size, in the corners of the single view of the dynamic camera
+        hud_size = (self.camera1.rect.width / 3, self.camera1.rect.height / 5)
+        self._split_hud_rects = [Rect(self.camera1.rect.topleft, hud_size), Rect(self.camera2.rect.topleft, hud_size)]
+        self._dynamic_hud_rects = [Rect((0, 0), hud_size), Rect((width - hud_size[0], 0), hud_size)]
+        if self._camera_mode == "dynamic":
+            # the strips are large, they are scaled now rather than during a fight
+            background = self.game.level.background
+            self.dynamic_camera.prewarm(
+                {surface for surface, _, _ in background.get_surfaces(self.dynamic_camera, strips_width=width)}
+            )
+
         self.HUD_cam1.padding_x_percentage = height/width * 0.1
         self.HUD_cam1.padding_y_percentage = width/height * 0.15
 
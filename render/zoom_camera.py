@@ -0,0 +1,116 @@
+import math
+import weakref
+from typing import Dict, List, Sequence, Tuple
+
+import pygame
+from pygame import Rect, Surface
+
+from render.camera import Camera
+
+
+class ZoomCache:
+    """
+    Copies of the surfaces scaled to a few fixed zoom levels, each surface is scaled once per level on first use.
+    Entries go away with their surface, e.g. the strips of the background after a resize.
+    """
+
+    def __init__(self, levels: Sequence[float]):
+        self.levels = sorted(set(float(level) for level in levels), reverse=True)  # type: List[float]
+        self._scaled = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[Surface, Dict[float, Surface]]
+
+    def level_for(self, zoom: float) -> float:
+        """Largest level showing at least as much as zoom, the smallest level when zoom is below all of them."""
+        for level in self.levels:
+            if level <= zoom:
+                return level
+        return self.levels[-1]
+
+    def get(self, surface: Surface, level: float) -> Surface:
+        if level == 1.0:
+            return surface
+        scaled_levels = self._scaled.get(surface)
+        if scaled_levels is None:
+            scaled_levels = self._scaled[surface] = {}
+        scaled = scaled_levels.get(level)
+        if scaled is None:
+            scaled = scaled_levels[level] = ZoomCache.scale(surface, level)
+        return scaled
+
+    @staticmethod
+    def scale(surface: Surface, level: float) -> Surface:
+        width, height = surface.get_size()
+        # rounded up, the tiles of a layer overlap by a pixel rather than leaving gaps between them
+        size = (max(1, math.ceil(width * level)), max(1, math.ceil(height * level)))
+        if surface.get_bitsize() in (24, 32):
+            scaled = pygame.transform.smoothscale(surface, size)
+        else:
+            scaled = pygame.transform.scale(surface, size)
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            scaled.set_colorkey(colorkey, pygame.RLEACCEL)
+        return scaled
+
+    def clear(self) -> None:
+        self._scaled = weakref.WeakKeyDictionary()
+
+
+class ZoomCamera(Camera):
+    """
+    Camera zoomed out by one of the levels of a ZoomCache. width and height are the size of the part of the level
+    shown, larger than the viewport; positions are scaled each frame, surfaces come from the cache.
+    """
+
+    def __init__(self, display_surface, camera_pos, width, height, level, zoom_cache: ZoomCache):
+        self._zoom = 1.0
+        self._zoom_cache = zoom_cache
+        super().__init__(display_surface, camera_pos, width, height, level)
+
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @property
+    def zoom_cache(self) -> ZoomCache:
+        return self._zoom_cache
+
+    def set_zoom(self, zoom: float) -> None:
+        """Zooms to the closest cached level showing at least as much as zoom."""
+        level = self._zoom_cache.level_for(zoom)
+        if level != self._zoom:
+            self._zoom = level
+            self._update_view_size()
+
+    def _update_view_size(self) -> None:
+        width, height = self._surface.get_size()
+        self._width, self._height = width / self._zoom, height / self._zoom
+
+    def transform(self, rect: 'pygame.Rect | Tuple[float, float]', speed: float = 1.0) -> Tuple[float, float]:
+        x, y = super().transform(rect, speed)
+        return x * self._zoom, y * self._zoom
+
+    def transform_all(self, rects: 'Sequence[pygame.Rect | Tuple[float, float]]', speed: float = 1.0
+                      ) -> List[Tuple[float, float]]:
+        zoom = self._zoom
+        return [(x * zoom, y * zoom) for x, y in super().transform_all(rects, speed)]
+
+    def blit_list(self, *surfaces: Tuple[Surface, pygame.Rect], speed: float = 1.0
+                  ) -> List[Tuple[Surface, Tuple[float, float]]]:
+        zoom, cache = self._zoom, self._zoom_cache
+        positions = self.transform_all([rect for _, rect in surfaces], speed)
+        return [(cache.get(surface, zoom), position) for (surface, _), position in zip(surfaces, positions)]
+
+    def blit_list_with_speed(self, *surfaces: Tuple[Surface, pygame.Rect, float]
+                             ) -> List[Tuple[Surface, Tuple[float, float]]]:
+        zoom, cache = self._zoom, self._zoom_cache
+        return [(cache.get(surface, zoom), self.transform(rect, speed)) for surface, rect, speed in surfaces]
+
+    def screen_rect(self, position: 'pygame.Rect | Tuple[float, float]', size: Tuple[int, int]) -> Rect:
+        x, y = self.transform(position)
+        width, height = math.ceil(size[0] * self._zoom), math.ceil(size[1] * self._zoom)
+        return Rect(self.rect.x + int(x), self.rect.y + int(y), width, height).clip(self.rect)
+
+    def prewarm(self, surfaces: Sequence[Surface]) -> None:
+        """Scales surfaces to every level now rather than on first use, e.g. the large background strips."""
+        for surface in surfaces:
+            for level in self._zoom_cache.levels:
+                self._zoom_cache.get(surface, level)
@@ -1,25 +1,28 @@
 import json
+import time
 from pathlib import Path
 from typing import Tuple, Dict, List
 
-import numpy as np
 import pygame
 from pygame import Surface
 
-from entities.animation import Animation
+from entities.animation import Animation, AnimationFrames
 from entities.character_animation import CharacterAnimation, AnimationType
+from resources.frame_cache import Frame, FrameCache, Sheet
+from resources.frame_store import FrameStore
+from resources.loading_pool import LoadingPool
 from resources.textures_loader import TexturesLoader
 
 
 class AnimationFactory:
 
-    def __init__(self, images: List[Surface], total_time_seconds: float, loop: int = 1):
-        self.images = images
+    def __init__(self, frames: AnimationFrames, total_time_seconds: float, loop: int = 1):
+        self.frames = frames
         self.total_time_seconds = total_time_seconds
         self.loop = loop
 
     def __call__(self):
-        return Animation(self.images, self.total_time_seconds, self.loop)
+        return Animation(self.frames, self.total_time_seconds, self.loop)
 
 
 class CharacterAnimationFactory:
@@ -38,90 +41,156 @@ class CharacterAnimationFactory:
 class AnimationLoader:
 
     @staticmethod
-    def load_animations_from_json(filepath: str, scale: float = 1) -> CharacterAnimationFactory:
+    def load_animations_from_json(filepath: str, scale: float = 1, use_cache: bool = False,
+                                  loading_pool: LoadingPool = None) -> CharacterAnimationFactory:
+        """
+        Frames are trimmed to their opaque pixels. With "common_bounds" (for the whole file or per animation)
+        all the frames of an animation are trimmed to the same box, so the sprite does not move from frame to frame.
+        """
         with open(filepath, 'r') as file:
             data = json.load(file)
-            animations = {}  # type: Dict[AnimationType, Tuple[int, List[Surface], float, int]]
+            animations = {}  # type: Dict[AnimationType, Tuple[int, AnimationFrames, float, int]]
             size_per_frame = tuple(data["size"])
             offset_center = tuple(data["offset_center"])
             offset_center = (int(offset_center[0] * scale), int(offset_center[1] * scale))
+            default_common_bounds = bool(data.get("common_bounds", False))
             data = data["animations"]
             priority = 0
             for anim_type, anim_data in data.items():
-                surfaces = AnimationLoader.load_animations(
-                    (Path(filepath).parent / anim_data["file"]).as_posix(),
-                    size_per_frame,
-                    scale
+                sheet_path = (Path(filepath).parent / anim_data["file"]).as_posix()
+                common_bounds = bool(anim_data.get("common_bounds", default_common_bounds))
+                frames = FrameStore.get(
+                    (sheet_path, size_per_frame, scale, common_bounds),
+                    lambda: AnimationLoader.load_animations(sheet_path, size_per_frame, scale, use_cache=use_cache,
+                                                            loading_pool=loading_pool, common_bounds=common_bounds)
                 )
 
                 animations[str(anim_type)] = (
                     priority,
-                    surfaces,
+                    frames,
                     float(anim_data["animation_total_time_ms"]) / 1000,
                     1 if bool(anim_data.get("loop", True)) is True else 0
                 )
                 priority += 1
 
             animations_factory = {
-                anim_type: (priority, AnimationFactory(surfaces, speed, loop))
-                for anim_type, (priority, surfaces, speed, loop) in animations.items()
+                anim_type: (priority, AnimationFactory(frames, speed, loop))
+                for anim_type, (priority, frames, speed, loop) in animations.items()
             }
 
             return CharacterAnimationFactory(animations_factory, offset_center=offset_center)
 
     @staticmethod
-    def load_animations(filepath: str, size: tuple, scale: int) -> List[pygame.Surface]:
-        texture = TexturesLoader.texture_loader(filepath)
-
-        num_frames = texture.get_width() // size[0]
-
-        animation = [
-            AnimationLoader.reduce_image_fast(texture.subsurface(pygame.Rect(x * size[0], 0, size[0], size[1])))
-            for x in range(num_frames)
-        ]
-
-        animation = [
-            pygame.transform.scale(image, (image.get_width() * scale, image.get_height() * scale)).convert_alpha() for
-            image in animation]
-
-        return animation
-
-    import pygame
+    def prefetch_animations_from_json(filepath: str, loading_pool: LoadingPool, scale: float = 1,
+                                      use_cache: bool = False) -> List[str]:
+        """
+        Submits the decoding of the sheets not loaded yet, load_animations_from_json then only converts them.
+        Returns their names in loading_pool.
+        """
+        names = []  # type: List[str]
+        with open(filepath, 'r') as file:
+            data = json.load(file)
+            size_per_frame = tuple(data["size"])
+            default_common_bounds = bool(data.get("common_bounds", False))
+            for anim_data in data["animations"].values():
+                sheet_path = (Path(filepath).parent / anim_data["file"]).as_posix()
+                common_bounds = bool(anim_data.get("common_bounds", default_common_bounds))
+                if not FrameStore.contains((sheet_path, size_per_frame, scale, common_bounds)):
+                    name = AnimationLoader.sheet_name(sheet_path, size_per_frame, scale, common_bounds)
+                    loading_pool.submit(name, AnimationLoader.decode_sheet, sheet_path, size_per_frame, scale, use_cache,
+                                        common_bounds)
+                    names.append(name)
+        return names
 
     @staticmethod
-    def reduce_image(image) -> pygame.Surface:
-        width, height = image.get_size()
-
-        min_x, min_y = width, height
-        max_x, max_y = 0, 0
-
-        for x in range(width):
-            for y in range(height):
-                if image.get_at((x, y))[3] != 0:
-                    min_x = min(min_x, x)
-                    max_x = max(max_x, x)
-                    min_y = min(min_y, y)
-                    max_y = max(max_y, y)
-
-        new_width = max_x - min_x + 1
-        new_height = max_y - min_y + 1
-
-        new_image = image.subsurface((min_x, min_y, new_width, new_height))
-
-        return new_image
+    def sheet_name(filepath: str, size: tuple, scale: float, common_bounds: bool = False) -> str:
+        """Name of a sheet in a LoadingPool, everything changing its frames is part of it as in the frame cache key."""
+        return "{} {} x{:g}{}".format(filepath, "x".join(map(str, size)), scale,
+                                      " common bounds" if common_bounds else "")
 
     @staticmethod
-    def reduce_image_fast(image):
-        np_image = pygame.surfarray.pixels_alpha(image)
-
-        alpha_indices = np.argwhere(np_image != 0)
+    def load_animations(filepath: str, size: tuple, scale: int, use_cache: bool = False,
+                        loading_pool: LoadingPool = None, common_bounds: bool = False) -> AnimationFrames:
+        name = AnimationLoader.sheet_name(filepath, size, scale, common_bounds)
+        if loading_pool is not None and name in loading_pool:
+            frames, anchor_offset = loading_pool.result(name)
+        else:
+            frames, anchor_offset = AnimationLoader.decode_sheet(filepath, size, scale, use_cache=use_cache,
+                                                                 common_bounds=common_bounds)
+
+        start = time.perf_counter()
+        images = [TexturesLoader.to_display_format(image) for image, _ in frames]
+        if loading_pool is not None:
+            loading_pool.record_conversion(name, time.perf_counter() - start)
+        return AnimationFrames(images, [offset for _, offset in frames], anchor_offset)
 
-        min_x, min_y = alpha_indices.min(axis=0)
-        max_x, max_y = alpha_indices.max(axis=0)
-
-        new_width = max_x - min_x + 1
-        new_height = max_y - min_y + 1
-
-        new_image = image.subsurface((min_x, min_y, new_width, new_height))
+    @staticmethod
+    def decode_sheet(filepath: str, size: tuple, scale: int, use_cache: bool = False,
+                     common_bounds: bool = False) -> Sheet:
+        """
+        Trimmed and scaled frames of a sheet with their scaled trim offsets in their cell, not converted to the display
+        format yet, and the anchor offset of the animation (see AnimationFrames).
+        Nothing depends on the display so that sheets can be decoded on worker threads.
+        """
+        sheet = FrameCache.load(filepath, size, scale, common_bounds) if use_cache else None
+        if sheet is not None:
+            return sheet
+
+        texture = TexturesLoader.to_rgba(pygame.image.load(filepath))
+
+        bounds = AnimationLoader.trim_sheet(texture, size)
+
+        anchor_offset = (0, 0)
+        if common_bounds and bounds:
+            common = bounds[0].unionall(bounds[1:])
+            # offset_center is set for the frames trimmed one by one, the sprite is kept where the first frame was
+            anchor_offset = (int((common.centerx - bounds[0].centerx) * scale),
+                             int((common.bottom - bounds[0].bottom) * scale))
+            bounds = [common] * len(bounds)
+
+        frames = []  # type: List[Frame]
+        for x, rect in enumerate(bounds):
+            image = texture.subsurface(rect.move(x * size[0], 0))
+            frames.append((
+                pygame.transform.scale(image, (image.get_width() * scale, image.get_height() * scale)),
+                (int(rect.x * scale), int(rect.y * scale))
+            ))
+
+        if use_cache:
+            FrameCache.store(filepath, size, scale, common_bounds, frames, anchor_offset)
+
+        return frames, anchor_offset
 
-        return new_image
+    @staticmethod
+    def trim_sheet(texture: Surface, size: tuple) -> List[pygame.Rect]:
+        """
+        Bounding box of the opaque pixels of each frame of a sheet, relative to its cell.
+        The alpha plane of the whole sheet is read once and reduced by rows and columns for all the frames at once.
+        Frames without any opaque pixel keep their whole cell.
+        """
+        width, height = size
+        num_frames = texture.get_width() // width
+        if num_frames == 0:
+            return []
+
+        alpha = pygame.surfarray.pixels_alpha(texture)
+        # surfarray is indexed [x, y]: frames are consecutive blocks of columns
+        opaque = alpha[:num_frames * width, :height].reshape(num_frames, width, height) != 0
+        del alpha
+
+        columns = opaque.any(axis=2)
+        rows = opaque.any(axis=1)
+        empty = ~columns.any(axis=1)
+
+        min_x = columns.argmax(axis=1)
+        max_x = width - 1 - columns[:, ::-1].argmax(axis=1)
+        min_y = rows.argmax(axis=1)
+        max_y = rows.shape[1] - 1 - rows[:, ::-1].argmax(axis=1)
+
+        min_x[empty], min_y[empty] = 0, 0
+        max_x[empty], max_y[empty] = width - 1, rows.shape[1] - 1
+
+        return [
+            pygame.Rect(int(x0), int(y0), int(x1 - x0 + 1), int(y1 - y0 + 1))
+            for x0, y0, x1, y1 in zip(min_x, min_y, max_x, max_y)
+        ]
@@ -5,26 +5,37 @@ import pygame
 
 from base_level import BaseLevel
 from entities.animation import Animation
-from entities.attack_trajectory import AttackTrajectory
+from entities.attack_trajectory import AttackTimeline, AttackTrajectory
 from entities.base_attack import BaseAttackExecutor
 from entities.entity import Entity
 from entities.melee_attack import MeleeAttack
 from resources.attack_frame_loader import AttackFrameLoader
 from resources.stats_loader import AttackFrameFactory
+from utils.object_pool import ObjectPool, PoolStats
 
 
 class MeleeAttackFactory:
 
     def __init__(
-            self, trajectory: Callable[[], AttackTrajectory], animation: Animation, health: float, damage: float
+            self, trajectory: Callable[[], AttackTrajectory], animation: Animation, health: float, damage: float,
+            name: str = "", pool_size: int = 8
     ):
         self.trajectory = trajectory
         self.animation = animation
         self.health = health
         self.damage = damage
+        self.name = name
+        # Attacks removed from their level come back here with their trajectory, see MeleeAttack.removed_from_level
+        self.pool = ObjectPool(self._create, MeleeAttack.reset, max_size=pool_size)  # type: ObjectPool[MeleeAttack]
 
     def __call__(self, level: BaseLevel, owner: Entity, friend_obj):
-        return MeleeAttack(level, owner, self.trajectory(), self.animation, self.health, self.damage, friend_obj)
+        return self.pool.acquire(level, owner, friend_obj)
+
+    def _create(self, level: BaseLevel, owner: Entity, friend_obj) -> MeleeAttack:
+        return MeleeAttack(
+            level, owner, self.trajectory(), self.animation, self.health, self.damage, friend_obj, name=self.name,
+            pool=self.pool
+        )
 
 class MeleeAttackExecutorFactory:
 
@@ -32,29 +43,38 @@ class MeleeAttackExecutorFactory:
             self.attack_factory = attack_factory
             self.cooldown = cooldown
 
+        @property
+        def pool_stats(self) -> PoolStats:
+            return self.attack_factory.pool.stats
+
         def __call__(self) -> MeleeAttack.MeleeAttackExecutor:
             return MeleeAttack.MeleeAttackExecutor(self.attack_factory, self.cooldown)
 
 
 class AttackTrajectoryFactory:
 
-        def __init__(self, frames_factory: List[AttackFrameFactory]):
-            self.frames_factory = frames_factory
+        def __init__(self, timeline: AttackTimeline):
+            self.timeline = timeline
 
-        def __call__(self):
-            return AttackTrajectory([frame() for frame in self.frames_factory])
+        def __call__(self) -> AttackTrajectory:
+            return AttackTrajectory(self.timeline)
 
 
 class AttackLoader:
 
     @staticmethod
-    def load_attacks_from_json(filepath: str, scale: float = 1) -> Dict[str, Callable[[], BaseAttackExecutor]]:
+    def load_attacks_from_json(filepath: str, scale: float = 1, overrides: Dict[str, Dict[str, Any]] = None,
+                               pool_size: int = 8) -> Dict[str, Callable[[], BaseAttackExecutor]]:
+        """overrides replace top level keys of each attack (e.g. {"primary_attack": {"damage": 10}}) once loaded"""
         try:
             with open(filepath, 'r') as file:
                 data = json.load(file)
                 attacks_factory = {}
                 for attack_name, attack_data in data.items():
+                    attack_data.update((overrides or {}).get(attack_name, {}))
                     attack_data["scale"] = scale
+                    attack_data["name"] = attack_name
+                    attack_data["pool_size"] = pool_size
                     attacks_factory[attack_name] = AttackLoader.load_attack(attack_data)
                 return attacks_factory
         except Exception as e:
@@ -78,7 +98,8 @@ class AttackLoader:
         health = float(data["health"])
         damage = float(data["damage"])
         return MeleeAttackExecutorFactory(
-            MeleeAttackFactory(trajectory, animation, health, damage),
+            MeleeAttackFactory(trajectory, animation, health, damage, name=data.get("name", ""),
+                               pool_size=int(data.get("pool_size", 8))),
             cooldown
         )
 
@@ -94,6 +115,7 @@ class AttackLoader:
             for frame_data in frames_data
         ]
 
-        return AttackTrajectoryFactory(frames_factory)
+        # Built once, every instance of the attack shares it
+        return AttackTrajectoryFactory(AttackTimeline([frame() for frame in frames_factory]))
 
 
@@ -1,13 +1,16 @@
 import json
+from functools import partial
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Dict, List, Optional
 
 from pygame import Surface
 
 from entities.base_attack import BaseAttackExecutor
 from entities.character_animation import CharacterAnimation
-from resources.animation_loader import AnimationLoader
+from resources.animation_loader import AnimationLoader, CharacterAnimationFactory
 from resources.attack_loader import AttackLoader
+from resources.frame_store import FrameStore
+from resources.loading_pool import LoadingPool
 from resources.resources_registry import ResourcesRegistry
 from resources.stats_loader import Stats, StatsLoader
 from resources.textures_loader import TexturesLoader
@@ -23,25 +26,86 @@ class CharacterData:
         self.primary_attack = primary_attack
         self.secondary_attack = secondary_attack
 
-class CharacterDataFactory:
+class CharacterAssetsFactory:
 
     def __init__(self,
-                 name: str,
-                 icon: Surface,
-                 animation_factory: Callable[[], CharacterAnimation],
+                 animation_factory: CharacterAnimationFactory,
                  stats_factory: Callable[[], Stats],
                  primary_attack_factory: Callable[[], BaseAttackExecutor],
                  secondary_attack_factory: Callable[[], BaseAttackExecutor]
                  ):
-        self.name = name
-        self.icon = icon
         self.animation_factory = animation_factory
         self.stats_factory = stats_factory
         self.primary_attack_factory = primary_attack_factory
         self.secondary_attack_factory = secondary_attack_factory
 
+    def release_frames(self) -> None:
+        """Removes the frames from FrameStore, they are freed once no character plays them anymore."""
+        for _, animation_factory in self.animation_factory.animations.values():
+            FrameStore.discard(animation_factory.frames)
+
+
+class CharacterDataFactory:
+    """
+    Only the name and the icon are loaded upfront, for the character selection. The animations, stats and attacks
+    are loaded on the first use (or prefetched in the background with prefetch) and can be evicted afterwards.
+    """
+
+    def __init__(self,
+                 name: str,
+                 icon: Surface,
+                 load_assets: Callable[[Optional[LoadingPool]], CharacterAssetsFactory],
+                 prefetch_assets: Callable[[LoadingPool], List[str]] = None
+                 ):
+        self.name = name
+        self.icon = icon
+        self._load_assets = load_assets
+        self._prefetch_assets = prefetch_assets
+        self._assets = None  # type: Optional[CharacterAssetsFactory]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._assets is not None
+
+    def load(self, loading_pool: LoadingPool = None) -> CharacterAssetsFactory:
+        """Loads the assets on the main thread, using the sheets already decoded by loading_pool if any."""
+        if self._assets is None:
+            self._assets = self._load_assets(loading_pool)
+        return self._assets
+
+    def prefetch(self, loading_pool: LoadingPool) -> List[str]:
+        """
+        Starts decoding the sheets on the workers of loading_pool, load(loading_pool) then only converts them.
+        Returns their names in loading_pool, to discard them if the character is not picked.
+        """
+        if self._assets is None and self._prefetch_assets is not None:
+            return self._prefetch_assets(loading_pool)
+        return []
+
+    def evict(self) -> None:
+        if self._assets is not None:
+            self._assets.release_frames()
+            self._assets = None
+
+    @property
+    def animation_factory(self) -> CharacterAnimationFactory:
+        return self.load().animation_factory
+
+    @property
+    def stats_factory(self) -> Callable[[], Stats]:
+        return self.load().stats_factory
+
+    @property
+    def primary_attack_factory(self) -> Callable[[], BaseAttackExecutor]:
+        return self.load().primary_attack_factory
+
+    @property
+    def secondary_attack_factory(self) -> Callable[[], BaseAttackExecutor]:
+        return self.load().secondary_attack_factory
+
     def __call__(self):
-        return CharacterData(self.name, self.icon.copy(), self.animation_factory(), self.stats_factory(), self.primary_attack_factory(), self.secondary_attack_factory())
+        assets = self.load()
+        return CharacterData(self.name, self.icon.copy(), assets.animation_factory(), assets.stats_factory(), assets.primary_attack_factory(), assets.secondary_attack_factory())
 
 
 class CharacterLoader:
@@ -50,37 +114,113 @@ class CharacterLoader:
     def load_characters_from_json(
             filepath: str,
             settings: ResourcesRegistry[str, Any],
-            builder: ResourcesRegistry.ResourceRegistryBuilder[str, CharacterDataFactory]
+            builder: ResourcesRegistry.ResourceRegistryBuilder[str, CharacterDataFactory],
+            overrides: Dict[str, Dict[str, Any]] = None
     ) -> ResourcesRegistry.ResourceRegistryBuilder[str, CharacterDataFactory]:
-        with open(filepath, 'r') as file:
-            data = json.load(file)
-            global_scaling = float(settings["base_scaling"])
-            for entity_info in data["characters"]:
-                relative_path = entity_info["folder_relative_path"]
-                scale = float(entity_info["scale"])
-                scale *= global_scaling
-
-                icon = TexturesLoader.texture_loader((Path(filepath).parent / relative_path / "Icon.png").as_posix())
+        """
+        Only the icons are loaded here, see CharacterDataFactory.
+        overrides are applied on top of the json files of each character without editing them,
+        e.g. {"Huntress": {"stats": {"health": 120}, "attacks": {"primary_attack": {"damage": 10}}}}
+        """
+        overrides = overrides or {}
+        CharacterLoader.check_overrides(filepath, overrides)
+        loading_pool = LoadingPool.from_settings(settings)
+        try:
+            with open(filepath, 'r') as file:
+                data = json.load(file)
+                global_scaling = float(settings["base_scaling"])
+                attack_pool_size = int(settings["attack_pool_size"])
+                use_frame_cache = bool(settings["frame_cache"])
+                if loading_pool is not None:
+                    for entity_info in data["characters"]:
+                        folder = Path(filepath).parent / entity_info["folder_relative_path"]
+                        TexturesLoader.prefetch_texture(loading_pool, (folder / "Icon.png").as_posix())
+                for entity_info in data["characters"]:
+                    folder = (Path(filepath).parent / entity_info["folder_relative_path"]).as_posix()
+                    scale = float(entity_info["scale"])
+                    scale *= global_scaling
+
+                    icon = TexturesLoader.texture_loader((Path(folder) / "Icon.png").as_posix(), loading_pool=loading_pool)
+
+                    builder.register(
+                        entity_info["name"],
+                        CharacterDataFactory(
+                            entity_info["name"],
+                            icon,
+                            partial(CharacterLoader.load_character_assets, folder, scale,
+                                    overrides.get(entity_info["name"], {}), attack_pool_size, use_frame_cache),
+                            partial(CharacterLoader.prefetch_character_assets, folder, scale, use_frame_cache)
+                        )
+                    )
 
-                anim_factory = \
-                    AnimationLoader.load_animations_from_json((Path(filepath).parent / relative_path / "animations.json").as_posix(), scale)
+        finally:
+            if loading_pool is not None:
+                loading_pool.shutdown()
+                if settings["loading_report"]:
+                    print(loading_pool.report())
 
-                stats_factory = \
-                    StatsLoader.load_stats_from_json((Path(filepath).parent / relative_path / "stats.json").as_posix(), scale)
+        return builder
 
-                attacks_factory = \
-                    AttackLoader.load_attacks_from_json((Path(filepath).parent / relative_path / "attacks.json").as_posix(), scale)
+    @staticmethod
+    def check_overrides(filepath: str, overrides: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Raises ValueError when overrides name a character, an attack or a key missing from the json files: the
+        loaders would silently ignore it.
+        """
+        with open(filepath, 'r') as file:
+            folders = {entity_info["name"]: Path(filepath).parent / entity_info["folder_relative_path"]
+                       for entity_info in json.load(file)["characters"]}
+        for name, character_overrides in overrides.items():
+            if name not in folders:
+                raise ValueError("Unknown character '{}' in overrides, available characters: {}"
+                                 .format(name, ", ".join(folders)))
+            unknown_sections = set(character_overrides) - {"stats", "attacks"}
+            if unknown_sections:
+                raise ValueError("Unknown override sections {} for {}, expected stats or attacks"
+                                 .format(", ".join(sorted(unknown_sections)), name))
+            with open(folders[name] / "stats.json", 'r') as file:
+                stats = json.load(file)
+            unknown_keys = set(character_overrides.get("stats", {})) - set(stats)
+            if unknown_keys:
+                raise ValueError("Unknown stats {} for {}, available stats: {}"
+                                 .format(", ".join(sorted(unknown_keys)), name, ", ".join(stats)))
+            with open(folders[name] / "attacks.json", 'r') as file:
+                attacks = json.load(file)
+            for attack_name, attack_overrides in character_overrides.get("attacks", {}).items():
+                if attack_name not in attacks:
+                    raise ValueError("Unknown attack '{}' for {}, available attacks: {}"
+                                     .format(attack_name, name, ", ".join(attacks)))
+                unknown_keys = set(attack_overrides) - set(attacks[attack_name])
+                if unknown_keys:
+                    raise ValueError("Unknown keys {} for {}.{}, available keys: {}".format(
+                        ", ".join(sorted(unknown_keys)), name, attack_name, ", ".join(attacks[attack_name])
+                    ))
 
-                builder.register(
-                    entity_info["name"],
-                    CharacterDataFactory(
-                        entity_info["name"],
-                        icon,
-                        anim_factory,
-                        stats_factory,
-                        attacks_factory["primary_attack"],
-                        attacks_factory["secondary_attack"]
-                    )
-                )
+    @staticmethod
+    def load_character_assets(folder: str, scale: float, overrides: Dict[str, Any], attack_pool_size: int,
+                              use_frame_cache: bool, loading_pool: LoadingPool = None) -> CharacterAssetsFactory:
+        anim_factory = \
+            AnimationLoader.load_animations_from_json((Path(folder) / "animations.json").as_posix(), scale,
+                                                      use_cache=use_frame_cache, loading_pool=loading_pool)
+
+        stats_factory = \
+            StatsLoader.load_stats_from_json((Path(folder) / "stats.json").as_posix(), scale,
+                                             overrides=overrides.get("stats"))
+
+        attacks_factory = \
+            AttackLoader.load_attacks_from_json((Path(folder) / "attacks.json").as_posix(), scale,
+                                                overrides=overrides.get("attacks"),
+                                                pool_size=attack_pool_size)
+
+        return CharacterAssetsFactory(
+            anim_factory,
+            stats_factory,
+            attacks_factory["primary_attack"],
+            attacks_factory["secondary_attack"]
+        )
 
-        return builder
+    @staticmethod
+    def prefetch_character_assets(folder: str, scale: float, use_frame_cache: bool, loading_pool: LoadingPool
+                                  ) -> List[str]:
+        return AnimationLoader.prefetch_animations_from_json((Path(folder) / "animations.json").as_posix(), loading_pool,
+                                                      scale, use_cache=use_frame_cache)
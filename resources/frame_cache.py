@@ -0,0 +1,129 @@
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pygame
+from pygame import Surface
+
+# Bump when the trimming or scaling of the frames changes, older cache files are then ignored
+LOADER_VERSION = 3
+
+_MAGIC = b"RBFC"
+# magic, loader version, frame count, anchor offset x, anchor offset y
+_HEADER = struct.Struct("<4sIIii")
+# width, height, trim offset x, trim offset y, pixels offset in the file
+_FRAME = struct.Struct("<IIiiQ")
+
+Frame = Tuple[Surface, Tuple[int, int]]
+# Frames of a sheet and the anchor offset of the animation
+Sheet = Tuple[List[Frame], Tuple[int, int]]
+
+# frombytes and tobytes are pygame 2.1.3+, the older releases allowed by requirements.txt name them fromstring and
+# tostring
+_frombytes = getattr(pygame.image, "frombytes", None) or getattr(pygame.image, "fromstring", None)
+_tobytes = getattr(pygame.image, "tobytes", None) or getattr(pygame.image, "tostring", None)
+
+
+class FrameCache:
+    """
+    On disk cache of the trimmed and scaled frames of the sprite sheets, so that later launches skip the PNG
+    decoding, the trimming and the scaling.
+    A file holds the frame table followed by the raw RGBA pixels of every frame, it is read through mmap.
+    Files are named after the sheet path, the frame size, the scale and the trimming mode, then after the mtime and
+    size of the sheet and LOADER_VERSION: any change of the sheet or of the loader gives a new file name, and the
+    files of the older versions of the same sheet are deleted when it is written.
+    """
+
+    @staticmethod
+    def directory() -> Path:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return Path(cache_home) / "riftbrawl"
+
+    @staticmethod
+    def cache_path(sheet_path: str, frame_size: Tuple[int, int], scale: float, common_bounds: bool = False) -> Path:
+        stat = os.stat(sheet_path)
+        version = "{}|{}|{}".format(stat.st_mtime_ns, stat.st_size, LOADER_VERSION)
+        return FrameCache.directory() / "{}.{}.frames".format(
+            FrameCache._sheet_key(sheet_path, frame_size, scale, common_bounds),
+            hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        )
+
+    @staticmethod
+    def _sheet_key(sheet_path: str, frame_size: Tuple[int, int], scale: float, common_bounds: bool) -> str:
+        key = "{}|{}|{}|{}".format(os.path.abspath(sheet_path), tuple(frame_size), repr(float(scale)), bool(common_bounds))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def load(sheet_path: str, frame_size: Tuple[int, int], scale: float, common_bounds: bool = False
+             ) -> Optional[Sheet]:
+        """
+        Frames with their trim offsets and the anchor offset, None when not cached, the file is unreadable or pygame
+        cannot convert raw pixels.
+        """
+        if _frombytes is None:
+            return None
+        try:
+            path = FrameCache.cache_path(sheet_path, frame_size, scale, common_bounds)
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, count, anchor_x, anchor_y = _HEADER.unpack_from(data, 0)
+                if magic != _MAGIC or version != LOADER_VERSION:
+                    return None
+                frames = []
+                for i in range(count):
+                    width, height, trim_x, trim_y, offset = _FRAME.unpack_from(data, _HEADER.size + i * _FRAME.size)
+                    pixels = data[offset:offset + width * height * 4]
+                    frames.append((_frombytes(pixels, (width, height), "RGBA"), (trim_x, trim_y)))
+                return frames, (anchor_x, anchor_y)
+        except (OSError, ValueError, struct.error, pygame.error):
+            return None
+
+    @staticmethod
+    def store(sheet_path: str, frame_size: Tuple[int, int], scale: float, common_bounds: bool, frames: List[Frame],
+              anchor_offset: Tuple[int, int] = (0, 0)) -> None:
+        """Writes the frames to the cache, failures are ignored as the cache is only an optimisation."""
+        if _tobytes is None:
+            return
+        try:
+            path = FrameCache.cache_path(sheet_path, frame_size, scale, common_bounds)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            offset = _HEADER.size + len(frames) * _FRAME.size
+            table = [_HEADER.pack(_MAGIC, LOADER_VERSION, len(frames), anchor_offset[0], anchor_offset[1])]
+            pixels = []
+            for surface, (trim_x, trim_y) in frames:
+                width, height = surface.get_size()
+                table.append(_FRAME.pack(width, height, trim_x, trim_y, offset))
+                pixels.append(_tobytes(surface, "RGBA"))
+                offset += width * height * 4
+            # Written aside under a unique name then renamed, a concurrent launch or loading thread never reads a
+            # partial file
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as file:
+                file.writelines(table)
+                file.writelines(pixels)
+            try:
+                os.replace(file.name, path)
+            except OSError:
+                os.remove(file.name)
+                raise
+            FrameCache._remove_stale(path)
+        except (OSError, ValueError, pygame.error):
+            pass
+
+    @staticmethod
+    def _remove_stale(path: Path) -> None:
+        """Deletes the files of the same sheet with an outdated version, e.g. written before the sheet changed."""
+        sheet_key = path.name.split(".", 1)[0]
+        for stale in path.parent.glob(sheet_key + ".*.frames"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def clear() -> None:
+        shutil.rmtree(FrameCache.directory(), ignore_errors=True)
@@ -0,0 +1,36 @@
+from typing import Callable, Dict, Hashable
+
+from entities.animation import AnimationFrames
+
+
+class FrameStore:
+    """
+    Process wide store of the frames of every loaded animation, keyed by animation definition.
+    Each animation is loaded and flipped once, every Animation instance then only keeps its playback state.
+    """
+
+    _frames = {}  # type: Dict[Hashable, AnimationFrames]
+
+    @staticmethod
+    def get(key: Hashable, load: Callable[[], AnimationFrames]) -> AnimationFrames:
+        frames = FrameStore._frames.get(key)
+        if frames is None:
+            frames = FrameStore._frames[key] = load()
+        return frames
+
+    @staticmethod
+    def contains(key: Hashable) -> bool:
+        return key in FrameStore._frames
+
+    @staticmethod
+    def count() -> int:
+        return len(FrameStore._frames)
+
+    @staticmethod
+    def discard(frames: AnimationFrames) -> None:
+        for key in [key for key, value in FrameStore._frames.items() if value is frames]:
+            del FrameStore._frames[key]
+
+    @staticmethod
+    def clear() -> None:
+        FrameStore._frames.clear()
@@ -2,7 +2,11 @@ from pygame import Vector2
 
 from base_level import BaseLevel
 from collisions.damage_handler import DamageCollisionHandler
+from collisions.spatial_hash import SpatialHash
+from entities.character import Character
+from entities.melee_attack import MeleeAttack
 from level import Level
+from physics.vectorized_physics import VectorizedPhysics
 from render.parallax_background import ParallaxBackground, Layer
 from resources.resources_manager import ResourcesManager
 from resources.resources_registry import ResourcesRegistry
@@ -48,7 +52,7 @@ class LevelRegistry:
             Layer(origin, sky_ocean_background, 0.1, "sky_ocean_background", repeat_vertical=False, repeat_horizontal=True),
             Layer(origin + Vector2(0, 40)*global_scale, tree, 1, "tree", repeat_vertical=False, repeat_horizontal=True),
             Layer(origin, grass_surface, 1, "grass_surface", repeat_vertical=False, repeat_horizontal=True),
-        ])
+        ], use_strips=ResourcesManager.settings["parallax_strips"])
 
         width = sky_ocean_background.get_width() / 2
         height = 1000 * global_scale
@@ -59,4 +63,11 @@ class LevelRegistry:
 
         spawn_points = [Vector2(origin.x + i * width / 10, origin.y) for i in range(0, 11)]
 
-        return Level(collision_dispatcher.build(), parallax_background, spawn_points, width, height, gravity, max_velocity_x, origin=origin)
\ No newline at end of file
+        broadphase = SpatialHash(cell_size=128 * global_scale)
+
+        physics = VectorizedPhysics() if ResourcesManager.settings["vectorized_physics"] else None
+
+        # Every entity type of the level is known, collisions are dispatched through precomputed tables
+        dispatcher = collision_dispatcher.build().freeze(Character, MeleeAttack)
+
+        return Level(dispatcher, parallax_background, spawn_points, width, height, gravity, max_velocity_x, origin=origin, broadphase=broadphase, physics=physics)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from resources.resources_registry import ResourcesRegistry
+
+
+class LoadingPool:
+    """
+    Decodes and transforms assets on worker threads, pygame releases the GIL while loading and scaling images.
+    Only thread safe work must be submitted: the conversion to the display format is left to the main thread,
+    which records its duration with record_conversion for the timing report.
+    """
+
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-loader")
+        self._futures = {}  # type: Dict[str, Future]
+        # asset name -> [decoding time on a worker, conversion time on the main thread]
+        self._timings = {}  # type: Dict[str, List[float]]
+        self._start = time.perf_counter()
+
+    @staticmethod
+    def from_settings(settings: ResourcesRegistry[str, Any]) -> Optional['LoadingPool']:
+        """A pool of settings["loading_workers"] threads, None to load on the main thread only."""
+        workers = int(settings["loading_workers"])
+        return LoadingPool(workers) if workers > 1 else None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._futures
+
+    def submit(self, name: str, fn: Callable[..., Any], *args) -> None:
+        if name in self._futures:
+            return
+        timings = self._timings[name] = [0.0, 0.0]
+
+        def run():
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timings[0] = time.perf_counter() - start
+
+        self._futures[name] = self._executor.submit(run)
+
+    def result(self, name: str) -> Any:
+        """Waits for a submitted asset, each result can only be taken once."""
+        return self._futures.pop(name).result()
+
+    def record_conversion(self, name: str, seconds: float) -> None:
+        self._timings.setdefault(name, [0.0, 0.0])[1] += seconds
+
+    def discard(self, names: Iterable[str]) -> None:
+        """Forgets the results of some assets, those not started yet are cancelled."""
+        for name in names:
+            future = self._futures.pop(name, None)
+            if future is not None:
+                future.cancel()
+
+    def discard_pending(self) -> None:
+        """Forgets the results not taken yet, e.g. prefetched assets that are not needed anymore."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._futures.clear()
+
+    def report(self) -> str:
+        lines = ["{:>11} {:>12}  {}".format("decode (ms)", "convert (ms)", "asset")]
+        for name, (decode, convert) in sorted(self._timings.items(), key=lambda item: -item[1][0]):
+            lines.append("{:>11.1f} {:>12.1f}  {}".format(decode * 1000, convert * 1000, name))
+        lines.append("{} assets loaded in {:.1f} ms".format(len(self._timings), (time.perf_counter() - self._start) * 1000))
+        return "\n".join(lines)
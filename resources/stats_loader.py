@@ -41,9 +41,10 @@ class StatsFactory:
 
 class StatsLoader:
     @staticmethod
-    def load_stats_from_json(filepath: str, scale: float = 1) -> StatsFactory:
+    def load_stats_from_json(filepath: str, scale: float = 1, overrides: Dict[str, Any] = None) -> StatsFactory:
         with open(filepath, 'r') as file:
             data = json.load(file)
+            data.update(overrides or {})
 
             hitbox_size = tuple(data["hitbox_size"])
             hitbox_size = (int(hitbox_size[0] * scale), int(hitbox_size[1] * scale))
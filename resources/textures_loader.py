@@ -1,10 +1,12 @@
 import json
+import time
 from typing import Any
 
 import numpy as np
 import pygame
 from pygame import Color
 
+from resources.loading_pool import LoadingPool
 from resources.resources_registry import ResourcesRegistry
 
 
@@ -16,19 +18,68 @@ class TexturesLoader:
             settings: ResourcesRegistry[str, Any],
             builder: ResourcesRegistry.ResourceRegistryBuilder[str, pygame.Surface]
     ) -> ResourcesRegistry.ResourceRegistryBuilder[str, pygame.Surface]:
-        with open(filepath, 'r') as file:
-            data = json.load(file)
-            base_scaling = float(settings["base_scaling"])
-            for texture_info in data['textures']:
-                name = texture_info['name']
-                file_path = texture_info['path']
-                size = tuple(texture_info['size'])
-                scale = float(texture_info['scale'])
-                builder.register(name, TexturesLoader.texture_loader(file_path, size, scale_factor=scale*base_scaling))
+        loading_pool = LoadingPool.from_settings(settings)
+        try:
+            with open(filepath, 'r') as file:
+                data = json.load(file)
+                base_scaling = float(settings["base_scaling"])
+                if loading_pool is not None:
+                    for texture_info in data['textures']:
+                        TexturesLoader.prefetch_texture(
+                            loading_pool, texture_info['path'], tuple(texture_info['size']),
+                            scale_factor=float(texture_info['scale'])*base_scaling
+                        )
+                for texture_info in data['textures']:
+                    name = texture_info['name']
+                    file_path = texture_info['path']
+                    size = tuple(texture_info['size'])
+                    scale = float(texture_info['scale'])
+                    builder.register(name, TexturesLoader.texture_loader(file_path, size, scale_factor=scale*base_scaling,
+                                                                         loading_pool=loading_pool))
+        finally:
+            if loading_pool is not None:
+                loading_pool.shutdown()
+                if settings["loading_report"]:
+                    print(loading_pool.report())
         return builder
 
     @staticmethod
-    def texture_loader(filepath: str, size: tuple = None, scale_factor: float=1, color_key=None, alpha=False) -> pygame.Surface:
+    def texture_loader(filepath: str, size: tuple = None, scale_factor: float=1, color_key=None, alpha=False,
+                       loading_pool: LoadingPool = None) -> pygame.Surface:
+        name = TexturesLoader.texture_name(filepath, size, scale_factor)
+        if loading_pool is not None and name in loading_pool:
+            texture = loading_pool.result(name)
+        else:
+            texture = TexturesLoader.decode_texture(filepath, size, scale_factor)
+
+        start = time.perf_counter()
+
+        if alpha or TexturesLoader.has_transparency(texture):
+            texture = TexturesLoader.to_display_format(texture, alpha=True)
+            texture.set_colorkey(Color(0, 0, 0, 0), pygame.RLEACCEL)
+        else:
+            texture = TexturesLoader.to_display_format(texture, alpha=False)
+
+        if color_key is not None:
+            texture.set_colorkey(color_key, pygame.RLEACCEL)
+
+        if loading_pool is not None:
+            loading_pool.record_conversion(name, time.perf_counter() - start)
+
+        return texture
+
+    @staticmethod
+    def texture_name(filepath: str, size: tuple = None, scale_factor: float = 1) -> str:
+        return "{} {} x{:g}".format(filepath, "x".join(map(str, size)) if size is not None else "", scale_factor)
+
+    @staticmethod
+    def prefetch_texture(loading_pool: LoadingPool, filepath: str, size: tuple = None, scale_factor: float = 1) -> None:
+        loading_pool.submit(TexturesLoader.texture_name(filepath, size, scale_factor),
+                            TexturesLoader.decode_texture, filepath, size, scale_factor)
+
+    @staticmethod
+    def decode_texture(filepath: str, size: tuple = None, scale_factor: float = 1) -> pygame.Surface:
+        """Loading and scaling of texture_loader, independent of the display so that it can run on any thread."""
         texture = pygame.image.load(filepath)
 
         if size is None:
@@ -37,22 +88,34 @@ class TexturesLoader:
 
         size = (size[0] * scale_factor, size[1] * scale_factor)
 
-        texture = pygame.transform.scale(texture, size)
+        return pygame.transform.scale(texture, size)
 
-        if alpha or TexturesLoader.has_transparency(texture):
-            texture = texture.convert_alpha()
-            texture.set_colorkey(Color(0, 0, 0, 0), pygame.RLEACCEL)
-        else:
-            texture = texture.convert()
+    @staticmethod
+    def has_display() -> bool:
+        return pygame.display.get_init() and pygame.display.get_surface() is not None
 
-        if color_key is not None:
-            texture.set_colorkey(color_key, pygame.RLEACCEL)
+    @staticmethod
+    def to_display_format(surface: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+        """
+        Converts to the pixel format of the display. Without display (headless runs) only per pixel alpha
+        surfaces are normalized to 32 bits RGBA, everything else is kept as is.
+        """
+        if TexturesLoader.has_display():
+            return surface.convert_alpha() if alpha else surface.convert()
+        return TexturesLoader.to_rgba(surface) if alpha else surface
 
-        return texture
+    @staticmethod
+    def to_rgba(surface: pygame.Surface) -> pygame.Surface:
+        """Display independent equivalent of convert_alpha."""
+        if surface.get_flags() & pygame.SRCALPHA and surface.get_bitsize() == 32:
+            return surface
+        rgba_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA, 32)
+        rgba_surface.blit(surface, (0, 0))
+        return rgba_surface
 
     @staticmethod
     def has_transparency(surface: pygame.Surface, threshold=255) -> bool:
-        image_with_alpha = surface.convert_alpha()
+        image_with_alpha = TexturesLoader.to_display_format(surface, alpha=True)
 
         try:
             alpha_array = pygame.surfarray.pixels_alpha(image_with_alpha)
@@ -1,17 +1,31 @@
 import utils.utils
 
 if __name__ == "__main__":
-    from setup import setup_environment
-    setup_environment(utils.utils.get_project_root() + "/requirements.txt")
-
     import argparse
     import sys
 
-    import pygame
+    from utils.startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler()
+
+    # Parsed before anything else: the dependencies must be installed before pygame is imported
+    startup_parser = argparse.ArgumentParser(add_help=False)
+    startup_parser.add_argument('--install-deps', action='store_true',
+                                help="Install the requirements with pip even if they are already satisfied.")
+    startup_parser.add_argument('--startup-profile', action='store_true',
+                                help="Print the time spent in each step of the startup.")
+    startup_args, _ = startup_parser.parse_known_args()
 
-    from game import Game
-    from render.character_selection import CharacterSelectionScene
-    from resources.resources_manager import ResourcesManager
+    with profiler.section("dependencies"):
+        from setup import setup_environment
+        setup_environment(utils.utils.get_project_root() + "/requirements.txt", force_install=startup_args.install_deps)
+
+    with profiler.section("imports"):
+        import pygame
+
+        from game import Game
+        from render.character_selection import CharacterSelectionScene
+        from resources.resources_manager import ResourcesManager
 
 
     def determine_scaling_factor(width, height):
@@ -26,19 +40,51 @@ if __name__ == "__main__":
         return global_scaling * min(width_scaling, height_scaling)
 
 
-    parser = argparse.ArgumentParser(description="Provide width and height for game screen.")
+    with profiler.section("settings"):
+        ResourcesManager.settings
+
+    parser = argparse.ArgumentParser(description="Provide width and height for game screen.", parents=[startup_parser])
     parser.add_argument('--width', type=int, default=ResourcesManager.settings["base_width"], help="Width of the screen.")
     parser.add_argument('--height', type=int, default=ResourcesManager.settings["base_height"], help='Height of the screen.')
+    parser.add_argument('--tick-rate', type=float, default=ResourcesManager.settings["tick_rate"],
+                        help="Simulation ticks per second, 0 to advance the simulation once per rendered frame.")
+    parser.add_argument('--clear-cache', action='store_true', help="Delete the cached sprite frames before starting.")
+    parser.add_argument('--loading-workers', type=int, default=ResourcesManager.settings["loading_workers"],
+                        help="Threads decoding the assets, 1 to load them on the main thread only.")
+    parser.add_argument('--loading-report', action='store_true', help="Print the loading time of each asset.")
+    parser.add_argument('--pipelined', action='store_true', default=ResourcesManager.settings["pipelined"],
+                        help="Run the simulation on its own thread, the display draws snapshots of it meanwhile.")
+    # BooleanOptionalAction needs Python 3.9, the settings can enable these modes: --no-... turns them off again
+    parser.add_argument('--no-pipelined', dest='pipelined', action='store_false',
+                        help="Run the simulation on the main thread even if the settings enable --pipelined.")
+    parser.add_argument('--pipeline-report', action='store_true',
+                        help="Print the thread overlap and the input to display latency of the pipelined mode.")
+    parser.add_argument('--dirty-rects', action='store_true', default=ResourcesManager.settings["dirty_rects"],
+                        help="Present only the changed parts of the screen, for software rendered displays.")
+    parser.add_argument('--no-dirty-rects', dest='dirty_rects', action='store_false',
+                        help="Present the whole screen each frame even if the settings enable --dirty-rects.")
+    parser.add_argument('--camera-mode', choices=("split", "dynamic"), default=ResourcesManager.settings["camera_mode"],
+                        help="dynamic: a single camera zooming out to show both players, split only when they are too "
+                             "far apart.")
 
     args = parser.parse_args()
 
-    pygame.init()
+    if args.clear_cache:
+        from resources.frame_cache import FrameCache
+        FrameCache.clear()
+
+    with profiler.section("pygame init"):
+        pygame.init()
 
     width, height = args.width, args.height
 
     fps = 1000
 
     ResourcesManager.settings["base_scaling"] = determine_scaling_factor(width, height)
+    ResourcesManager.settings["loading_workers"] = args.loading_workers
+    ResourcesManager.settings["loading_report"] = args.loading_report
+    ResourcesManager.settings["dirty_rects"] = args.dirty_rects
+    ResourcesManager.settings["camera_mode"] = args.camera_mode
 
     import ctypes
 
@@ -50,9 +96,18 @@ if __name__ == "__main__":
     flags = pygame.SCALED | pygame.RESIZABLE | pygame.FULLSCREEN
 
 
-    screen = pygame.display.set_mode((width, height), flags=flags, vsync=1)
+    with profiler.section("display init"):
+        screen = pygame.display.set_mode((width, height), flags=flags, vsync=1)
+
+    # Textures are converted to the display format, they can only be loaded once the display exists
+    with profiler.section("textures"):
+        ResourcesManager.backgrounds_textures
 
-    character_selection = CharacterSelectionScene(screen)
+    with profiler.section("characters"):
+        character_selection = CharacterSelectionScene(screen)
+
+    if args.startup_profile:
+        print(profiler.report())
 
     while True:
         result = character_selection.main_loop()
@@ -62,6 +117,10 @@ if __name__ == "__main__":
 
         character1, character2 = result
 
-        game = Game(screen, character1, character2, fps=fps, title="RiftBrawl")
+        game = Game(screen, character1, character2, fps=fps, title="RiftBrawl", tick_rate=args.tick_rate,
+                    pipelined=args.pipelined)
 
         game.run()
+
+        if args.pipelined and args.pipeline_report:
+            print(game.pipeline_stats.report())
@@ -0,0 +1,122 @@
+import os
+
+# Must be set before pygame is imported, also inherited by the worker processes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def parse_override(text: str, overrides):
+    """CHARACTER.stats.KEY=VALUE or CHARACTER.ATTACK.KEY=VALUE, VALUE is parsed as json"""
+    import json
+
+    path, _, value = text.partition("=")
+    parts = path.split(".")
+    if len(parts) != 3 or not value:
+        raise ValueError("Invalid override '{}', expected CHARACTER.stats.KEY=VALUE or CHARACTER.ATTACK.KEY=VALUE"
+                         .format(text))
+    character, section, key = parts
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    character_overrides = overrides.setdefault(character, {})
+    if section == "stats":
+        character_overrides.setdefault("stats", {})[key] = value
+    else:
+        character_overrides.setdefault("attacks", {}).setdefault(section, {})[key] = value
+
+
+def format_value(value, pattern="{:.2f}"):
+    return "-" if value is None else pattern.format(value)
+
+
+def print_matrix(title, names, cell):
+    width = max(len(name) for name in names) + 2
+    print(title)
+    print("".ljust(width) + "".join(name.rjust(width) for name in names))
+    for row in names:
+        print(row.ljust(width) + "".join(cell(row, column).rjust(width) for column in names))
+    print()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    from balance_simulator import check_arguments, run_balance
+    from resources.resources_manager import ResourcesManager
+
+    parser = argparse.ArgumentParser(description="Monte-Carlo balance simulation over every pair of characters.")
+    parser.add_argument('--matches', type=int, default=100, help="Matches played per pair of characters.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes, one per core by default.")
+    parser.add_argument('--batch-size', type=int, default=10, help="Matches played by a worker per job.")
+    parser.add_argument('--characters', nargs='+', default=None, help="Subset of characters to simulate.")
+    parser.add_argument('--tick-rate', type=float, default=ResourcesManager.settings["tick_rate"])
+    parser.add_argument('--max-duration', type=float, default=180, help="Simulated seconds before a match is a draw.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--override', action='append', default=[], metavar="CHARACTER.SECTION.KEY=VALUE",
+                        help="Overrides a value of stats.json (Huntress.stats.health=120) or attacks.json "
+                             "(Huntress.primary_attack.damage=10) without editing the files. Can be repeated.")
+    parser.add_argument('--overrides-file', type=str, default=None,
+                        help='JSON file of overrides: {"Huntress": {"stats": {...}, "attacks": {"primary_attack": {...}}}}')
+    parser.add_argument('--output', type=str, default=None, help="Writes the raw results to this JSON file.")
+
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.overrides_file is not None:
+        with open(args.overrides_file, 'r') as file:
+            overrides = json.load(file)
+    for override in args.override:
+        try:
+            parse_override(override, overrides)
+        except ValueError as e:
+            parser.error(str(e))
+
+    names = args.characters or list(ResourcesManager.characters.keys())
+    try:
+        check_arguments(names, overrides)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def progress(done, total):
+        print("\r{}/{} jobs".format(done, total), end="", flush=True)
+
+    start = time.perf_counter()
+    stats = run_balance(names, args.matches, workers=args.workers, batch_size=args.batch_size,
+                        tick_rate=args.tick_rate, max_duration=args.max_duration, seed=args.seed,
+                        overrides=overrides, progress=progress)
+    elapsed = time.perf_counter() - start
+    print()
+
+    print("{} matches, {:.0f}s simulated in {:.1f}s ({:.1f} matches/s, {:.0f} ticks/s), {} draws\n".format(
+        stats.total_matches, stats.simulated_time, elapsed, stats.total_matches / elapsed,
+        stats.ticks / elapsed, stats.draws
+    ))
+
+    print_matrix("Win rate (row against column)", names,
+                 lambda row, column: format_value(stats.win_rate(row, column), "{:.0%}"))
+    print_matrix("Average time to kill in seconds (row kills column)", names,
+                 lambda row, column: format_value(stats.average_time_to_kill(row, column), "{:.1f}"))
+
+    print("Damage per second")
+    attacks = sorted(stats.attack_damage.keys())
+    for character, attack in attacks:
+        print("{} {}: {:.2f}".format(character, attack, stats.damage_per_second(character, attack)))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({
+                "matches_per_pair": args.matches,
+                "overrides": overrides,
+                "draws": stats.draws,
+                "win_rate": {row: {column: stats.win_rate(row, column) for column in names} for row in names},
+                "average_time_to_kill": {
+                    row: {column: stats.average_time_to_kill(row, column) for column in names} for row in names
+                },
+                "damage_per_second": {
+                    "{}.{}".format(character, attack): stats.damage_per_second(character, attack)
+                    for character, attack in attacks
+                },
+            }, file, indent=2)
@@ -0,0 +1,100 @@
+import os
+
+# Must be set before pygame is imported, no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    from headless_match import HeadlessMatch
+    from input_sources import RandomInputSource, ScriptedInputSource
+    from resources.resources_manager import ResourcesManager
+
+    parser = argparse.ArgumentParser(description="Run RiftBrawl matches without display, as fast as possible.")
+    parser.add_argument('--matches', type=int, default=10, help="Number of matches to play.")
+    parser.add_argument('--characters', nargs=2, metavar=('PLAYER1', 'PLAYER2'), default=None,
+                        help="Characters of both players, a random pair is picked for each match otherwise.")
+    parser.add_argument('--tick-rate', type=float, default=ResourcesManager.settings["tick_rate"],
+                        help="Simulation ticks per simulated second.")
+    parser.add_argument('--max-duration', type=float, default=300, help="Simulated seconds before a match is a draw.")
+    parser.add_argument('--script', type=str, default=None,
+                        help="JSON input script with a 'player1' and a 'player2' entry, random inputs otherwise.")
+    parser.add_argument('--seed', type=int, default=None)
+
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    # parsed once, the scripts are replayed from their start by every match
+    scripts = ScriptedInputSource.load_from_json(args.script) if args.script is not None else None
+
+    characters = list(ResourcesManager.characters.keys())
+
+    if args.characters is not None:
+        for name in args.characters:
+            if name not in characters:
+                parser.error("Unknown character {}, available characters: {}".format(name, ", ".join(characters)))
+
+    # the characters are loaded on first use, the ones that can be picked are loaded here so that the matches are
+    # timed without their loading
+    start = time.perf_counter()
+    for name in set(args.characters or characters):
+        ResourcesManager.characters[name].load()
+    loading_time = time.perf_counter() - start
+
+    total_ticks = 0
+    simulated_time = 0.0
+    wins = {}
+    draws = 0
+    dispatch_hits = 0
+    dispatch_misses = 0
+
+    start = time.perf_counter()
+    for _ in range(args.matches):
+        if scripts is not None:
+            inputs1, inputs2 = scripts["player1"], scripts["player2"]
+            inputs1.reset()
+            inputs2.reset()
+        else:
+            inputs1 = RandomInputSource(random.Random(rng.random()))
+            inputs2 = RandomInputSource(random.Random(rng.random()))
+
+        character1, character2 = args.characters or (rng.choice(characters), rng.choice(characters))
+
+        match = HeadlessMatch(character1, character2, inputs1, inputs2,
+                              tick_rate=args.tick_rate, max_duration=args.max_duration,
+                              rng=random.Random(rng.random()))
+        result = match.run()
+
+        total_ticks += result.ticks
+        dispatch_hits += match.level.dispatch_stats.hits
+        dispatch_misses += match.level.dispatch_stats.misses
+        simulated_time += result.duration
+        if result.is_draw:
+            draws += 1
+        else:
+            winner = result.player1_character if result.winner == match.player1.name else result.player2_character
+            wins[winner] = wins.get(winner, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print("Assets loaded in {:.2f}s".format(loading_time))
+    print("{} matches, {} ticks, {:.1f}s simulated in {:.2f}s".format(args.matches, total_ticks, simulated_time, elapsed))
+    print("Matches per second: {:.2f}".format(args.matches / elapsed))
+    print("Ticks per second: {:.0f}".format(total_ticks / elapsed))
+    print("Faster than real time: {:.1f}x".format(simulated_time / elapsed))
+    print("Collision dispatch lookups: {} hits, {} misses".format(dispatch_hits, dispatch_misses))
+    pool_hits = pool_misses = 0
+    for name in characters:
+        character_factory = ResourcesManager.characters[name]
+        if not character_factory.is_loaded:
+            continue
+        for attack_factory in (character_factory.primary_attack_factory, character_factory.secondary_attack_factory):
+            pool_hits += attack_factory.pool_stats.hits
+            pool_misses += attack_factory.pool_stats.misses
+    print("Attack pool: {} reused, {} allocated".format(pool_hits, pool_misses))
+    print("Draws: {}".format(draws))
+    for name, count in sorted(wins.items(), key=lambda item: -item[1]):
+        print("{} wins: {}".format(name, count))
@@ -1,14 +1,87 @@
+import re
 import subprocess
 import sys
+from typing import List, Optional, Tuple
 
 REQUIRED_PYTHON_VERSION_MAJOR = 3
 REQUIRED_PYTHON_VERSION_MINOR = 7
 
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:(==|>=|<=|!=|~=|>|<)\s*([^\s;,]+))?")
 
-def setup_environment(requirements_path):
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    """Release part of a version, e.g. "2.6.1.dev3" -> (2, 6, 1)"""
+    release = []
+    for part in version.split("."):
+        match = re.match(r"\d+", part)
+        if match is None:
+            break
+        release.append(int(match.group()))
+        if match.end() != len(part):
+            break
+    return tuple(release)
+
+
+def version_matches(installed: str, operator: str, required: str) -> bool:
+    installed_version, required_version = parse_version(installed), parse_version(required)
+    length = max(len(installed_version), len(required_version))
+    installed_version += (0,) * (length - len(installed_version))
+    required_version += (0,) * (length - len(required_version))
+    if operator == "==":
+        return installed_version == required_version
+    if operator == "!=":
+        return installed_version != required_version
+    if operator == ">=":
+        return installed_version >= required_version
+    if operator == "<=":
+        return installed_version <= required_version
+    if operator == ">":
+        return installed_version > required_version
+    if operator == "<":
+        return installed_version < required_version
+    # ~=: same release series, at least the required version
+    series = parse_version(required)[:-1]
+    return installed_version >= required_version and installed_version[:len(series)] == series
+
+
+def installed_version(package: str) -> Optional[str]:
+    try:
+        from importlib import metadata
+    except ImportError:
+        # Python 3.7
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            try:
+                import pkg_resources
+                return pkg_resources.get_distribution(package).version
+            except Exception:
+                return None
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def missing_requirements(requirements_path: str) -> List[str]:
+    """Requirements not installed or whose installed version does not match, without starting pip."""
+    missing = []
+    with open(requirements_path, 'r') as requirements_file:
+        for line in requirements_file:
+            requirement = line.split("#", 1)[0].strip()
+            match = _REQUIREMENT.match(requirement)
+            if match is None:
+                continue
+            package, operator, version = match.groups()
+            installed = installed_version(package)
+            if installed is None or (operator is not None and not version_matches(installed, operator, version)):
+                missing.append(requirement)
+    return missing
+
+
+def setup_environment(requirements_path, force_install=False):
     # Checking Python version
     python_version = sys.version_info
-    print("Python Version Installed: {0}.{1}".format(python_version.major, python_version.minor))
 
     if python_version.major < REQUIRED_PYTHON_VERSION_MAJOR or \
        (python_version.major == REQUIRED_PYTHON_VERSION_MAJOR and python_version.minor < REQUIRED_PYTHON_VERSION_MINOR):
@@ -17,12 +90,17 @@ def setup_environment(requirements_path):
                 .format(REQUIRED_PYTHON_VERSION_MAJOR, REQUIRED_PYTHON_VERSION_MINOR)
         )
 
-    def install_packages(package):
-        print("Installing {}" .format(package))
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
+    if force_install:
+        with open(requirements_path, 'r') as requirements_file:
+            packages = [line.strip() for line in requirements_file if line.strip()]
+    else:
+        packages = missing_requirements(requirements_path)
 
-    with open(requirements_path, 'r') as requirements_file:
-        for dep in requirements_file:
-            install_packages(dep.strip())
+    if not packages:
+        return
+
+    print("Python Version Installed: {0}.{1}".format(python_version.major, python_version.minor))
+    print("Installing {}".format(", ".join(packages)))
+    subprocess.check_call([sys.executable, '-m', 'pip', 'install'] + packages)
 
-    print("All the packages are installed successfully.")
\ No newline at end of file
+    print("All the packages are installed successfully.")
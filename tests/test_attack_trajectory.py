@@ -0,0 +1,71 @@
+import pytest
+
+from entities.attack_trajectory import AttackTimeline, AttackTrajectory
+from resources.stats_loader import AttackFrame
+
+
+def make_timeline():
+    # segments end at 50, 100, 130 and 200 ms
+    return AttackTimeline([
+        AttackFrame(50, (10, 10), (5, 0)),
+        AttackFrame(50, (20, 10), (10, -5)),
+        AttackFrame(30, (30, 10), (15, -10)),
+        AttackFrame(70, (40, 10), (20, -15)),
+    ])
+
+
+@pytest.mark.parametrize("time_ms, segment", [
+    (0, 0), (49.999, 0), (50, 1), (99.999, 1), (100, 2), (129.999, 2), (130, 3), (199.999, 3), (200, 4), (1000, 4),
+])
+def test_segment_boundaries(time_ms, segment):
+    assert make_timeline().segment_at(time_ms) == segment
+
+
+def test_rect_past_the_end_is_the_last_one():
+    timeline = make_timeline()
+    assert timeline.duration == 200
+    assert timeline.rect_at(200) == timeline.rect(3)
+    assert timeline.rect(3).size == (40, 10)
+    assert timeline.rect(3, reversed=True).topleft == (-20, -15)
+
+
+def test_update_skipping_several_segments():
+    trajectory = AttackTrajectory(make_timeline())
+    trajectory.update(0.010)
+    assert trajectory.current_segment == 0
+
+    # 10 ms + 125 ms: segments 1 and 2 are skipped over
+    trajectory.update(0.125)
+    assert trajectory.elapsed_time == pytest.approx(135)
+    assert trajectory.current_segment == 3
+    assert trajectory.hitbox().size == (40, 10)
+    assert not trajectory.is_complete()
+
+
+def test_complete_at_the_end_time():
+    trajectory = AttackTrajectory(make_timeline())
+    trajectory.seek(199.5)
+    assert not trajectory.is_complete()
+    trajectory.seek(200)
+    assert trajectory.is_complete()
+    assert trajectory.hitbox() == make_timeline().rect(3)
+
+    trajectory.update(0.5)
+    assert trajectory.is_complete()
+
+
+def test_seek_backwards_and_reset():
+    trajectory = AttackTrajectory(make_timeline())
+    trajectory.seek(250)
+    trajectory.seek(60)
+    assert trajectory.current_segment == 1 and not trajectory.is_complete()
+    trajectory.seek(-10)
+    assert trajectory.elapsed_time == 0 and trajectory.current_segment == 0
+    trajectory.seek(120)
+    trajectory.reset()
+    assert trajectory.elapsed_time == 0 and trajectory.current_segment == 0
+
+
+def test_empty_timeline_is_rejected():
+    with pytest.raises(ValueError):
+        AttackTimeline([])
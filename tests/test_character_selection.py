@@ -0,0 +1,59 @@
+import threading
+
+import pygame
+import pytest
+
+from resources.loading_pool import LoadingPool
+from resources.resources_manager import ResourcesManager
+
+
+def test_discard_cancels_the_assets_not_started():
+    pool = LoadingPool(1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    try:
+        pool.submit("first", blocking)
+        pool.submit("second", lambda: "second")
+        started.wait(5)
+        pool.discard(["second", "unknown"])
+        assert "second" not in pool and "first" in pool
+        release.set()
+        assert pool.result("first") == "first"
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.fixture
+def selection():
+    from render.character_selection import CharacterSelectionScene
+    pygame.init()
+    scene = CharacterSelectionScene(pygame.display.set_mode((640, 480)))
+    scene._loading_pool = LoadingPool(2)
+    yield scene
+    scene._loading_pool.discard_pending()
+    scene._loading_pool.shutdown()
+
+
+def test_prefetch_drops_the_characters_not_highlighted_anymore(selection):
+    unloaded = [i for i, name in enumerate(selection.characters) if not ResourcesManager.characters[name].is_loaded]
+    if len(unloaded) < 2:
+        pytest.skip("needs two characters not loaded by the other tests")
+    first, second = unloaded[:2]
+    pool = selection._loading_pool
+
+    selection.selected_character1 = selection.selected_character2 = first
+    selection.prefetch_selection()
+    first_sheets = selection._prefetched[selection.characters[first]]
+    assert first_sheets and all(name in pool for name in first_sheets)
+
+    selection.selected_character1 = selection.selected_character2 = second
+    selection.prefetch_selection()
+    assert list(selection._prefetched) == [selection.characters[second]]
+    assert not any(name in pool for name in first_sheets)
+    assert all(name in pool for name in selection._prefetched[selection.characters[second]])
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import pygame
+import pytest
+
+from resources.frame_cache import FrameCache
+
+
+@pytest.fixture
+def sheet(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = tmp_path / "sheet.png"
+    path.write_bytes(b"sheet")
+    return str(path)
+
+
+def make_frames():
+    frames = []
+    for i in range(3):
+        image = pygame.Surface((4 + i, 6), pygame.SRCALPHA)
+        image.fill((10 * i, 20, 30, 255))
+        image.set_at((0, 0), (1, 2, 3, 128))
+        image.set_at((1, 0), (0, 0, 0, 0))
+        frames.append((image, (i, 2 * i)))
+    return frames
+
+
+def cached_files():
+    return sorted(path.name for path in FrameCache.directory().glob("*.frames"))
+
+
+def test_store_then_load_gives_the_same_frames(sheet):
+    frames = make_frames()
+    FrameCache.store(sheet, (16, 16), 2, True, frames, (3, -1))
+
+    loaded = FrameCache.load(sheet, (16, 16), 2, True)
+    assert loaded is not None
+    loaded_frames, anchor_offset = loaded
+    assert anchor_offset == (3, -1)
+    assert [offset for _, offset in loaded_frames] == [offset for _, offset in frames]
+    for (image, _), (loaded_image, _) in zip(frames, loaded_frames):
+        assert loaded_image.get_size() == image.get_size()
+        assert pygame.image.tobytes(loaded_image, "RGBA") == pygame.image.tobytes(image, "RGBA")
+
+
+def test_other_keys_miss(sheet):
+    FrameCache.store(sheet, (16, 16), 2, False, make_frames())
+
+    assert FrameCache.load(sheet, (16, 16), 3, False) is None
+    assert FrameCache.load(sheet, (16, 16), 2, True) is None
+    assert FrameCache.load(sheet, (8, 16), 2, False) is None
+
+
+def test_store_removes_the_outdated_files_of_the_sheet(sheet):
+    FrameCache.store(sheet, (16, 16), 2, False, make_frames())
+    # another scale of the same sheet stays valid
+    FrameCache.store(sheet, (16, 16), 3, False, make_frames())
+    outdated = FrameCache.cache_path(sheet, (16, 16), 2)
+    other_scale = FrameCache.cache_path(sheet, (16, 16), 3)
+
+    stat = os.stat(sheet)
+    os.utime(sheet, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert FrameCache.load(sheet, (16, 16), 2, False) is None
+    FrameCache.store(sheet, (16, 16), 2, False, make_frames())
+
+    assert not outdated.exists()
+    assert cached_files() == sorted([FrameCache.cache_path(sheet, (16, 16), 2).name, other_scale.name])
+    assert FrameCache.load(sheet, (16, 16), 2, False) is not None
+
+
+def test_concurrent_stores_leave_a_complete_file(sheet):
+    frames = make_frames()
+    threads = [threading.Thread(target=FrameCache.store, args=(sheet, (16, 16), 2, False, frames))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cached_files() == [FrameCache.cache_path(sheet, (16, 16), 2).name]
+    assert not list(FrameCache.directory().glob("*.tmp"))
+    loaded_frames, _ = FrameCache.load(sheet, (16, 16), 2, False)
+    assert len(loaded_frames) == len(frames)
@@ -0,0 +1,182 @@
+import itertools
+import random
+
+import pygame
+from pygame import Rect, Vector2
+
+from collisions.collision_layers import CollisionLayer
+from collisions.spatial_hash import SpatialHash
+from entities.entity import Entity
+from level import Level
+from utils.multi_dispatcher import MultiDispatcher
+
+
+class Probe(Entity):
+
+    def __init__(self, level, name, rect, category=CollisionLayer.DEFAULT, mask=CollisionLayer.ALL, team=None):
+        super().__init__(level)
+        self.name = name
+        self.collision_category = int(category)
+        self.collision_mask = int(mask)
+        self.friendly_obj = team
+        self.box.x, self.box.y, self.box.width, self.box.height = rect
+
+    @property
+    def image(self) -> pygame.Surface:
+        return pygame.Surface((1, 1))
+
+    def __repr__(self):
+        return self.name
+
+
+def make_level(cell_size=64):
+    dispatched = []
+    builder = MultiDispatcher.MultiDispatcherBuilder()
+
+    def on_collision(source: Probe, target: Probe):
+        dispatched.append((source.name, target.name))
+    builder.register(on_collision)
+
+    level = Level(builder.build(), None, [Vector2(0, 0)], 1000, 1000, 0, 1000, broadphase=SpatialHash(cell_size))
+    return level, dispatched
+
+
+def collide(level):
+    level._update_broadphase()
+    level._handle_collisions()
+
+
+def brute_force_collisions(entities):
+    """Every ordered pair of the O(n²) comparisons, sources in insertion order, targets nearest edge first."""
+    order = {entity: i for i, entity in enumerate(entities)}
+    collisions = []
+    for source in entities:
+        rect = source.rect.copy()
+        targets = [
+            target for target in entities
+            if target is not source
+            and rect.colliderect(target.rect)
+            and source.collision_mask & target.collision_category
+            and target.collision_mask & source.collision_category
+            and (source.friendly_obj is None or source.friendly_obj != target.friendly_obj)
+        ]
+        targets.sort(key=lambda target: (Level._distance_to_nearest_edge(*rect.center, target.rect), order[target]))
+        collisions.extend((source.name, target.name) for target in targets)
+    return collisions
+
+
+def test_collision_order_matches_brute_force():
+    rng = random.Random(2)
+    level, dispatched = make_level()
+    entities = []
+    for i in range(80):
+        rect = (rng.uniform(0, 400), rng.uniform(0, 400), rng.randint(5, 150), rng.randint(5, 150))
+        entities.append(Probe(level, "e{}".format(i), rect))
+    level.add_entity(*entities)
+
+    collide(level)
+
+    assert dispatched
+    assert len(dispatched) == len(set(dispatched))
+    assert dispatched == brute_force_collisions(entities)
+
+
+def test_collision_order_after_moves_matches_brute_force():
+    rng = random.Random(3)
+    level, dispatched = make_level(cell_size=32)
+    entities = [Probe(level, "e{}".format(i), (rng.uniform(0, 300), rng.uniform(0, 300), 40, 60)) for i in range(40)]
+    level.add_entity(*entities)
+    collide(level)
+
+    for entity in itertools.islice(entities, 0, None, 2):
+        entity.box.x += rng.uniform(-80, 80)
+        entity.box.y += rng.uniform(-80, 80)
+    dispatched.clear()
+    collide(level)
+
+    assert dispatched == brute_force_collisions(entities)
+
+
+def test_touching_rects_do_not_collide():
+    level, dispatched = make_level()
+    level.add_entity(Probe(level, "a", (0, 0, 64, 10)), Probe(level, "b", (64, 0, 10, 10)))
+
+    collide(level)
+
+    assert dispatched == []
+
+
+def test_get_entities_in_keeps_insertion_order():
+    level, _ = make_level(cell_size=16)
+    entities = [Probe(level, "e{}".format(i), (100 - i * 10, 0, 20, 20)) for i in range(5)]
+    level.add_entity(*entities)
+    level._update_broadphase()
+
+    assert level.get_entities_in(Rect(0, 0, 200, 50)) == entities
+
+
+def test_targets_nearest_edge_first_then_insertion_order():
+    level, dispatched = make_level()
+    source = Probe(level, "source", (0, 0, 200, 20))
+    # centers at 95, 20, 50 and 50 pixels of the center of source
+    far = Probe(level, "far", (3, 8, 4, 4))
+    near = Probe(level, "near", (118, 8, 4, 4))
+    tie_a = Probe(level, "tie_a", (48, 8, 4, 4))
+    tie_b = Probe(level, "tie_b", (148, 8, 4, 4))
+    level.add_entity(source, far, tie_b, near, tie_a)
+
+    collide(level)
+
+    assert [target for name, target in dispatched if name == "source"] == ["near", "tie_b", "tie_a", "far"]
+    # sources in the order of get_entities
+    assert [name for name, _ in dispatched] == sorted((name for name, _ in dispatched),
+                                                      key=["source", "far", "tie_b", "near", "tie_a"].index)
+
+
+def test_category_mask_and_team_filtering():
+    level, dispatched = make_level()
+    character = Probe(level, "character", (0, 0, 50, 50), category=CollisionLayer.CHARACTER)
+    ally_attack = Probe(level, "ally_attack", (10, 10, 20, 20), category=CollisionLayer.ATTACK,
+                        mask=CollisionLayer.CHARACTER | CollisionLayer.ATTACK, team=character)
+    enemy_attack = Probe(level, "enemy_attack", (20, 20, 20, 20), category=CollisionLayer.ATTACK,
+                         mask=CollisionLayer.CHARACTER, team="enemy")
+    ally_attack_2 = Probe(level, "ally_attack_2", (0, 0, 10, 10), category=CollisionLayer.ATTACK,
+                          mask=CollisionLayer.CHARACTER | CollisionLayer.ATTACK, team=character)
+    decoration = Probe(level, "decoration", (0, 0, 50, 50), mask=CollisionLayer.NONE)
+    level.add_entity(character, ally_attack, enemy_attack, ally_attack_2, decoration)
+
+    collide(level)
+
+    pairs = set(dispatched)
+    # both directions of a pair are dispatched
+    assert ("character", "enemy_attack") in pairs and ("enemy_attack", "character") in pairs
+    # ATTACK is in the mask of ally_attack but not in the one of enemy_attack
+    assert ("ally_attack", "enemy_attack") not in pairs
+    # same team
+    assert ("ally_attack", "ally_attack_2") not in pairs
+    # friendly_obj of the character is None, its own attacks only share a team with each other
+    assert ("character", "ally_attack") in pairs
+    assert not any("decoration" in pair for pair in pairs)
+
+
+def test_destroyed_targets_are_skipped_and_destroyed_sources_still_dispatch():
+    dispatched = []
+    builder = MultiDispatcher.MultiDispatcherBuilder()
+
+    def on_collision(source: Probe, target: Probe):
+        dispatched.append((source.name, target.name))
+        if target.name == "first":
+            # as an attack destroyed when it hits
+            target.destroy()
+            source.destroy()
+    builder.register(on_collision)
+    level = Level(builder.build(), None, [Vector2(0, 0)], 1000, 1000, 0, 1000)
+    source = Probe(level, "source", (0, 0, 20, 20))
+    first = Probe(level, "first", (5, 5, 10, 10))
+    second = Probe(level, "second", (15, 15, 20, 20))
+    level.add_entity(source, first, second)
+
+    collide(level)
+
+    # like the per entity sprite collisions, only the destroyed targets are skipped
+    assert dispatched == [("source", "first"), ("source", "second")]
@@ -0,0 +1,126 @@
+import itertools
+
+from utils.multi_dispatcher import MultiDispatcher
+
+
+class A:
+    pass
+
+
+class B(A):
+    pass
+
+
+class C(B):
+    pass
+
+
+class D(A):
+    pass
+
+
+class Other:
+    pass
+
+
+def on_a_a(first: A, second: A):
+    pass
+
+
+def on_b_a(first: B, second: A):
+    pass
+
+
+def on_a_d(first: A, second: D):
+    pass
+
+
+def on_c_c(first: C, second: C):
+    pass
+
+
+def on_other(value: Other):
+    pass
+
+
+def make_dispatcher(*handlers):
+    builder = MultiDispatcher.MultiDispatcherBuilder()
+    for handler in handlers or (on_a_a, on_b_a, on_a_d, on_c_c, on_other):
+        builder.register(handler)
+    return builder.build()
+
+
+TYPES = (A, B, C, D, Other, object)
+
+
+def slow_path(dispatcher, *types):
+    return list(dispatcher._resolve_uncached(types))
+
+
+def test_frozen_tables_resolve_like_the_slow_path():
+    dispatcher = make_dispatcher()
+    expected = {
+        types: slow_path(dispatcher, *types)
+        for arity in (1, 2) for types in itertools.product(TYPES, repeat=arity)
+    }
+
+    dispatcher.freeze(C, D)
+    assert dispatcher.frozen
+    for types, handlers in expected.items():
+        assert list(dispatcher.resolve(*types)) == handlers, types
+
+
+def test_frozen_tables_are_used_for_known_types():
+    dispatcher = make_dispatcher().freeze(C, D)
+    assert list(dispatcher.resolve(C, D)) == [on_b_a, on_a_d]
+    assert list(dispatcher.resolve(D, D)) == [on_a_d]
+    assert dispatcher._cache == {}
+    assert dispatcher.stats.hits == 2 and dispatcher.stats.misses == 0
+
+
+def test_type_unknown_to_freeze_goes_through_the_slow_path():
+    class E(C):
+        pass
+
+    dispatcher = make_dispatcher().freeze(D)
+    assert list(dispatcher.resolve(E, E)) == slow_path(dispatcher, E, E) == [on_c_c]
+    assert list(dispatcher.resolve(E, D)) == slow_path(dispatcher, E, D)
+    assert dispatcher.stats.misses == 2
+    # cached afterwards
+    dispatcher.resolve(E, E)
+    assert dispatcher.stats.misses == 2
+
+
+def test_handler_registered_after_freeze_is_dispatched():
+    class E(C):
+        pass
+
+    def on_e_d(first: E, second: D):
+        pass
+
+    dispatcher = make_dispatcher().freeze(C, D)
+    assert list(dispatcher.resolve(C, D)) == [on_b_a, on_a_d]
+
+    dispatcher._register(on_e_d)
+    assert not dispatcher.frozen
+    assert list(dispatcher.resolve(E, D)) == [on_e_d]
+
+    dispatcher.freeze(C, D)
+    for types in itertools.product(TYPES + (E,), repeat=2):
+        assert list(dispatcher.resolve(*types)) == slow_path(dispatcher, *types), types
+
+
+def test_dispatch_calls_every_handler():
+    calls = []
+
+    def on_a(value: A):
+        calls.append(("a", value))
+
+    def on_a_again(value: A):
+        calls.append(("again", value))
+
+    dispatcher = make_dispatcher(on_a, on_a_again).freeze(B)
+    value = B()
+    dispatcher.dispatch_no_collect(value)
+    dispatcher.dispatch_no_collect(Other())
+    assert calls == [("a", value), ("again", value)]
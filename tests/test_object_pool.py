@@ -0,0 +1,115 @@
+import gc
+import weakref
+
+import pygame
+from pygame import Rect, Vector2
+
+from collisions.spatial_hash import SpatialHash
+from entities.animation import Animation
+from entities.attack_trajectory import AttackTimeline
+from entities.entity import Entity
+from level import Level
+from resources.attack_loader import AttackTrajectoryFactory, MeleeAttackFactory
+from resources.stats_loader import AttackFrame
+from utils.multi_dispatcher import MultiDispatcher
+from utils.object_pool import ObjectPool
+
+
+class Owner(Entity):
+
+    def __init__(self, level):
+        super().__init__(level)
+        self.box.width = self.box.height = 10
+
+    @property
+    def image(self) -> pygame.Surface:
+        return pygame.Surface((1, 1))
+
+
+class Team:
+    pass
+
+
+def make_level():
+    dispatcher = MultiDispatcher.MultiDispatcherBuilder().build()
+    return Level(dispatcher, None, [Vector2(0, 0)], 1000, 1000, 0, 1000, broadphase=SpatialHash())
+
+
+def make_factory(pool_size=8):
+    timeline = AttackTimeline([AttackFrame(50, (4, 4), (2, 0)), AttackFrame(50, (6, 6), (3, 0))])
+    return MeleeAttackFactory(AttackTrajectoryFactory(timeline), Animation([pygame.Surface((4, 4))], 0.1), 10, 5,
+                              name="punch", pool_size=pool_size)
+
+
+def test_acquire_reuses_released_objects():
+    created = []
+    resets = []
+    pool = ObjectPool(lambda value: created.append(value) or [value], lambda obj, value: resets.append(value),
+                      max_size=1)
+
+    first = pool.acquire(1)
+    assert (pool.stats.misses, pool.stats.hits, pool.stats.in_use) == (1, 0, 1)
+    pool.release(first)
+    assert len(pool) == 1 and pool.stats.in_use == 0
+
+    assert pool.acquire(2) is first
+    assert created == [1] and resets == [2]
+    second = pool.acquire(3)
+    assert second is not first
+    assert (pool.stats.misses, pool.stats.hits, pool.stats.high_water_mark) == (2, 1, 2)
+
+    pool.release(first)
+    pool.release(second)
+    assert len(pool) == 1 and pool.stats.discarded == 1 and pool.stats.in_use == 0
+
+
+def test_reused_attack_has_a_new_generation():
+    level = make_level()
+    owner = Owner(level)
+    factory = make_factory()
+
+    attack = factory(level, owner, Team())
+    level.add_entity(attack)
+    generation = attack.generation
+    attack.destroy()
+    level.update(0.01)
+    assert factory.pool.stats.in_use == 0
+
+    reused = factory(level, owner, Team())
+    assert reused is attack
+    assert reused.generation == generation + 1
+    assert not reused.destroyed and reused.owner is owner and reused.level is level
+
+
+def test_released_attack_drops_its_owner():
+    level = make_level()
+    owner = Owner(level)
+    team = Team()
+    factory = make_factory()
+    attack = factory(level, owner, team)
+    level.add_entity(attack)
+    attack.destroy()
+    level.update(0.01)
+
+    owner_ref, team_ref, level_ref = weakref.ref(owner), weakref.ref(team), weakref.ref(level)
+    del owner, team, level
+    gc.collect()
+    assert len(factory.pool) == 1
+    assert owner_ref() is None and team_ref() is None and level_ref() is None
+
+
+def test_clearing_a_level_releases_its_running_attacks():
+    level = make_level()
+    owner = Owner(level)
+    factory = make_factory()
+    attacks = [factory(level, owner, Team()) for _ in range(3)]
+    level.add_entity(owner, *attacks)
+    level.update(0.01)
+    assert factory.pool.stats.in_use == 3
+
+    level.clear()
+
+    assert factory.pool.stats.in_use == 0
+    assert len(factory.pool) == 3
+    assert not list(level.get_entities())
+    assert all(attack.destroyed for attack in attacks)
@@ -0,0 +1,70 @@
+import random
+from types import SimpleNamespace
+
+import pygame
+import pytest
+from pygame import Vector2
+
+from render.camera import Camera
+from render.parallax_background import Layer, ParallaxBackground
+
+
+def noise(size, alpha, seed, alpha_values=(0, 96, 255)):
+    """Surface of random pixels, with transparent holes and the colorkey of TexturesLoader when alpha is set."""
+    rng = random.Random(seed)
+    surface = pygame.Surface(size, pygame.SRCALPHA if alpha else 0, 32)
+    for x in range(0, size[0], 3):
+        for y in range(0, size[1], 3):
+            color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.choice(alpha_values) if alpha else 255)
+            surface.fill(color, (x, y, 3, 3))
+    if alpha:
+        surface.set_colorkey((0, 0, 0, 0), pygame.RLEACCEL)
+    return surface
+
+
+def make_layers():
+    """Same kinds of layers as level_1: a slow opaque sky and two transparent layers moving with the entities."""
+    origin = Vector2(0, 0)
+    return [
+        Layer(origin, noise((700, 300), False, 1), 0.1, "sky"),
+        Layer(origin + Vector2(0, 40), noise((141, 130), True, 2), 1, "tree"),
+        Layer(origin, noise((56, 10), True, 3), 1, "grass"),
+        # without translucent pixels, merged with grass into one strip
+        Layer(origin, noise((28, 20), True, 4, alpha_values=(0, 255)), 1, "flowers"),
+        # translucent, a strip of its own
+        Layer(origin + Vector2(0, 10), noise((28, 16), True, 5), 1, "leaves"),
+    ]
+
+
+def render(use_strips, offsets, size=(294, 83)):
+    level = SimpleNamespace(origin=Vector2(0, 0), width=359.5, height=250)
+    background = ParallaxBackground(make_layers(), use_strips=use_strips)
+    display = pygame.Surface(size, 0, 32)
+    camera = Camera(display, (0, 0), size[0], size[1], level)
+    frames = []
+    for offset in offsets:
+        camera.offset = Vector2(offset)
+        camera.clear()
+        background.draw(camera)
+        frames.append(pygame.image.tobytes(display, "RGB"))
+    return frames
+
+
+@pytest.mark.parametrize("offset", [
+    (0, -83), (1, -83), (65.5, -83), (65.5, -90), (141, -100), (200.25, -83), (359.5 - 294, -83),
+])
+def test_strips_match_tiles(offset):
+    assert render(True, [offset]) == render(False, [offset])
+
+
+def test_strips_match_tiles_along_the_level():
+    offsets = [(x / 2, -83) for x in range(0, 2 * (360 - 294))]
+    assert render(True, offsets) == render(False, offsets)
+
+
+def test_only_layers_without_translucency_are_merged():
+    background = ParallaxBackground(make_layers())
+    level = SimpleNamespace(origin=Vector2(0, 0), width=359.5, height=250)
+    camera = Camera(pygame.Surface((294, 83), 0, 32), (0, 0), 294, 83, level)
+    strips = background._get_strips(camera.width)
+    assert [[layer.name for layer in strip.layers] for strip in strips] == [["sky"], ["tree"], ["grass", "flowers"], ["leaves"]]
@@ -0,0 +1,88 @@
+import random
+
+import pygame
+import pytest
+
+import key_bindings
+from resources.resources_manager import ResourcesManager
+
+
+@pytest.fixture
+def make_game():
+    """Game of Huntress against Wizard on a dummy display, with the given settings changed until the end of the test."""
+    pygame.init()
+    screen = pygame.display.set_mode((1176, 664))
+    games = []
+    previous_settings = {}
+
+    def make_game(**settings):
+        from game import Game
+        for key, value in settings.items():
+            previous_settings.setdefault(key, ResourcesManager.settings[key])
+            ResourcesManager.settings[key] = value
+        game = Game(screen, "Huntress", "Wizard", fps=0)
+        games.append(game)
+        return game
+
+    yield make_game
+    for game in games:
+        game._scene_stack[0].shutdown()
+    for key, value in previous_settings.items():
+        ResourcesManager.settings[key] = value
+
+
+def play(game, frames, seed=1):
+    """Random inputs for both players, yields after the update of each frame."""
+    rng = random.Random(seed)
+    scene = game._scene_stack[0]
+    for _ in range(frames):
+        for player in (game.player1, game.player2):
+            player.input(1 / 60, {command: rng.random() < 0.3 for command in key_bindings.Command})
+        game.level.update(1 / 60)
+        scene.update(1 / 60)
+        yield scene
+
+
+def test_parallel_viewports_draw_the_serial_pixels(make_game):
+    game = make_game(parallel_viewports=True)
+    pool = game._scene_stack[0]._viewport_pool
+    assert pool is not None
+    for scene in play(game, 60):
+        frames = []
+        for viewport_pool in (None, pool):
+            scene._viewport_pool = viewport_pool
+            scene.draw()
+            frames.append(pygame.image.tobytes(game.window, "RGB"))
+        assert frames[0] == frames[1]
+
+
+def test_shutdown_stops_the_viewport_worker(make_game):
+    game = make_game(parallel_viewports=True)
+    scene = game._scene_stack[0]
+    pool = scene._viewport_pool
+
+    scene.shutdown()
+
+    assert scene._viewport_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+    # drawn serially afterwards
+    scene.draw()
+
+
+@pytest.mark.parametrize("parallax_strips", [True, False])
+def test_shared_render_draws_the_independent_pixels(make_game, parallax_strips):
+    game = make_game(shared_camera_render=True, parallax_strips=parallax_strips)
+    x, y = game.player1.character.box.midbottom
+    # close enough for the views of both cameras to overlap
+    game.player2.character.box.midbottom = (x + 150, y)
+    shared_frames = 0
+    for scene in play(game, 60):
+        frames = []
+        for shared_render in (False, True):
+            scene._shared_render = shared_render
+            scene.draw()
+            frames.append(pygame.image.tobytes(game.window, "RGB"))
+        shared_frames += scene.shared_render_stats.shared
+        assert frames[0] == frames[1]
+    assert shared_frames > 0
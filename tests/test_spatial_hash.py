@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import pytest
+from pygame import Rect
+
+from collisions.spatial_hash import SpatialHash
+
+
+def brute_force_pairs(spatial_hash, rects):
+    """Pairs of objects sharing at least one cell, found by comparing the cell ranges of every pair."""
+    pairs = set()
+    for a, b in itertools.combinations(rects, 2):
+        ax0, ay0, ax1, ay1 = spatial_hash.cell_range(rects[a])
+        bx0, by0, bx1, by1 = spatial_hash.cell_range(rects[b])
+        if ax0 <= bx1 and bx0 <= ax1 and ay0 <= by1 and by0 <= ay1:
+            pairs.add(frozenset((a, b)))
+    return pairs
+
+
+def test_invalid_cell_size():
+    with pytest.raises(ValueError):
+        SpatialHash(0)
+
+
+def test_cell_range_right_and_bottom_are_exclusive():
+    spatial_hash = SpatialHash(100)
+    assert spatial_hash.cell_range(Rect(0, 0, 100, 100)) == (0, 0, 0, 0)
+    assert spatial_hash.cell_range(Rect(0, 0, 101, 100)) == (0, 0, 1, 0)
+    assert spatial_hash.cell_range(Rect(-1, -1, 2, 2)) == (-1, -1, 0, 0)
+
+
+def test_candidate_pairs_no_duplicates_across_cells():
+    spatial_hash = SpatialHash(10)
+    # both cover the same 5x5 cells
+    spatial_hash.insert("a", Rect(0, 0, 50, 50))
+    spatial_hash.insert("b", Rect(5, 5, 40, 40))
+    # covers 3x3 of the cells of a and b
+    spatial_hash.insert("c", Rect(25, 25, 30, 30))
+
+    pairs = list(spatial_hash.candidate_pairs())
+
+    assert len(pairs) == len(set(frozenset(pair) for pair in pairs))
+    assert set(frozenset(pair) for pair in pairs) == {frozenset("ab"), frozenset("ac"), frozenset("bc")}
+
+
+def test_candidate_pairs_straddling_cell_boundary():
+    spatial_hash = SpatialHash(100)
+    # left of the boundary at x = 100, only in cell 0
+    spatial_hash.insert("left", Rect(60, 10, 40, 20))
+    # straddles the boundary, in cells 0 and 1
+    spatial_hash.insert("straddling", Rect(90, 10, 20, 20))
+    # right of the boundary, only in cell 1
+    spatial_hash.insert("right", Rect(100, 10, 40, 20))
+
+    pairs = set(frozenset(pair) for pair in spatial_hash.candidate_pairs())
+
+    assert pairs == {frozenset(("left", "straddling")), frozenset(("straddling", "right"))}
+
+
+def test_candidate_pairs_after_update_and_remove():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.insert("a", Rect(0, 0, 5, 5))
+    spatial_hash.insert("b", Rect(50, 50, 5, 5))
+    assert list(spatial_hash.candidate_pairs()) == []
+
+    spatial_hash.update("b", Rect(8, 8, 5, 5))
+    assert set(frozenset(pair) for pair in spatial_hash.candidate_pairs()) == {frozenset("ab")}
+
+    spatial_hash.remove("a")
+    assert list(spatial_hash.candidate_pairs()) == []
+    assert "a" not in spatial_hash
+    assert len(spatial_hash) == 1
+
+
+def test_candidate_pairs_match_brute_force():
+    rng = random.Random(1)
+    spatial_hash = SpatialHash(32)
+    rects = {}
+    for i in range(120):
+        rects[i] = Rect(rng.randint(-200, 200), rng.randint(-200, 200), rng.randint(1, 100), rng.randint(1, 100))
+        spatial_hash.insert(i, rects[i])
+    # moving some objects exercises update as well
+    for i in range(0, 120, 3):
+        rects[i] = rects[i].move(rng.randint(-50, 50), rng.randint(-50, 50))
+        spatial_hash.update(i, rects[i])
+
+    pairs = list(spatial_hash.candidate_pairs())
+
+    assert len(pairs) == len(set(frozenset(pair) for pair in pairs))
+    assert set(frozenset(pair) for pair in pairs) == brute_force_pairs(spatial_hash, rects)
+
+
+def test_query_yields_each_object_once():
+    spatial_hash = SpatialHash(10)
+    spatial_hash.insert("a", Rect(0, 0, 50, 50))
+    spatial_hash.insert("b", Rect(100, 100, 5, 5))
+
+    assert list(spatial_hash.query(Rect(0, 0, 30, 30))) == ["a"]
+    assert sorted(spatial_hash.query(Rect(0, 0, 110, 110))) == ["a", "b"]
@@ -1,9 +1,32 @@
+import itertools
 import typing
 from typing import TypeVar, Callable, Iterable, Any, Dict, List, Tuple
 
 TResult = TypeVar('TResult')
 
 
+class DispatchStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups > 0 else 0.0
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return "DispatchStats(hits={}, misses={}, hit_rate={:.2%})".format(self.hits, self.misses, self.hit_rate)
+
+
 class MultiDispatcher(typing.Generic[TResult]):
     _MAX_INHERITANCE_DISTANCE = 2 ** 32 - 1
     _EMPTY_TUPLE = ()
@@ -11,6 +34,19 @@ class MultiDispatcher(typing.Generic[TResult]):
     def __init__(self):
         self._registry = {}
         self._cache = {}
+        self._stats = DispatchStats()
+        # Filled by freeze: small integer id of each known type and, per arity, a dense table of the handlers
+        # indexed by the ids of the argument types
+        self._type_ids = {}  # type: Dict[type, int]
+        self._tables = {}  # type: Dict[int, List[Tuple[Callable, ...]]]
+
+    @property
+    def stats(self) -> DispatchStats:
+        return self._stats
+
+    @property
+    def frozen(self) -> bool:
+        return len(self._type_ids) > 0
 
     def _register(self, fn):
         type_hints = typing.get_type_hints(fn)
@@ -20,6 +56,35 @@ class MultiDispatcher(typing.Generic[TResult]):
         if self._registry.get(types) is None:
             self._registry[types] = []
         self._registry[types].append(fn)
+        self._cache.clear()
+        self._unfreeze()
+
+    def freeze(self, *types: type) -> 'MultiDispatcher[TResult]':
+        """
+        Precomputes the handlers of every combination of the registered types and of the given types
+        (usually the concrete types that will be dispatched). Afterwards resolving known types is a single list
+        lookup. Unknown types still work through the slower cached path.
+        """
+        known_types = []
+        for t in itertools.chain((t for key in self._registry for t in key), types):
+            if t not in known_types:
+                known_types.append(t)
+
+        type_ids = {t: i for i, t in enumerate(known_types)}
+        tables = {}
+        for arity in {len(key) for key in self._registry}:
+            tables[arity] = [
+                tuple(self._resolve_uncached(combination))
+                for combination in itertools.product(known_types, repeat=arity)
+            ]
+
+        self._type_ids = type_ids
+        self._tables = tables
+        return self
+
+    def _unfreeze(self):
+        self._type_ids = {}
+        self._tables = {}
 
     def dispatch(self, *args):
         actions = self.resolve(
@@ -38,20 +103,37 @@ class MultiDispatcher(typing.Generic[TResult]):
             action(*args)
 
     def resolve(self, *types):
+        table = self._tables.get(len(types))
+        if table is not None:
+            type_ids = self._type_ids
+            index = 0
+            for t in types:
+                type_id = type_ids.get(t)
+                if type_id is None:
+                    break
+                index = index * len(type_ids) + type_id
+            else:
+                self._stats.hits += 1
+                return table[index]
+
         actions = self._cache.get(types)
         if actions is not None:
+            self._stats.hits += 1
             return actions
 
+        self._stats.misses += 1
+        actions = self._resolve_uncached(types)
+        self._cache[types] = actions
+
+        return actions
+
+    def _resolve_uncached(self, types):
         best_match_keys = self._find_best_match_keys(*types)
 
         if len(best_match_keys) == 0:
             return self._EMPTY_TUPLE
 
-        actions = [item for key in best_match_keys for item in self._registry[key]]
-
-        self._cache[types] = actions
-
-        return actions
+        return [item for key in best_match_keys for item in self._registry[key]]
 
     def _find_best_match_keys(self, *types):
         potential_keys = []
@@ -70,22 +152,20 @@ class MultiDispatcher(typing.Generic[TResult]):
         matches_with_distance = [(key, sum([self.get_inheritance_distance(t, k) for (t, k) in zip(types, key)])) for key
                                  in potential_keys]
 
+        # A key is discarded when a comparable key (every type related by inheritance) is strictly closer
+        discarded = set()
         for ts1, d1 in matches_with_distance:
             for ts2, d2 in matches_with_distance:
-                if len(ts1) != len(ts2):
-                    continue
-                if ts1 == ts2:
+                if ts1 == ts2 or d2 >= d1:
                     continue
                 for t1, t2 in zip(ts1, ts2):
                     if not (issubclass(t1, t2) or issubclass(t2, t1)):
                         break
                 else:
-                    if d1 < d2:
-                        matches_with_distance.remove((ts2, d2))
-                    elif d2 < d1:
-                        matches_with_distance.remove((ts1, d1))
+                    discarded.add(ts1)
+                    break
 
-        return [key for (key, distance) in matches_with_distance]
+        return [key for (key, distance) in matches_with_distance if key not in discarded]
 
     @staticmethod
     def get_inheritance_distance(actual_type, registered_type):
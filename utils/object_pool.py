@@ -0,0 +1,69 @@
+from typing import Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class PoolStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.high_water_mark = 0
+
+    def __repr__(self):
+        return "PoolStats(hits={}, misses={}, discarded={}, in_use={}, high_water_mark={})".format(
+            self.hits, self.misses, self.discarded, self.in_use, self.high_water_mark
+        )
+
+
+class ObjectPool(Generic[T]):
+    """
+    Keeps released objects to reuse them instead of allocating new ones.
+    create(*args) builds a new object when the pool is empty, reset(obj, *args) prepares a reused one.
+    At most max_size released objects are kept, the others are left to the garbage collector.
+    """
+
+    def __init__(self, create: Callable[..., T], reset: Callable[..., None], max_size: int = 16):
+        self._create = create
+        self._reset = reset
+        self._max_size = max_size
+        self._free = []  # type: List[T]
+        self._stats = PoolStats()
+
+    @property
+    def stats(self) -> PoolStats:
+        return self._stats
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int):
+        self._max_size = value
+        del self._free[max(0, value):]
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self, *args) -> T:
+        if self._free:
+            obj = self._free.pop()
+            self._reset(obj, *args)
+            self._stats.hits += 1
+        else:
+            obj = self._create(*args)
+            self._stats.misses += 1
+        self._stats.in_use += 1
+        if self._stats.in_use > self._stats.high_water_mark:
+            self._stats.high_water_mark = self._stats.in_use
+        return obj
+
+    def release(self, obj: T) -> None:
+        self._stats.in_use -= 1
+        if len(self._free) < self._max_size:
+            self._free.append(obj)
+        else:
+            self._stats.discarded += 1
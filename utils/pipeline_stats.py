@@ -0,0 +1,68 @@
+import time
+from typing import List, Tuple
+
+Interval = Tuple[float, float]
+
+
+class PipelineStats:
+    """
+    Busy intervals of the simulation and render threads of the pipelined mode and the latency of each frame, from the
+    reading of the inputs to the presentation of the frame drawn from them.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        # each list is only appended to by one thread
+        self._simulation = []  # type: List[Interval]
+        self._render = []  # type: List[Interval]
+        self._latencies = []  # type: List[float]
+        self._ticks = 0
+
+    def record_simulation(self, start: float, end: float, ticks: int) -> None:
+        self._simulation.append((start, end))
+        self._ticks += ticks
+
+    def record_frame(self, start: float, end: float, input_time: float) -> None:
+        self._render.append((start, end))
+        self._latencies.append(end - input_time)
+
+    @staticmethod
+    def _busy(intervals: List[Interval]) -> float:
+        return sum(end - start for start, end in intervals)
+
+    def overlap(self) -> float:
+        """Seconds during which both threads were busy."""
+        overlap = 0.0
+        simulation, render = self._simulation, self._render
+        i = j = 0
+        while i < len(simulation) and j < len(render):
+            start = max(simulation[i][0], render[j][0])
+            end = min(simulation[i][1], render[j][1])
+            if end > start:
+                overlap += end - start
+            if simulation[i][1] < render[j][1]:
+                i += 1
+            else:
+                j += 1
+        return overlap
+
+    def report(self) -> str:
+        wall = time.perf_counter() - self._start
+        simulation, render = self._busy(self._simulation), self._busy(self._render)
+        overlap = self.overlap()
+        latencies = sorted(self._latencies)
+        lines = ["{:<24} {:>10}".format("pipeline", "value")]
+        lines.append("{:<24} {:>10.1f}".format("wall time (s)", wall))
+        lines.append("{:<24} {:>10}".format("ticks", self._ticks))
+        lines.append("{:<24} {:>10}".format("frames", len(self._render)))
+        lines.append("{:<24} {:>10.1f}".format("simulation busy (s)", simulation))
+        lines.append("{:<24} {:>10.1f}".format("render busy (s)", render))
+        lines.append("{:<24} {:>10.1f}".format("both busy (s)", overlap))
+        # share of the shorter busy time hidden behind the other thread
+        lines.append("{:<24} {:>9.1f}%".format("overlap", 100 * overlap / min(simulation, render)
+                                              if min(simulation, render) > 0 else 0.0))
+        if latencies:
+            lines.append("{:<24} {:>10.1f}".format("latency mean (ms)", 1000 * sum(latencies) / len(latencies)))
+            lines.append("{:<24} {:>10.1f}".format("latency p95 (ms)", 1000 * latencies[int(0.95 * (len(latencies) - 1))]))
+            lines.append("{:<24} {:>10.1f}".format("latency max (ms)", 1000 * latencies[-1]))
+        return "\n".join(lines)
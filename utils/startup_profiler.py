@@ -0,0 +1,26 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupProfiler:
+    """Measures the duration of the startup steps, report is only printed by run.py with --startup-profile."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._sections = []  # type: List[Tuple[str, float]]
+
+    @contextmanager
+    def section(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._sections.append((name, time.perf_counter() - start))
+
+    def report(self) -> str:
+        lines = ["{:<20} {:>10}".format("startup step", "time (ms)")]
+        for name, duration in self._sections:
+            lines.append("{:<20} {:>10.1f}".format(name, duration * 1000))
+        lines.append("{:<20} {:>10.1f}".format("total", (time.perf_counter() - self._start) * 1000))
+        return "\n".join(lines)